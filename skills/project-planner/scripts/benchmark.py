@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Planner Benchmark
+Measures how document generation and validation scale with spec size
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_project_docs import ProjectDocumentGenerator  # noqa: E402
+from validate_documents import DocumentValidator  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+TASKS_PER_PHASE = 10
+
+# Ignore regressions below this many milliseconds, they are timer noise
+NOISE_FLOOR_MS = 1.0
+
+
+def build_spec(size: int) -> Tuple[List[str], List[str], List[Dict]]:
+    """Build features, components and phases with `size` entries each"""
+    features = [f"to use feature {i}" for i in range(size)]
+    components = [f"Component{i} Service" for i in range(size)]
+
+    phases = []
+    for phase_num in range((size + TASKS_PER_PHASE - 1) // TASKS_PER_PHASE):
+        tasks = []
+        for offset in range(TASKS_PER_PHASE):
+            index = phase_num * TASKS_PER_PHASE + offset
+            if index >= size:
+                break
+            task = {
+                "name": f"Implement component{index} service",
+                "subtasks": ["Write code", "Write tests"],
+                "requirements": [f"REQ-{index + 1}"],
+            }
+            if index:
+                task["dependencies"] = [f"{phase_num + 1}.{offset}" if offset else f"{phase_num}.1"]
+            tasks.append(task)
+        phases.append({"name": f"Phase {phase_num + 1}", "tasks": tasks})
+
+    return features, components, phases
+
+
+def measure(func: Callable, repeat: int) -> Tuple[float, int, object]:
+    """Return best wall time (ms), peak traced memory (bytes) and the result
+
+    Timing runs without tracemalloc so the tracing overhead does not skew it;
+    memory is measured in one extra traced run.
+    """
+    best = float("inf")
+    result = None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return round(best * 1000, 3), peak, result
+
+
+def bench_size(size: int, repeat: int, skip: List[str]) -> Dict[str, Dict]:
+    """Time every generate_* method, validate_all and its sub-validators"""
+    features, components, phases = build_spec(size)
+    generator = ProjectDocumentGenerator("Benchmark Project")
+    validator = DocumentValidator()
+    stages = {}
+
+    def run(name: str, func: Callable):
+        if name in skip:
+            stages[name] = {"skipped": True}
+            return None
+        ms, peak, result = measure(func, repeat)
+        stages[name] = {"time_ms": ms, "peak_memory_bytes": peak}
+        if isinstance(result, str):
+            stages[name]["output_bytes"] = len(result.encode("utf-8"))
+        return result
+
+    req = run("generate_requirements_template",
+              lambda: generator.generate_requirements_template(features))
+    design = run("generate_design_template",
+                 lambda: generator.generate_design_template(components))
+    tasks = run("generate_tasks_template",
+                lambda: generator.generate_tasks_template(phases))
+
+    # Skipped generators still need content for the validators
+    req = req or generator.generate_requirements_template(features)
+    design = design or generator.generate_design_template(components)
+    tasks = tasks or generator.generate_tasks_template(phases)
+
+    run("validate_requirements", lambda: validator.validate_requirements(req))
+    run("validate_design", lambda: validator.validate_design(design))
+    run("validate_tasks", lambda: validator.validate_tasks(tasks))
+    run("validate_consistency", lambda: validator.validate_consistency(req, design, tasks))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for filename, content in (("requirements.md", req), ("design.md", design),
+                                  ("tasks.md", tasks)):
+            path = os.path.join(tmp, filename)
+            with open(path, "w") as f:
+                f.write(content)
+            paths.append(path)
+        run("validate_all", lambda: validator.validate_all(*paths))
+
+    return stages
+
+
+def run_benchmarks(sizes: List[int], repeat: int, skip: List[str]) -> Dict:
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "sizes": {},
+    }
+    for size in sizes:
+        print(f"Benchmarking size {size}...", file=sys.stderr)
+        results["sizes"][str(size)] = bench_size(size, repeat, skip)
+    return results
+
+
+def check_regressions(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Compare stage timings with a baseline run, return regression messages"""
+    regressions = []
+    for size, stages in current["sizes"].items():
+        base_stages = baseline.get("sizes", {}).get(size, {})
+        for stage, stats in stages.items():
+            base = base_stages.get(stage, {})
+            if "time_ms" not in stats or "time_ms" not in base:
+                continue
+            limit = base["time_ms"] * (1 + threshold)
+            if stats["time_ms"] > limit and stats["time_ms"] - base["time_ms"] > NOISE_FLOOR_MS:
+                regressions.append(
+                    f"size {size} {stage}: {stats['time_ms']:.3f}ms "
+                    f"(baseline {base['time_ms']:.3f}ms, limit {limit:.3f}ms)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark project planning document generation and validation")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                      help="Comma-separated spec sizes (features, components and tasks each)")
+    parser.add_argument("--repeat", type=int, default=3,
+                      help="Timed runs per stage, the best one is reported")
+    parser.add_argument("--skip", nargs="+", default=[],
+                      help="Stages to skip, e.g. validate_consistency for very large sizes")
+    parser.add_argument("--output", "-o",
+                      help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", "-b",
+                      help="Baseline JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                      help="Allowed slowdown relative to the baseline (0.25 = 25%%)")
+
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = run_benchmarks(sizes, args.repeat, args.skip)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = check_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            return 1
+        print(f"\n✅ No regressions over {args.threshold:.0%}", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -6,10 +6,173 @@ Generates structured requirements, design, and task documents for new projects
 
 import json
 import argparse
+import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
 
+from trace_hooks import stage, tracing
+
+# Checkbox lines in tasks.md: "- [ ] 1. Phase" and "  - [x] 1.2 Task"
+PHASE_LINE = re.compile(r"^- \[([ xX])\] (\d+)\. (.*)$")
+CHECKBOX_LINE = re.compile(r"^(\s*- \[)([ xX])(\] (\d+(?:\.\d+)?)\.? (.*))$")
+
+
+def parse_task_progress(content: str) -> Tuple[Dict[Tuple[str, str], bool], Dict[str, bool]]:
+    """Collect checkbox state keyed by (number, name), plus a name-only fallback"""
+    by_key = {}
+    by_name = {}
+    ambiguous = set()
+
+    for line in content.splitlines():
+        match = CHECKBOX_LINE.match(line)
+        if not match:
+            continue
+        checked = match.group(2) in "xX"
+        number, name = match.group(4), match.group(5).strip()
+        by_key[(number, name)] = checked
+        if name in by_name:
+            ambiguous.add(name)
+        by_name[name] = checked
+
+    for name in ambiguous:
+        del by_name[name]
+    return by_key, by_name
+
+
+def split_phases(content: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """Split tasks.md into the header and one (phase number, block) per phase"""
+    header = []
+    phases = []
+    current = None
+
+    for line in content.splitlines(keepends=True):
+        match = PHASE_LINE.match(line.rstrip("\n"))
+        if match:
+            current = [match.group(2), [line]]
+            phases.append(current)
+        elif current is None:
+            header.append(line)
+        else:
+            current[1].append(line)
+
+    return "".join(header), [(number, "".join(lines)) for number, lines in phases]
+
+
+def apply_task_progress(block: str, by_key: Dict[Tuple[str, str], bool],
+                        by_name: Dict[str, bool]) -> str:
+    """Carry checkbox state over to a freshly generated phase block"""
+    lines = []
+    for line in block.splitlines(keepends=True):
+        match = CHECKBOX_LINE.match(line.rstrip("\n"))
+        if match:
+            number, name = match.group(4), match.group(5).strip()
+            checked = by_key.get((number, name))
+            if checked is None:
+                # Tasks renumbered by an inserted phase/task keep their state by name
+                checked = by_name.get(name, False)
+            ending = line[len(line.rstrip("\n")):]
+            line = f"{match.group(1)}{'x' if checked else ' '}{match.group(3)}{ending}"
+        lines.append(line)
+    return "".join(lines)
+
+
+def split_tasks(block: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """Split a phase block into its heading and one (task name, chunk) per task"""
+    head = []
+    tasks = []
+    current = None
+
+    for i, line in enumerate(block.splitlines(keepends=True)):
+        match = CHECKBOX_LINE.match(line.rstrip("\n")) if i else None
+        if match and "." in match.group(4):
+            current = [match.group(5).strip(), [line]]
+            tasks.append(current)
+        elif current is None:
+            head.append(line)
+        else:
+            current[1].append(line)
+
+    return "".join(head), [(name, "".join(lines)) for name, lines in tasks]
+
+
+def append_blocks(text: str, blocks: List[str]) -> str:
+    """Append blocks separated by a blank line, keeping the text's trailing newlines"""
+    if not blocks:
+        return text
+    body = text.rstrip("\n")
+    tail = text[len(body):] or "\n"
+    for block in blocks:
+        body += "\n\n" + block.rstrip("\n")
+    return body + tail
+
+
+def merge_tasks_document(existing: str, generated: str) -> Tuple[str, int, List[str]]:
+    """Merge a regenerated tasks.md into an existing one
+
+    Keeps the existing header (project boundaries are usually filled in by
+    hand) and completion state, and only replaces phases whose content
+    changed. Phases and tasks of the existing document that the generated
+    one no longer has (usually added by hand) are kept as they are: tasks at
+    the end of their phase, phases at the end of the plan. Returns the merged
+    document, the number of changed phases and the kept phases / tasks.
+    """
+    by_key, by_name = parse_task_progress(existing)
+    old_header, old_phases = split_phases(existing)
+    _, new_phases = split_phases(generated)
+
+    def title(block: str) -> str:
+        return PHASE_LINE.match(block.splitlines()[0]).group(3).strip()
+
+    old_by_title = {title(block): (number, block) for number, block in old_phases}
+    old_by_number = dict(old_phases)
+    new_titles = {title(block) for _, block in new_phases}
+    new_tasks = {name for _, block in new_phases for name, _ in split_tasks(block)[1]}
+
+    parts = [old_header]
+    changed = 0
+    kept = []
+    matched = set()
+    for number, block in new_phases:
+        merged = apply_task_progress(block, by_key, by_name)
+        # The old phase this one replaces: same title, else same number (unless that phase lives on elsewhere)
+        old_number, old_block = old_by_title.get(title(block), (number, old_by_number.get(number)))
+        if old_block is not None and (old_number in matched or (title(old_block) != title(block)
+                                                                and title(old_block) in new_titles)):
+            old_block = None
+        if old_block is not None:
+            matched.add(old_number)
+            extra = [chunk for name, chunk in split_tasks(old_block)[1] if name not in new_tasks]
+            merged = append_blocks(merged, extra)
+            kept.extend(" ".join(CHECKBOX_LINE.match(chunk.splitlines()[0]).group(4, 5)) for chunk in extra)
+        if old_block is not None and old_block == merged:
+            parts.append(old_block)
+        else:
+            parts.append(merged)
+            changed += 1
+
+    extra_phases = [(number, block) for number, block in old_phases if number not in matched]
+    if extra_phases:
+        parts[-1] = append_blocks(parts[-1], [block for _, block in extra_phases])
+        kept.extend(f"{number}. {title(block)}" for number, block in extra_phases)
+    return "".join(parts), changed, kept
+
+
+def scan_components(repo_path: str, max_components: Optional[int] = None, use_cache: bool = True) -> List[Dict]:
+    """Derive design components from an existing source tree (see repo_scan.py)"""
+    from repo_scan import DEFAULT_CACHE_DIR, DEFAULT_MAX_COMPONENTS, RepoScanner
+
+    if not os.path.isdir(repo_path):
+        raise ValueError(f"Not a directory: {repo_path}")
+    scanner = RepoScanner(repo_path, cache_dir=DEFAULT_CACHE_DIR if use_cache else None)
+    with stage("scan"):
+        components = scanner.scan(max_components or DEFAULT_MAX_COMPONENTS)
+    stats = scanner.stats
+    print(f"Scanned: {repo_path} ({stats['files']} source files, {stats['parsed']} parsed, "
+          f"{stats['cached']} cached, {stats['elapsed']}s) -> {len(components)} components")
+    return components
+
+
 class ProjectDocumentGenerator:
     def __init__(self, project_name: str, project_type: str = "web-app"):
         self.project_name = project_name
@@ -51,8 +214,17 @@ class ProjectDocumentGenerator:
         
         return template
     
-    def generate_design_template(self, components: List[str]) -> str:
-        """Generate design document template with comprehensive architecture"""
+    def generate_design_template(self, components: List) -> str:
+        """Generate design document template with comprehensive architecture
+
+        Components are names, or dicts from repo_scan.RepoScanner (name, type,
+        path, files, lines, languages, interfaces) when generated --from-repo;
+        scanned components replace the placeholder Frontend / API Gateway rows.
+        """
+        scanned = [c for c in components if isinstance(c, dict)]
+        components = [c if isinstance(c, dict) else {"name": c} for c in components]
+        first_id = 1 if scanned else 3
+        ids = {c["name"]: f"COMP-{i}" for i, c in enumerate(components, first_id)}
         
         template = f"""# Design Document
 
@@ -65,13 +237,19 @@ The {self.project_name} system is built as a [ARCHITECTURE PATTERN] with [KEY CO
 ### Component Map
 
 | Component ID | Name | Type | Responsibility | Interfaces With |
-|-------------|------|------|----------------|-----------------|
+|-------------|------|------|----------------|-----------------|"""
+        if not scanned:
+            template += """
 | COMP-1 | Frontend | UI | User interface and interaction | COMP-2 |
 | COMP-2 | API Gateway | Service | Request routing and authentication | COMP-3, COMP-4 |"""
         
-        for i, component in enumerate(components, 3):
+        for i, component in enumerate(components, first_id):
+            responsibility = "[Responsibility]"
+            if "path" in component:
+                responsibility += f" (`{component['path']}`)"
+            interfaces = ", ".join(ids[name] for name in component.get("interfaces", []) if name in ids)
             template += f"""
-| COMP-{i} | {component} | Service | [Responsibility] | [Components] |"""
+| COMP-{i} | {component['name']} | {component.get('type', 'Service')} | {responsibility} | {interfaces or '[Components]'} |"""
         
         template += """
 
@@ -181,11 +359,17 @@ Response: { "result": "value" }
 """
         
         for component in components:
+            location = ""
+            if "path" in component:
+                languages = ", ".join(component.get("languages", []))
+                location = (f"\n**Location:** `{component['path']}` — {component['files']} files, "
+                            f"{component['lines']} lines ({languages})\n")
+            component = component["name"]
             template += f"""
 ### {component}
 
 **Responsibility:** [Single sentence description of what this component does]
-
+{location}
 **Key Classes:**
 - `{component}Service`: Main service class for {component.lower()} operations
 - `{component}Controller`: Handles API requests for {component.lower()}
@@ -723,9 +907,14 @@ Type: {self.project_type}
     
     def generate_all_documents(self, 
                               features: List[str] = None,
-                              components: List[str] = None,
-                              output_dir: str = ".") -> Dict[str, str]:
-        """Generate all three documents"""
+                              components: List = None,
+                              output_dir: str = ".",
+                              merge: bool = False) -> Dict[str, str]:
+        """Generate all three documents
+
+        With merge=True an existing tasks.md keeps its checkbox progress and
+        only changed phases are rewritten.
+        """
         
         # Use defaults if not provided
         if not features:
@@ -747,17 +936,35 @@ Type: {self.project_type}
             ]
         
         # Generate documents
-        docs = {
-            "requirements.md": self.generate_requirements_template(features),
-            "design.md": self.generate_design_template(components),
-            "tasks.md": self.generate_tasks_template(self.get_default_phases())
-        }
+        docs = {}
+        with stage("requirements"):
+            docs["requirements.md"] = self.generate_requirements_template(features)
+        with stage("design"):
+            docs["design.md"] = self.generate_design_template(components)
+        with stage("tasks"):
+            docs["tasks.md"] = self.generate_tasks_template(self.get_default_phases())
         
         # Save to files
         os.makedirs(output_dir, exist_ok=True)
         
         for filename, content in docs.items():
             filepath = os.path.join(output_dir, filename)
+
+            if merge and filename == "tasks.md" and os.path.exists(filepath):
+                with open(filepath, 'r') as f:
+                    existing = f.read()
+                content, changed, kept = merge_tasks_document(existing, content)
+                docs[filename] = content
+                if kept:
+                    print(f"Kept {len(kept)} phase(s)/task(s) not in the generated plan: {', '.join(kept)}")
+                if content == existing:
+                    print(f"Unchanged: {filepath}")
+                    continue
+                with open(filepath, 'w') as f:
+                    f.write(content)
+                print(f"Merged: {filepath} ({changed} phase(s) changed)")
+                continue
+
             with open(filepath, 'w') as f:
                 f.write(content)
             print(f"Generated: {filepath}")
@@ -775,16 +982,35 @@ def main():
                       help="List of features for requirements")
     parser.add_argument("--components", nargs="+",
                       help="List of components for design")
+    parser.add_argument("--from-repo", metavar="PATH",
+                      help="Derive components from an existing source tree instead of --components")
+    parser.add_argument("--max-components", type=int,
+                      help="Largest components to keep with --from-repo (default: 15)")
+    parser.add_argument("--no-scan-cache", action="store_true",
+                      help="Re-parse every file with --from-repo instead of using the mtime cache")
     parser.add_argument("--output", default=".", 
                       help="Output directory for documents")
+    parser.add_argument("--merge", action="store_true",
+                      help="Merge into an existing tasks.md, keeping checkbox progress")
     
     args = parser.parse_args()
+    if args.from_repo and args.components:
+        parser.error("--from-repo and --components are mutually exclusive")
+    
+    components = args.components
+    if args.from_repo:
+        if not os.path.isdir(args.from_repo):
+            parser.error(f"--from-repo: not a directory: {args.from_repo}")
+        components = scan_components(args.from_repo, args.max_components, not args.no_scan_cache)
+        if not components:
+            print("⚠️  No source components found, using the default components")
     
     generator = ProjectDocumentGenerator(args.project_name, args.type)
     generator.generate_all_documents(
         features=args.features,
-        components=args.components,
-        output_dir=args.output
+        components=components,
+        output_dir=args.output,
+        merge=args.merge
     )
     
     print(f"\n✅ Successfully generated project documents for '{args.project_name}'")
@@ -798,4 +1024,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with tracing("project-planner/generate_project_docs"):
+        main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Planner Server
+Keeps the document generator and validator warm and answers JSON-RPC requests
+over stdin/stdout or a local Unix socket
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_project_docs import ProjectDocumentGenerator, scan_components  # noqa: E402
+from validate_documents import DocumentValidator  # noqa: E402
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class PlannerService:
+    """Dispatches JSON-RPC requests to the generator and validator"""
+
+    def __init__(self, redirect_prints: bool = False):
+        self.started = time.time()
+        self.calls = 0
+        # The generator and validator report progress with print(), so calls
+        # run one at a time even on the threaded socket server; in stdio mode
+        # stdout is the protocol channel and their output goes to stderr
+        self.lock = threading.Lock()
+        self.redirect_prints = redirect_prints
+        self.methods: Dict[str, Callable[[Dict], Any]] = {
+            "generate": self.generate,
+            "validate": self.validate,
+            "ping": self.ping,
+        }
+
+    def generate(self, params: Dict) -> Dict:
+        """Generate documents, same options as generate_project_docs.py"""
+        if "project_name" not in params:
+            raise ValueError("Missing required param: project_name")
+
+        generator = ProjectDocumentGenerator(params["project_name"],
+                                             params.get("type", "web-app"))
+        output_dir = params.get("output", ".")
+        components = params.get("components")
+        if params.get("from_repo"):
+            if components:
+                raise ValueError("from_repo and components are mutually exclusive")
+            components = scan_components(params["from_repo"], params.get("max_components"),
+                                         not params.get("no_scan_cache"))
+        docs = generator.generate_all_documents(
+            features=params.get("features"),
+            components=components,
+            output_dir=output_dir,
+            merge=bool(params.get("merge"))
+        )
+        result = {"files": [os.path.join(output_dir, name) for name in docs]}
+        if params.get("return_content"):
+            result["documents"] = docs
+        return result
+
+    def validate(self, params: Dict) -> Dict:
+        """Validate documents, same options as validate_documents.py"""
+        paths = {
+            "requirements": params.get("requirements", "requirements.md"),
+            "design": params.get("design", "design.md"),
+            "tasks": params.get("tasks", "tasks.md"),
+        }
+        for name, filepath in paths.items():
+            if not os.path.exists(filepath):
+                raise ValueError(f"{name.capitalize()} file not found: {filepath}")
+
+        validator = DocumentValidator()
+        results = validator.validate_all(paths["requirements"], paths["design"],
+                                         paths["tasks"])
+        return {
+            "results": {doc: {"errors": errors, "warnings": warnings}
+                        for doc, (errors, warnings) in results.items()},
+            "total_errors": sum(len(errors) for errors, _ in results.values()),
+            "total_warnings": sum(len(warnings) for _, warnings in results.values()),
+        }
+
+    def ping(self, params: Dict) -> Dict:
+        return {"uptime": round(time.time() - self.started, 3), "calls": self.calls}
+
+    def handle(self, line: str) -> Optional[Dict]:
+        """Handle one request line, return the response (None for notifications)"""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return error_response(None, PARSE_ERROR, f"Parse error: {e}")
+
+        if not isinstance(request, dict) or "method" not in request:
+            return error_response(None, INVALID_REQUEST, "Invalid request")
+
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return error_response(request_id, METHOD_NOT_FOUND,
+                                  f"Method not found: {request['method']}")
+
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return error_response(request_id, INVALID_PARAMS, "params must be an object")
+
+        output = contextlib.redirect_stdout(sys.stderr) if self.redirect_prints else contextlib.nullcontext()
+        with self.lock:
+            self.calls += 1
+            try:
+                with output:
+                    result = method(params)
+            except ValueError as e:
+                return error_response(request_id, INVALID_PARAMS, str(e))
+            except Exception as e:
+                return error_response(request_id, INTERNAL_ERROR, str(e))
+
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def error_response(request_id, code: int, message: str) -> Dict:
+    return {"jsonrpc": "2.0", "id": request_id,
+            "error": {"code": code, "message": message}}
+
+
+def serve_stdio(service: PlannerService):
+    """Answer one JSON request per stdin line until EOF or a shutdown request"""
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        if _is_shutdown(line):
+            break
+        response = service.handle(line)
+        if response is not None:
+            sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+
+def serve_socket(service: PlannerService, socket_path: str):
+    """Answer JSON requests on a Unix socket, one request per line"""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode("utf-8").strip()
+                if not line:
+                    continue
+                if _is_shutdown(line):
+                    # shutdown() blocks until serve_forever returns, so run it
+                    # outside the handler thread
+                    threading.Thread(target=self.server.shutdown).start()
+                    return
+                response = service.handle(line)
+                if response is not None:
+                    self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                    self.wfile.flush()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+        server.daemon_threads = True
+        print(f"Planner server listening on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+
+def _is_shutdown(line: str) -> bool:
+    try:
+        return json.loads(line).get("method") == "shutdown"
+    except (json.JSONDecodeError, AttributeError):
+        return False
+
+
+def call(socket_path: str, method: str, params: Dict) -> Dict:
+    """Send one request to a running socket server"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        return json.loads(sock.makefile("rb").readline())
+
+
+def benchmark(iterations: int) -> Dict:
+    """Compare per-call latency of cold process starts with a warm server"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = os.path.join(tmp, "docs")
+        gen_cmd = [sys.executable, os.path.join(script_dir, "generate_project_docs.py"),
+                   "Bench Project", "--output", out_dir]
+        val_cmd = [sys.executable, os.path.join(script_dir, "validate_documents.py"),
+                   "-r", os.path.join(out_dir, "requirements.md"),
+                   "-d", os.path.join(out_dir, "design.md"),
+                   "-t", os.path.join(out_dir, "tasks.md")]
+
+        cold = {"generate": [], "validate": []}
+        for _ in range(iterations):
+            for name, cmd in (("generate", gen_cmd), ("validate", val_cmd)):
+                start = time.perf_counter()
+                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                cold[name].append(time.perf_counter() - start)
+
+        socket_path = os.path.join(tmp, "planner.sock")
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--socket", socket_path],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + 10
+            while not os.path.exists(socket_path):
+                if time.time() > deadline:
+                    raise RuntimeError("Planner server did not start")
+                time.sleep(0.01)
+
+            warm = {"generate": [], "validate": []}
+            requests = {
+                "generate": {"project_name": "Bench Project", "output": out_dir},
+                "validate": {"requirements": os.path.join(out_dir, "requirements.md"),
+                             "design": os.path.join(out_dir, "design.md"),
+                             "tasks": os.path.join(out_dir, "tasks.md")},
+            }
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(socket_path)
+                reader = sock.makefile("rb")
+                for i in range(iterations):
+                    for name, params in requests.items():
+                        payload = json.dumps({"jsonrpc": "2.0", "id": i, "method": name,
+                                              "params": params}) + "\n"
+                        start = time.perf_counter()
+                        sock.sendall(payload.encode("utf-8"))
+                        reader.readline()
+                        warm[name].append(time.perf_counter() - start)
+                sock.sendall(b'{"jsonrpc": "2.0", "method": "shutdown"}\n')
+        finally:
+            try:
+                server.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    for name in ("generate", "validate"):
+        cold_stats = _latency_stats(cold[name])
+        warm_stats = _latency_stats(warm[name])
+        results[name] = {
+            "cold_ms": cold_stats,
+            "warm_ms": warm_stats,
+            "speedup": round(cold_stats["mean"] / warm_stats["mean"], 1) if warm_stats["mean"] else None,
+        }
+    return {"iterations": iterations, "results": results}
+
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "mean": round(statistics.mean(ms), 3),
+        "p50": round(ms[len(ms) // 2], 3),
+        "p95": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-lived JSON-RPC server for project planning scripts")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of stdin/stdout")
+    parser.add_argument("--call", metavar="METHOD",
+                      help="Send one request to the server at --socket and print the response")
+    parser.add_argument("--params", default="{}",
+                      help="JSON params for --call")
+    parser.add_argument("--bench", type=int, metavar="N",
+                      help="Measure cold-start vs warm latency over N calls")
+
+    args = parser.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark(args.bench), indent=2))
+        return 0
+
+    if args.call:
+        if not args.socket:
+            print("❌ --call requires --socket")
+            return 1
+        response = call(args.socket, args.call, json.loads(args.params))
+        print(json.dumps(response, indent=2, ensure_ascii=False))
+        return 1 if "error" in response else 0
+
+    service = PlannerService(redirect_prints=not args.socket)
+    if args.socket:
+        serve_socket(service, args.socket)
+    else:
+        serve_stdio(service)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
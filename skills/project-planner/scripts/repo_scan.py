@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Repository Scanner
+Derives components, services and modules from an existing source tree for
+generate_project_docs.py --from-repo
+
+The tree is walked with a thread pool (one os.scandir per directory), honoring
+nested .gitignore files and .git/info/exclude and skipping vendored and build
+directories. Source files are parsed for their line count and imports; the
+results are cached per file by mtime and size, so repeat runs only stat the
+tree and re-parse what changed.
+
+    python scripts/repo_scan.py ~/code/shop
+    python scripts/repo_scan.py ~/code/shop --json --max-components 30
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from trace_hooks import stage, tracing
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "project-planner", "repo-scan")
+CACHE_VERSION = 1
+DEFAULT_MAX_COMPONENTS = 15
+
+# Read at most this much of each file; imports sit at the top
+PARSE_LIMIT = 256 * 1024
+# Parse in worker processes once this many files changed since the last run
+PARALLEL_PARSE = 2000
+PARSE_CHUNK = 500
+MAX_IMPORTS = 200
+
+VENDORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "bower_components", "jspm_packages", "vendor", "vendors",
+    "third_party", "third-party", "thirdparty", "external", "externals", "Pods", "Carthage",
+    ".venv", "venv", "virtualenv", "site-packages", "__pycache__", ".tox", ".nox", ".mypy_cache",
+    ".pytest_cache", ".ruff_cache", ".gradle", ".m2", ".idea", ".vscode", ".next", ".nuxt", ".svelte-kit",
+    ".turbo", ".parcel-cache", ".cache", "dist", "build", "out", "target", "coverage", ".eggs",
+})
+
+# Grouping directories: the component is the directory below them
+CONTAINER_DIRS = frozenset({
+    "src", "source", "lib", "libs", "app", "apps", "pkg", "internal", "packages", "services", "modules",
+    "components", "cmd", "crates", "projects",
+})
+
+# Directories whose files never form a component
+NON_COMPONENT_DIRS = frozenset({
+    "test", "tests", "__tests__", "spec", "specs", "testing", "e2e", "fixtures", "mocks", "__mocks__",
+    "docs", "doc", "examples", "example", "samples", "benchmarks", "bench", "scripts", "tools", "migrations",
+})
+
+LANGUAGES = {
+    ".py": "Python", ".pyi": "Python",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".mts": "TypeScript", ".cts": "TypeScript",
+    ".vue": "Vue", ".svelte": "Svelte",
+    ".go": "Go", ".rs": "Rust", ".java": "Java", ".kt": "Kotlin", ".kts": "Kotlin", ".scala": "Scala",
+    ".rb": "Ruby", ".php": "PHP", ".cs": "C#", ".swift": "Swift", ".dart": "Dart",
+    ".c": "C", ".h": "C", ".cc": "C++", ".cpp": "C++", ".hpp": "C++", ".m": "Objective-C",
+    ".ex": "Elixir", ".exs": "Elixir", ".erl": "Erlang", ".clj": "Clojure", ".hs": "Haskell", ".lua": "Lua",
+}
+UI_EXTENSIONS = frozenset({".jsx", ".tsx", ".vue", ".svelte"})
+
+MANIFESTS = frozenset({
+    "package.json", "pyproject.toml", "setup.py", "setup.cfg", "go.mod", "Cargo.toml", "pom.xml",
+    "build.gradle", "build.gradle.kts", "Gemfile", "composer.json", "mix.exs", "pubspec.yaml",
+})
+SERVICE_MARKERS = frozenset({
+    "Dockerfile", "Procfile", "main.go", "main.py", "__main__.py", "app.py", "wsgi.py", "asgi.py",
+    "manage.py", "server.js", "server.ts", "main.rs", "Program.cs", "Application.java",
+})
+SERVICE_PARENTS = frozenset({"services", "apps", "cmd"})
+
+_JS_IMPORT = re.compile(r"""(?:\bfrom\s+|\brequire\(\s*|\bimport\(\s*|^\s*import\s+)['"]([^'"]+)['"]""", re.M)
+IMPORT_PATTERNS = {
+    "Python": re.compile(r"^\s*(?:from\s+(\.*[\w.]*)\s+import|import\s+([\w.]+))", re.M),
+    "JavaScript": _JS_IMPORT,
+    "TypeScript": _JS_IMPORT,
+    "Vue": _JS_IMPORT,
+    "Svelte": _JS_IMPORT,
+    "Go": re.compile(r'^\s*(?:import\s+)?(?:[\w.]+\s+)?"([\w./-]+)"\s*$', re.M),
+    "Rust": re.compile(r"^\s*(?:pub\s+)?(?:use|mod)\s+(?:crate::)?(\w+)", re.M),
+    "Java": re.compile(r"^\s*import\s+(?:static\s+)?([\w.]+)", re.M),
+    "Kotlin": re.compile(r"^\s*import\s+([\w.]+)", re.M),
+    "Scala": re.compile(r"^\s*import\s+([\w.]+)", re.M),
+    "C#": re.compile(r"^\s*using\s+(?:static\s+)?([\w.]+)\s*;", re.M),
+    "Ruby": re.compile(r"""^\s*require(?:_relative)?\s*\(?\s*['"]([^'"]+)['"]""", re.M),
+    "PHP": re.compile(r"^\s*use\s+([\w\\]+)", re.M),
+    "C": re.compile(r'^\s*#include\s+"([^"]+)"', re.M),
+    "C++": re.compile(r'^\s*#include\s+"([^"]+)"', re.M),
+}
+
+
+class IgnoreRules:
+    """Patterns of one .gitignore, matched against paths relative to its directory"""
+
+    def __init__(self, base: str, lines: List[str]):
+        self.base = base
+        self.rules = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            regex = translate_pattern(line.lstrip("/"))
+            self.rules.append((re.compile(("^" if anchored else "^(?:.*/)?") + regex + "$"), negate, dir_only))
+
+    @classmethod
+    def load(cls, path: str, base: str) -> Optional["IgnoreRules"]:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                rules = cls(base, f.readlines())
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by a ! rule, None if no rule matches"""
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if (is_dir or not dir_only) and regex.match(rel_path):
+                result = not negate
+        return result
+
+
+def translate_pattern(pattern: str) -> str:
+    """Translate a gitignore glob (with ** support) into a regex body"""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def is_ignored(rules: Tuple[IgnoreRules, ...], rel_path: str, is_dir: bool) -> bool:
+    """Deeper .gitignore files override shallower ones; the last matching rule wins"""
+    result = None
+    for ignore in rules:
+        matched = ignore.match(rel_path, is_dir)
+        if matched is not None:
+            result = matched
+    return bool(result)
+
+
+@lru_cache(maxsize=None)
+def component_key(rel_dir: str) -> Optional[str]:
+    """Directory the component of files in rel_dir is rooted at, or None for tests, docs, hidden dirs"""
+    parts = rel_dir.split("/") if rel_dir else []
+    for part in parts:
+        if part in NON_COMPONENT_DIRS or part.startswith("."):
+            return None
+    depth = 0
+    while depth < len(parts) and parts[depth] in CONTAINER_DIRS:
+        depth += 1
+    if depth < len(parts):
+        depth += 1
+    return "/".join(parts[:depth])
+
+
+def humanize(name: str) -> str:
+    """auth_service / authService / auth-service -> Auth Service"""
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", name)
+    words = [w for w in re.split(r"[\s_.\-]+", name) if w]
+    return " ".join(w if w.isupper() and len(w) > 1 else w.capitalize() for w in words) or name
+
+
+def parse_source(path: str, language: str, size: int) -> List:
+    """[line count, imports] of one source file"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(PARSE_LIMIT)
+    except OSError:
+        return [0, []]
+    text = data.decode("utf-8", errors="ignore")
+    lines = text.count("\n")
+    if size > len(data) and data:
+        lines = int(lines * size / len(data))
+
+    pattern = IMPORT_PATTERNS.get(language)
+    imports = []
+    if pattern is not None:
+        seen = set()
+        for match in pattern.finditer(text):
+            target = next((g for g in match.groups() if g), None)
+            if target and target not in seen:
+                seen.add(target)
+                imports.append(target)
+                if len(imports) >= MAX_IMPORTS:
+                    break
+    return [lines, imports]
+
+
+def _parse_chunk(chunk: List[Tuple[str, str, int]]) -> List[List]:
+    return [parse_source(path, language, size) for path, language, size in chunk]
+
+
+class RepoScanner:
+    def __init__(self, root: str, jobs: Optional[int] = None, cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        self.root = os.path.abspath(root)
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)
+        self.cache_path = None
+        if cache_dir:
+            digest = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+            self.cache_path = os.path.join(cache_dir, f"{digest}.json")
+        self.stats = {}
+
+    # ---------- walking ----------
+
+    def _scan_dir(self, rel_dir: str, rules: Tuple[IgnoreRules, ...]):
+        """List one directory: (files [(rel, size, mtime_ns)], subdirectories [(rel, rules)], marker names)"""
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return [], [], []
+        names = {entry.name for entry in entries}
+        if ".gitignore" in names:
+            ignore = IgnoreRules.load(os.path.join(path, ".gitignore"), rel_dir)
+            if ignore is not None:
+                rules = rules + (ignore,)
+
+        files, dirs, markers = [], [], []
+        for entry in entries:
+            name = entry.name
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in VENDORED_DIRS and not is_ignored(rules, rel, True):
+                        dirs.append((rel, rules))
+                    continue
+                if not entry.is_file(follow_symlinks=False) or is_ignored(rules, rel, False):
+                    continue
+                if name in MANIFESTS or name in SERVICE_MARKERS:
+                    markers.append(name)
+                if os.path.splitext(name)[1] in LANGUAGES:
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append((rel, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                continue
+        return files, dirs, markers
+
+    def walk(self) -> Tuple[List[Tuple[str, int, int]], Dict[str, List[str]]]:
+        """Source files and per-directory service markers of the whole tree"""
+        rules = ()
+        exclude = IgnoreRules.load(os.path.join(self.root, ".git", "info", "exclude"), "")
+        if exclude is not None:
+            rules = (exclude,)
+
+        files, markers = [], {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            pending = {pool.submit(self._scan_dir, "", rules): ""}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rel_dir = pending.pop(future)
+                    dir_files, subdirs, dir_markers = future.result()
+                    files.extend(dir_files)
+                    if dir_markers:
+                        markers[rel_dir] = dir_markers
+                    for sub, sub_rules in subdirs:
+                        pending[pool.submit(self._scan_dir, sub, sub_rules)] = sub
+        return files, markers
+
+    # ---------- per-file cache ----------
+
+    def _load_cache(self) -> Dict[str, List]:
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get("version") != CACHE_VERSION or cache.get("root") != self.root:
+            return {}
+        return cache.get("files", {})
+
+    def _save_cache(self, entries: Dict[str, List]):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "root": self.root, "files": entries}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.cache_path)
+
+    def parse(self, files: List[Tuple[str, int, int]]) -> Dict[str, List]:
+        """rel path -> [mtime_ns, size, lines, imports] for every component source file"""
+        cached = self._load_cache()
+        entries, todo = {}, []
+        for rel, size, mtime in files:
+            if component_key(rel.rpartition("/")[0]) is None:
+                continue
+            entry = cached.get(rel)
+            if entry and entry[0] == mtime and entry[1] == size:
+                entries[rel] = entry
+            else:
+                todo.append((rel, size, mtime))
+
+        jobs = [(os.path.join(self.root, rel), LANGUAGES[os.path.splitext(rel)[1]], size) for rel, size, _ in todo]
+        if len(jobs) >= PARALLEL_PARSE:
+            chunks = [jobs[i:i + PARSE_CHUNK] for i in range(0, len(jobs), PARSE_CHUNK)]
+            with ProcessPoolExecutor() as pool:
+                results = [result for chunk in pool.map(_parse_chunk, chunks) for result in chunk]
+        else:
+            results = _parse_chunk(jobs)
+        for (rel, size, mtime), (lines, imports) in zip(todo, results):
+            entries[rel] = [mtime, size, lines, imports]
+
+        self.stats.update(parsed=len(todo), cached=len(entries) - len(todo))
+        if todo or len(entries) != len(cached):
+            self._save_cache(entries)
+        return entries
+
+    # ---------- components ----------
+
+    def components(self, entries: Dict[str, List], markers: Dict[str, List[str]],
+                   max_components: int = DEFAULT_MAX_COMPONENTS) -> List[Dict]:
+        """Group parsed files into components, classify them and link them by their imports"""
+        groups = defaultdict(list)
+        for rel in entries:
+            groups[component_key(rel.rpartition("/")[0])].append(rel)
+
+        by_name = defaultdict(list)
+        for key in groups:
+            if key:
+                by_name[key.rsplit("/", 1)[-1].lower()].append(key)
+
+        def owner(path: str) -> Optional[str]:
+            """Deepest component directory containing path"""
+            while path:
+                if path in groups:
+                    return path
+                path = path.rpartition("/")[0]
+            return None
+
+        resolved = {}
+
+        def resolve(rel_dir: str, target: str) -> Optional[str]:
+            """Component an import refers to: relative paths, then a leading name segment"""
+            relative = target.startswith(".")
+            memo = (rel_dir, target) if relative else target
+            if memo in resolved:
+                return resolved[memo]
+            key = None
+            if relative:
+                dots = len(target) - len(target.lstrip("."))
+                if "/" in target:  # ./x, ../x (JS, Ruby, C)
+                    key = owner(os.path.normpath(os.path.join(memo[0], target)).replace(os.sep, "/"))
+                else:  # Python: from .x import y
+                    base = memo[0].split("/")
+                    base = base[:len(base) - (dots - 1)] if dots > 1 else base
+                    key = owner("/".join(base + target[dots:].split(".")).strip("/"))
+            else:
+                key = owner(target.strip("/"))
+                if key is None:
+                    for segment in re.split(r"[./:\\]", target.lstrip("@"))[:3]:
+                        candidates = by_name.get(segment.lower())
+                        if candidates and len(candidates) == 1:
+                            key = candidates[0]
+                            break
+            resolved[memo] = key
+            return key
+
+        summary = {}
+        for key, paths in groups.items():
+            languages = Counter()
+            lines = ui_files = 0
+            links = Counter()
+            for rel in paths:
+                entry = entries[rel]
+                ext = rel[rel.rfind("."):]
+                rel_dir = rel.rpartition("/")[0]
+                languages[LANGUAGES[ext]] += entry[2] or 1
+                lines += entry[2]
+                ui_files += ext in UI_EXTENSIONS
+                for target in entry[3]:
+                    other = resolve(rel_dir, target)
+                    if other is not None and other != key:
+                        links[other] += 1
+
+            parts = key.split("/") if key else []
+            names = set(markers.get(key, ()))
+            if ui_files * 2 >= len(paths):
+                kind = "UI"
+            elif names & MANIFESTS or names & SERVICE_MARKERS or (len(parts) > 1 and parts[-2] in SERVICE_PARENTS):
+                kind = "Service"
+            else:
+                kind = "Module"
+            summary[key] = {
+                "key": key,
+                "name": humanize(parts[-1]) if parts else humanize(os.path.basename(self.root)),
+                "type": kind,
+                "path": key or ".",
+                "files": len(paths),
+                "lines": lines,
+                "languages": [name for name, _ in languages.most_common(3)],
+                "links": links,
+            }
+
+        ranked = sorted(summary.values(), key=lambda c: (-c["lines"], c["key"]))[:max_components]
+        self.stats["components_found"] = len(summary)
+
+        # Same display name twice (apps/api, services/api): qualify with the parent directory
+        counts = Counter(c["name"] for c in ranked)
+        for component in ranked:
+            if counts[component["name"]] > 1 and "/" in component["key"]:
+                component["name"] += f" ({component['key'].split('/')[-2]})"
+
+        kept = {c["key"]: c["name"] for c in ranked}
+        for component in ranked:
+            links = component.pop("links")
+            ranked_links = sorted(links.items(), key=lambda item: (-item[1], item[0]))
+            component["interfaces"] = [kept[other] for other, _ in ranked_links if other in kept]
+            del component["key"]
+        return ranked
+
+    # ---------- derived components ----------
+
+    def _fingerprint(self, files: List[Tuple[str, int, int]], markers: Dict[str, List[str]],
+                     max_components: int) -> str:
+        """Digest of every source file's path, size and mtime; equal digests give equal components"""
+        digest = hashlib.sha1(f"{CACHE_VERSION}:{max_components}\n".encode("utf-8"))
+        digest.update(json.dumps(sorted((d, sorted(names)) for d, names in markers.items())).encode("utf-8"))
+        digest.update("\n".join(f"{rel}\0{size}\0{mtime}" for rel, size, mtime in sorted(files)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load_components(self, fingerprint: str) -> Optional[List[Dict]]:
+        if not self.cache_path:
+            return None
+        try:
+            with open(self.cache_path[:-len(".json")] + ".components.json", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if saved.get("fingerprint") != fingerprint:
+            return None
+        self.stats.update(parsed=0, cached=saved["sources"], components_found=saved["components_found"])
+        return saved["components"]
+
+    def _save_components(self, fingerprint: str, components: List[Dict]):
+        if not self.cache_path:
+            return
+        path = self.cache_path[:-len(".json")] + ".components.json"
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "sources": self.stats["parsed"] + self.stats["cached"],
+                       "components_found": self.stats["components_found"], "components": components}, f,
+                      ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def scan(self, max_components: int = DEFAULT_MAX_COMPONENTS) -> List[Dict]:
+        """Walk, parse (cached) and derive components; timing and counts end up in self.stats
+
+        When no source file changed since the last scan, the components are
+        read back as a whole and the per-file cache is not even loaded.
+        """
+        started = time.perf_counter()
+        with stage("walk"):
+            files, markers = self.walk()
+        fingerprint = self._fingerprint(files, markers, max_components)
+        components = self._load_components(fingerprint)
+        if components is None:
+            with stage("parse"):
+                entries = self.parse(files)
+            with stage("components"):
+                components = self.components(entries, markers, max_components)
+            self._save_components(fingerprint, components)
+        self.stats.update(files=len(files), elapsed=round(time.perf_counter() - started, 3))
+        return components
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Derive components, services and modules from a source tree")
+    parser.add_argument("path", help="Repository root")
+    parser.add_argument("--max-components", type=int, default=DEFAULT_MAX_COMPONENTS,
+                        help="Largest components to keep (by lines of code)")
+    parser.add_argument("--jobs", type=int, help="Threads walking the tree")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every file instead of using the mtime cache")
+    parser.add_argument("--json", action="store_true", help="Print components as JSON")
+
+    args = parser.parse_args()
+    if not os.path.isdir(args.path):
+        print(f"❌ Not a directory: {args.path}")
+        return 1
+
+    scanner = RepoScanner(args.path, args.jobs, cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR)
+    components = scanner.scan(args.max_components)
+    if args.json:
+        print(json.dumps({"stats": scanner.stats, "components": components}, indent=2))
+        return 0
+
+    stats = scanner.stats
+    print(f"Scanned {stats['files']} source files ({stats['parsed']} parsed, {stats['cached']} cached) "
+          f"in {stats['elapsed']}s")
+    for component in components:
+        interfaces = ", ".join(component["interfaces"][:4]) or "-"
+        print(f"  {component['name']:<28} {component['type']:<8} {component['path']:<32} "
+              f"{component['files']:>6} files {component['lines']:>8} lines  → {interfaces}")
+    if stats["components_found"] > len(components):
+        print(f"  … {stats['components_found'] - len(components)} smaller components omitted")
+    return 0
+
+
+if __name__ == "__main__":
+    with tracing("project-planner/repo_scan"):
+        exit(main())
@@ -0,0 +1,17 @@
+"""
+Trace hooks shared by the project-planner scripts
+
+stage() and tracing() come from skill-profiler/scripts/skilltrace.py when
+that skill is installed next to this one, and are null contexts otherwise.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "skill-profiler", "scripts"))
+try:
+    from skilltrace import stage, tracing
+except ImportError:
+    from contextlib import nullcontext as stage, nullcontext as tracing
+
+__all__ = ["stage", "tracing"]
@@ -9,6 +9,8 @@ import argparse
 from typing import List, Dict, Tuple
 import os
 
+from trace_hooks import stage, tracing
+
 class DocumentValidator:
     def __init__(self):
         self.errors = []
@@ -229,22 +231,27 @@ class DocumentValidator:
         results = {}
         
         # Read files
-        with open(req_file, 'r') as f:
-            req_content = f.read()
-        with open(design_file, 'r') as f:
-            design_content = f.read()
-        with open(task_file, 'r') as f:
-            task_content = f.read()
+        with stage("read"):
+            with open(req_file, 'r') as f:
+                req_content = f.read()
+            with open(design_file, 'r') as f:
+                design_content = f.read()
+            with open(task_file, 'r') as f:
+                task_content = f.read()
         
         # Validate individual documents
-        results['requirements'] = self.validate_requirements(req_content)
-        results['design'] = self.validate_design(design_content)
-        results['tasks'] = self.validate_tasks(task_content)
+        with stage("requirements"):
+            results['requirements'] = self.validate_requirements(req_content)
+        with stage("design"):
+            results['design'] = self.validate_design(design_content)
+        with stage("tasks"):
+            results['tasks'] = self.validate_tasks(task_content)
         
         # Validate consistency
-        results['consistency'] = self.validate_consistency(
-            req_content, design_content, task_content
-        )
+        with stage("consistency"):
+            results['consistency'] = self.validate_consistency(
+                req_content, design_content, task_content
+            )
         
         return results
 
@@ -322,4 +329,5 @@ def main():
     return 1 if total_errors > 0 else 0
 
 if __name__ == "__main__":
-    exit(main())
+    with tracing("project-planner/validate_documents"):
+        exit(main())
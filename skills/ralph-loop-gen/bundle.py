@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 单文件任务集（SQLite）
+
+任务很多时，每个任务一个 Markdown 文件既占 inode 又拖慢目录扫描，completed/ 也会无限增长。
+bundle 模式把任务、状态、依赖和渲染好的任务正文都放进一个 SQLite 数据库（任务集.db）：
+
+- 状态和「可领用」（Todo 且依赖全部完成）都有索引，领用 / 完成是一次带索引的查询，不再遍历目录
+- 每个任务记录未完成依赖数，完成任务时只更新它的后继
+- render 只把需要的任务（或任务索引）渲染成 Markdown 文件
+
+用法:
+    python3 generate.py --config tasks.json --bundle          # 生成 task/{任务集名}/任务集.db
+    python3 bundle.py claim task/my-project --owner "Agent A"  # 领用一个可执行任务
+    python3 bundle.py complete task/my-project 任务012
+    python3 bundle.py render task/my-project 任务012 --index   # 渲染任务文件和任务索引
+    python3 bundle.py status task/my-project
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from status import STATUSES, format_seconds, now_text, patch_index_text, patch_task_text
+from task_graph import TaskGraph, lock_timeout_minutes, tracing
+
+BUNDLE_FILE = "任务集.db"
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    priority TEXT,
+    estimated TEXT,
+    hours INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    slack INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    owner TEXT,
+    locked_at REAL,
+    lock_deadline REAL,
+    started_at REAL,
+    finished_at REAL,
+    pending INTEGER NOT NULL,
+    notes TEXT,
+    body TEXT NOT NULL
+);
+CREATE TABLE deps (task INTEGER NOT NULL, dep INTEGER NOT NULL, PRIMARY KEY (task, dep)) WITHOUT ROWID;
+CREATE INDEX deps_by_dep ON deps (dep, task);
+CREATE INDEX tasks_by_status ON tasks (status);
+CREATE INDEX tasks_ready ON tasks (slack, id) WHERE status = 'Todo' AND pending = 0;
+"""
+
+
+def resolve_bundle(path) -> Path:
+    """接受任务集目录或数据库文件路径"""
+    path = Path(path)
+    return path / BUNDLE_FILE if path.is_dir() else path
+
+
+def write_bundle(path: Path, config: dict, graph: TaskGraph, bodies: Iterable[str], index_text: str) -> Path:
+    """写出任务集数据库（先写临时文件再替换）；bodies 按任务下标顺序给出渲染好的任务正文"""
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(tmp)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript(SCHEMA)
+
+    now = time.time()
+
+    def task_rows():
+        for index, body in enumerate(bodies):
+            record = graph.record(index)
+            deps = set(graph.dependencies(index))
+            locked = index == graph.locked
+            yield (
+                index, record.label, graph.text(index)["title"], record.priority, record.estimated,
+                record.hours, record.level, record.slack,
+                "Locked" if locked else "Todo",
+                "Agent A" if locked else None,
+                now if locked else None,
+                now + lock_timeout_minutes(record.hours) * 60 if locked else None,
+                len(deps),  # 不存在的依赖永远无法完成，同样计入
+                body,
+            )
+
+    conn.executemany(
+        "INSERT INTO tasks (id, label, title, priority, estimated, hours, level, slack, status, owner,"
+        " locked_at, lock_deadline, pending, body) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        task_rows(),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO deps (task, dep) VALUES (?, ?)",
+        ((task, dep) for task in range(len(graph)) for dep in graph.dependencies(task) if dep >= 0),
+    )
+    meta = {
+        "version": SCHEMA_VERSION,
+        "config": json.dumps(config, ensure_ascii=False),
+        "created": now_text(now),
+        "index": index_text,
+        "locked": graph.locked,
+    }
+    conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", ((k, str(v)) for k, v in meta.items()))
+    conn.commit()
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+    tmp.replace(path)
+    return path
+
+
+class Bundle:
+    """打开的任务集数据库；领用 / 开始 / 完成都在 BEGIN IMMEDIATE 事务中完成，多个 Agent 可并发操作"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"任务集数据库不存在: {self.path}")
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        version = self.meta("version")
+        if version != str(SCHEMA_VERSION):
+            raise ValueError(f"不支持的任务集数据库版本: {version}")
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        self.conn.close()
+
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def _task(self, label: str) -> sqlite3.Row:
+        row = self.conn.execute("SELECT * FROM tasks WHERE label = ?", (label,)).fetchone()
+        if row is None:
+            raise KeyError(f"任务不存在: {label}")
+        return row
+
+    # ---------- 状态变更 ----------
+
+    def release_expired(self, now: Optional[float] = None) -> int:
+        """释放超过锁定超时的任务（Locked → Todo）"""
+        cursor = self.conn.execute(
+            "UPDATE tasks SET status = 'Todo', owner = NULL, locked_at = NULL, lock_deadline = NULL"
+            " WHERE status = 'Locked' AND lock_deadline < ?",
+            (now or time.time(),),
+        )
+        return cursor.rowcount
+
+    def claim(self, owner: str, label: Optional[str] = None) -> Optional[sqlite3.Row]:
+        """领用一个可执行任务（默认取松弛时间最小的，即关键路径优先）；没有可领用的任务时返回 None"""
+        now = time.time()
+        self._transaction()
+        try:
+            self.release_expired(now)
+            if label:
+                row = self.conn.execute(
+                    "SELECT * FROM tasks WHERE label = ? AND status = 'Todo' AND pending = 0", (label,)
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    "SELECT * FROM tasks INDEXED BY tasks_ready"
+                    " WHERE status = 'Todo' AND pending = 0 ORDER BY slack, id LIMIT 1"
+                ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'Locked', owner = ?, locked_at = ?, lock_deadline = ? WHERE id = ?",
+                    (owner, now, now + lock_timeout_minutes(row["hours"]) * 60, row["id"]),
+                )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def start(self, label: str):
+        """Locked → In Progress"""
+        self._transaction()
+        try:
+            row = self._task(label)
+            if row["status"] != "Locked":
+                raise ValueError(f"{label} 的状态是 {row['status']}，只有已领用（Locked）的任务可以开始")
+            self.conn.execute(
+                "UPDATE tasks SET status = 'In Progress', started_at = ?, lock_deadline = NULL WHERE id = ?",
+                (time.time(), row["id"]),
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def complete(self, label: str, note: Optional[str] = None) -> List[str]:
+        """Locked / In Progress → Done，后继的未完成依赖数减一；返回因此变为可领用的任务"""
+        self._transaction()
+        try:
+            row = self._task(label)
+            if row["status"] == "Done":
+                self.conn.execute("COMMIT")
+                return []
+            if row["status"] not in ("Locked", "In Progress"):
+                raise ValueError(f"{label} 的状态是 {row['status']}，只有已领用（Locked）或进行中的任务可以完成")
+            notes = "\n".join(filter(None, (row["notes"], note))) or None
+            self.conn.execute(
+                "UPDATE tasks SET status = 'Done', finished_at = ?, lock_deadline = NULL, notes = ? WHERE id = ?",
+                (time.time(), notes, row["id"]),
+            )
+            self.conn.execute(
+                "UPDATE tasks SET pending = pending - 1 WHERE id IN (SELECT task FROM deps WHERE dep = ?)",
+                (row["id"],),
+            )
+            ready = [r[0] for r in self.conn.execute(
+                "SELECT label FROM tasks WHERE id IN (SELECT task FROM deps WHERE dep = ?)"
+                " AND status = 'Todo' AND pending = 0 ORDER BY slack, id",
+                (row["id"],),
+            )]
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return ready
+
+    # ---------- 查询 ----------
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATUSES, 0)
+        for status, count in self.conn.execute("SELECT status, count(*) FROM tasks GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def summary(self, now: Optional[float] = None) -> dict:
+        """任务索引中的统计/进度字段（与 status.py 汇总的字段一致）"""
+        counts = self.counts()
+        total = sum(counts.values())
+        done = counts["Done"]
+        first, last = self.conn.execute(
+            "SELECT min(coalesce(started_at, locked_at)), max(finished_at) FROM tasks"
+        ).fetchone()
+        remaining = self.conn.execute("SELECT coalesce(sum(hours), 0) FROM tasks WHERE status != 'Done'").fetchone()[0]
+        if first:
+            finish = last if done == total and last else (now or time.time())
+            elapsed = max(0.0, finish - first) / 3600
+        else:
+            elapsed = 0
+        return {
+            "TOTAL_TASKS": total,
+            "COMPLETED": done,
+            "IN_PROGRESS": counts["In Progress"],
+            "TODO": total - done - counts["In Progress"] - counts["Locked"],
+            "LOCKED": counts["Locked"],
+            "PROGRESS_PERCENT": done * 100 // total if total else 0,
+            "ELAPSED_TIME": round(elapsed, 2),
+            "ESTIMATED_REMAINING": f"{remaining}h",
+        }
+
+    def ready(self, limit: Optional[int] = None) -> List[str]:
+        sql = "SELECT label FROM tasks INDEXED BY tasks_ready WHERE status = 'Todo' AND pending = 0 ORDER BY slack, id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [row[0] for row in self.conn.execute(sql)]
+
+    # ---------- 渲染 ----------
+
+    def render_task(self, label: str) -> str:
+        """按当前状态渲染任务文件内容"""
+        row = self._task(label)
+        records = {
+            "owner": row["owner"] or "-",
+            "lock_time": now_text(row["locked_at"]) if row["locked_at"] else "-",
+        }
+        begin = row["started_at"] or row["locked_at"]
+        if row["started_at"]:
+            records["start"] = now_text(row["started_at"])
+        if row["finished_at"]:
+            records["end"] = now_text(row["finished_at"])
+            if begin:
+                records["duration"] = format_seconds(row["finished_at"] - begin)
+        content = patch_task_text(row["body"], row["status"], **records)
+        for note in reversed((row["notes"] or "").splitlines()):
+            content = patch_task_text(content, row["status"], note)
+
+        # 依赖清单按依赖任务的当前状态打勾
+        for dep, status in self.conn.execute(
+            "SELECT t.label, t.status FROM deps d JOIN tasks t ON t.id = d.dep WHERE d.task = ?", (row["id"],)
+        ):
+            if status != "Todo":
+                mark = "x" if status == "Done" else " "
+                content = content.replace(f"- [ ] {dep} (状态: Todo)", f"- [{mark}] {dep} (状态: {status})", 1)
+        return content
+
+    def render_index(self) -> str:
+        """按当前状态渲染任务索引（生成时的索引正文 + 最新统计和任务行状态）"""
+        locked = int(self.meta("locked") or -1)
+        statuses = dict(self.conn.execute(
+            "SELECT label, status FROM tasks WHERE status != 'Todo' OR id = ?", (locked,)
+        ).fetchall())
+        fields = {key: value for key, value in self.summary().items() if key != "TOTAL_TASKS"}
+        return patch_index_text(self.meta("index"), fields, statuses)
+
+    def render(self, labels: Iterable[str], output_dir: Path, index: bool = False) -> List[Path]:
+        """把指定任务（和任务索引）渲染成 Markdown 文件"""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for label in labels:
+            path = output_dir / f"{label}.md"
+            path.write_text(self.render_task(label), encoding="utf-8")
+            paths.append(path)
+        if index:
+            path = output_dir / "任务索引.md"
+            path.write_text(self.render_index(), encoding="utf-8")
+            paths.append(path)
+        return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="单文件任务集（SQLite）：领用、完成、渲染、统计")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    claim = subparsers.add_parser("claim", help="领用一个可执行任务")
+    claim.add_argument("bundle", help=f"任务集目录或 {BUNDLE_FILE} 路径")
+    claim.add_argument("--owner", default="Agent A", help="占用者（默认: Agent A）")
+    claim.add_argument("--task", help="领用指定任务（须为可执行的 Todo 任务）")
+    claim.add_argument("--render", action="store_true", help="同时把任务渲染为 Markdown 文件")
+
+    start = subparsers.add_parser("start", help="开始执行已领用的任务（Locked → In Progress）")
+    start.add_argument("bundle", help=f"任务集目录或 {BUNDLE_FILE} 路径")
+    start.add_argument("task", help="任务ID（如 任务012）")
+
+    complete = subparsers.add_parser("complete", help="标记任务完成")
+    complete.add_argument("bundle", help=f"任务集目录或 {BUNDLE_FILE} 路径")
+    complete.add_argument("task", help="任务ID（如 任务012）")
+    complete.add_argument("--note", help="追加到任务备注")
+
+    render = subparsers.add_parser("render", help="把指定任务渲染为 Markdown 文件")
+    render.add_argument("bundle", help=f"任务集目录或 {BUNDLE_FILE} 路径")
+    render.add_argument("tasks", nargs="*", help="任务ID")
+    render.add_argument("--ready", action="store_true", help="渲染所有可领用的任务")
+    render.add_argument("--index", action="store_true", help="渲染任务索引.md")
+    render.add_argument("--output", "-o", help="输出目录（默认: 数据库所在目录）")
+
+    status = subparsers.add_parser("status", help="输出进度统计")
+    status.add_argument("bundle", help=f"任务集目录或 {BUNDLE_FILE} 路径")
+    status.add_argument("--json", action="store_true", help="以 JSON 输出")
+
+    args = parser.parse_args()
+    path = resolve_bundle(args.bundle)
+    try:
+        bundle = Bundle(path)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    try:
+        if args.command == "claim":
+            row = bundle.claim(args.owner, args.task)
+            if row is None:
+                print("✗ 没有可领用的任务" + (f": {args.task} 不是可执行的 Todo 任务" if args.task else ""))
+                sys.exit(1)
+            print(f"✓ 领用: {row['label']} {row['title']}（{row['estimated']}，占用者 {args.owner}）")
+            if args.render:
+                print(f"✓ 生成: {bundle.render([row['label']], path.parent)[0]}")
+        elif args.command == "start":
+            bundle.start(args.task)
+            print(f"✓ 开始: {args.task}")
+        elif args.command == "complete":
+            ready = bundle.complete(args.task, args.note)
+            print(f"✓ 完成: {args.task}")
+            if ready:
+                print(f"  新的可领用任务: {', '.join(ready)}")
+        elif args.command == "render":
+            labels = list(args.tasks) + (bundle.ready() if args.ready else [])
+            if not labels and not args.index:
+                parser.error("需要任务ID、--ready 或 --index")
+            started = time.perf_counter()
+            paths = bundle.render(labels, Path(args.output) if args.output else path.parent, index=args.index)
+            for output in paths[:20]:
+                print(f"✓ 生成: {output}")
+            if len(paths) > 20:
+                print(f"✓ 生成: 共 {len(paths)} 个文件")
+            print(f"  用时 {(time.perf_counter() - started) * 1000:.1f} ms")
+        else:
+            fields = bundle.summary()
+            if args.json:
+                print(json.dumps(fields, ensure_ascii=False))
+            else:
+                print(f"✓ {fields['COMPLETED']}/{fields['TOTAL_TASKS']} 已完成 ({fields['PROGRESS_PERCENT']}%)"
+                      f"  进行中 {fields['IN_PROGRESS']}  已锁定 {fields['LOCKED']}  待开始 {fields['TODO']}"
+                      f"  已用 {fields['ELAPSED_TIME']} 小时  剩余 {fields['ESTIMATED_REMAINING']}")
+                ready = bundle.ready(limit=10)
+                print(f"  可领用: {', '.join(ready) if ready else '无'}")
+    except (KeyError, ValueError) as e:
+        print(f"✗ {e.args[0]}")
+        sys.exit(1)
+    finally:
+        bundle.close()
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/bundle"):
+        main()
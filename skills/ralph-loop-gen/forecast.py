@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 完成时间预测（蒙特卡洛）
+
+- 每个未完成任务的耗时按三角分布抽样（预计时间 × 乐观系数 ~ 预计时间 × 悲观系数，众数为预计时间）
+- 按固定的领用顺序（最早开始时间、松弛时间）把任务派给 N 个 Agent，模拟剩余工期
+- 同时按纯依赖关系（不限 Agent 数）计算每次模拟的关键路径，统计每个任务落在关键路径上的概率
+- 有 NumPy 时每批几千次模拟一起计算；没有时逐次模拟（较慢）
+- 结果写入任务索引的「完成时间预测」一节，以及任务集目录下的 完成预测.json
+
+用法:
+    python3 forecast.py --config tasks.json --simulations 10000 --agents 3
+"""
+
+import argparse
+import heapq
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from status import StatusAggregator, write_if_changed
+from task_graph import TaskGraph, np, tracing
+
+FORECAST_FILE = "完成预测.json"
+SECTION_TITLE = "## 完成时间预测"
+# 索引中列出的关键路径概率下限和最多行数（完整结果在 完成预测.json）
+SHOW_PROBABILITY = 0.01
+SHOW_LIMIT = 50
+# 单批模拟的内存预算（MB）：每次模拟每个任务占 3 个 float64
+BATCH_MEMORY_MB = 256
+MAX_BATCH = 4096
+# 判断松弛为 0 的容差（小时）
+TOLERANCE = 1e-6
+
+
+class Forecast:
+    """对任务图中未完成、可排期的任务做蒙特卡洛模拟"""
+
+    def __init__(self, graph: TaskGraph, done: Iterable[str] = (), agents: int = 3,
+                 optimistic: float = 0.8, pessimistic: float = 1.8):
+        if not 0 < optimistic <= 1 <= pessimistic:
+            raise ValueError("需要 0 < 乐观系数 <= 1 <= 悲观系数")
+        self.graph = graph
+        self.agents = agents
+        self.optimistic = optimistic
+        self.pessimistic = pessimistic
+
+        finished = set(done)
+        active = [t for t in graph.dispatch_order() if graph.labels[t] not in finished]
+        position = {task: pos for pos, task in enumerate(active)}
+
+        self.tasks = active
+        self.done = len(graph.order) - len(active)
+        self.hours = [float(graph.hours[t]) for t in active]
+        # 只保留仍未完成的依赖（位置下标，去重）
+        self.deps: List[List[int]] = [
+            sorted({position[d] for d in graph.dependencies(t) if d in position}) for t in active
+        ]
+        if np is not None:
+            self._deps_np = [np.asarray(d, dtype=np.intp) if len(d) > 1 else d for d in self.deps]
+            self._hours_np = np.asarray(self.hours, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    # ---------- 抽样 ----------
+
+    def sample(self, rng, count: int):
+        """抽取 count 次模拟的任务耗时：NumPy 下为 (任务数, count) 数组，否则为每次模拟一个列表"""
+        if np is not None:
+            hours = self._hours_np[:, None]
+            return _triangular(rng.random((len(self), count)), hours * self.optimistic, hours,
+                               hours * self.pessimistic)
+        return [[rng.triangular(h * self.optimistic, h * self.pessimistic, h) for h in self.hours]
+                for _ in range(count)]
+
+    # ---------- 模拟 ----------
+
+    def simulate(self, durations):
+        """返回 (限定 Agent 数的剩余工期, 不限 Agent 数的剩余工期, 每个任务在关键路径上的次数)"""
+        if np is not None:
+            return self._simulate_batch(durations)
+        constrained, free, counts = [], [], [0] * len(self)
+        for sample in durations:
+            span, unconstrained, critical = self._simulate_one(sample)
+            constrained.append(span)
+            free.append(unconstrained)
+            for pos in critical:
+                counts[pos] += 1
+        return constrained, free, counts
+
+    def _simulate_one(self, durations: List[float]):
+        deps, agents = self.deps, self.agents
+        m = len(durations)
+
+        finish = [0.0] * m
+        if agents:
+            pool = [0.0] * agents
+            for pos in range(m):
+                ready = max((finish[d] for d in deps[pos]), default=0.0)
+                start = max(ready, heapq.heappop(pool))
+                finish[pos] = start + durations[pos]
+                heapq.heappush(pool, finish[pos])
+            constrained = max(pool)
+        else:
+            constrained = None
+
+        for pos in range(m):
+            finish[pos] = max((finish[d] for d in deps[pos]), default=0.0) + durations[pos]
+        span = max(finish, default=0.0)
+        if constrained is None:
+            constrained = span
+
+        latest = [span] * m
+        for pos in range(m - 1, -1, -1):
+            start = latest[pos] - durations[pos]
+            for d in deps[pos]:
+                if latest[d] > start:
+                    latest[d] = start
+        critical = [pos for pos in range(m) if latest[pos] - finish[pos] <= TOLERANCE]
+        return constrained, span, critical
+
+    def _simulate_batch(self, durations):
+        m, count = durations.shape
+        if not m:
+            zeros = np.zeros(count)
+            return zeros, zeros, np.zeros(0, dtype=np.int64)
+        deps = self._deps_np
+        finish = np.empty_like(durations)
+        buffer = np.empty_like(durations)
+        zero = np.zeros(count)
+
+        if self.agents:
+            # 每次模拟各自维护 N 个 Agent 的空闲时刻，任务交给最早空闲的 Agent
+            pool = np.zeros((self.agents, count))
+            columns = np.arange(count)
+            for pos in range(m):
+                dep = deps[pos]
+                ready = buffer[dep].max(axis=0) if len(dep) > 1 else (buffer[dep[0]] if dep else zero)
+                agent = pool.argmin(axis=0)
+                start = np.maximum(ready, pool[agent, columns])
+                buffer[pos] = start + durations[pos]
+                pool[agent, columns] = buffer[pos]
+            constrained = pool.max(axis=0)
+
+        for pos in range(m):
+            dep = deps[pos]
+            ready = finish[dep].max(axis=0) if len(dep) > 1 else (finish[dep[0]] if dep else zero)
+            np.add(ready, durations[pos], out=finish[pos])
+        span = finish.max(axis=0)
+        if not self.agents:
+            constrained = span
+
+        # 反向计算最晚完成时间，复用 buffer
+        latest = buffer
+        latest[:] = span
+        for pos in range(m - 1, -1, -1):
+            dep = deps[pos]
+            if not len(dep):
+                continue
+            start = latest[pos] - durations[pos]
+            if len(dep) > 1:
+                latest[dep] = np.minimum(latest[dep], start)
+            else:
+                np.minimum(latest[dep[0]], start, out=latest[dep[0]])
+        counts = np.count_nonzero(latest - finish <= TOLERANCE, axis=1)
+        return constrained, span, counts
+
+    def baseline(self) -> float:
+        """按预计时间（不抽样）排期的剩余工期"""
+        if np is not None:
+            return float(self._simulate_batch(self._hours_np[:, None].copy())[0][0])
+        return self._simulate_one(self.hours)[0]
+
+    # ---------- 汇总 ----------
+
+    def run(self, simulations: int, seed: Optional[int] = None, batch: Optional[int] = None) -> dict:
+        batch = batch or self.batch_size()
+        rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        constrained, free = [], []
+        counts = [0] * len(self)
+        done = 0
+        while done < simulations:
+            size = min(batch, simulations - done)
+            spans, unconstrained, critical = self.simulate(self.sample(rng, size))
+            constrained.extend(map(float, spans))
+            free.extend(map(float, unconstrained))
+            for pos, hits in enumerate(critical):
+                counts[pos] += int(hits)
+            done += size
+
+        constrained.sort()
+        free.sort()
+        graph = self.graph
+        return {
+            "simulations": simulations,
+            "agents": self.agents,
+            "optimistic": self.optimistic,
+            "pessimistic": self.pessimistic,
+            "tasks": len(self),
+            "done": self.done,
+            "unscheduled": graph.blocked,
+            "baseline": round(self.baseline(), 2),
+            "mean": round(sum(constrained) / simulations, 2) if simulations else 0,
+            "p10": round(_percentile(constrained, 10), 2),
+            "p50": round(_percentile(constrained, 50), 2),
+            "p90": round(_percentile(constrained, 90), 2),
+            "unconstrained_p50": round(_percentile(free, 50), 2),
+            "unconstrained_p90": round(_percentile(free, 90), 2),
+            "critical": {graph.labels[t]: round(counts[pos] / simulations, 4) if simulations else 0
+                         for pos, t in enumerate(self.tasks)},
+        }
+
+    def batch_size(self, memory_mb: float = BATCH_MEMORY_MB) -> int:
+        if np is None:
+            return 1
+        per_simulation = 3 * 8 * max(1, len(self))
+        return int(max(64, min(MAX_BATCH, memory_mb * 1024 * 1024 // per_simulation)))
+
+
+def _triangular(u, low, mode, high):
+    """三角分布的逆 CDF（允许 low == high，此时恒为 low）"""
+    width = high - low
+    safe = np.where(width > 0, width, 1.0)
+    left = low + np.sqrt(u * width * (mode - low))
+    right = high - np.sqrt((1 - u) * width * (high - mode))
+    return np.where(u < (mode - low) / safe, left, right)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """已排序列表的百分位数（线性插值）"""
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * q / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def render_section(result: dict, graph: TaskGraph) -> str:
+    """任务索引中的「完成时间预测」一节"""
+    agents = f"{result['agents']} 个 Agent" if result["agents"] else "不限 Agent 数"
+    lines = [
+        SECTION_TITLE,
+        "",
+        f"> 蒙特卡洛模拟 {result['simulations']} 次，{agents}；任务耗时按三角分布"
+        f"（预计时间 × {result['optimistic']} ~ × {result['pessimistic']}）抽样，已完成的任务不计入。",
+        f"> 更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        f"- 剩余任务: {result['tasks']}（已完成 {result['done']}，无法排期 {result['unscheduled']}）",
+        f"- 剩余工期 P50: {result['p50']} 小时",
+        f"- 剩余工期 P90: {result['p90']} 小时",
+        f"- 按预计时间排期: {result['baseline']} 小时",
+        f"- 不限 Agent 数时 P50 / P90: {result['unconstrained_p50']} / {result['unconstrained_p90']} 小时",
+        "",
+        "### 关键路径概率",
+        "",
+    ]
+
+    ranked = sorted(((p, label) for label, p in result["critical"].items() if p >= SHOW_PROBABILITY),
+                    key=lambda item: -item[0])
+    if not ranked:
+        lines.append("无")
+        return "\n".join(lines)
+
+    index_of = {graph.labels[t]: t for t in graph.order}
+    lines.append("| ID | 标题 | 预计时间 | 关键路径概率 |")
+    lines.append("|----|------|----------|--------------|")
+    for probability, label in ranked[:SHOW_LIMIT]:
+        record = graph.record(index_of[label])
+        title = graph.text(record.index)["title"]
+        lines.append(f"| {label} | {title} | {record.estimated} | {probability:.0%} |")
+    if len(ranked) > SHOW_LIMIT:
+        lines.append("")
+        lines.append(f"另有 {len(ranked) - SHOW_LIMIT} 个任务的概率不低于 {SHOW_PROBABILITY:.0%}，见 `{FORECAST_FILE}`")
+    return "\n".join(lines)
+
+
+def replace_section(content: str, section: str) -> str:
+    """替换（或追加）索引中的「完成时间预测」一节"""
+    start = content.find(f"\n{SECTION_TITLE}\n")
+    if start < 0:
+        return content.rstrip("\n") + "\n\n" + section + "\n"
+    end = content.find("\n## ", start + 1)
+    tail = content[end:] if end >= 0 else "\n"
+    return content[:start + 1] + section + ("\n" if end >= 0 else "") + tail
+
+
+def completed_labels(output_dir: Path) -> List[str]:
+    """任务集目录中已完成的任务（目录不存在时为空）"""
+    if not output_dir.is_dir():
+        return []
+    aggregator = StatusAggregator(output_dir)
+    aggregator.scan()
+    return [label for label, status in aggregator.statuses().items() if status == "Done"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="蒙特卡洛预测剩余工期和关键路径概率")
+    parser.add_argument("--config", "-c", required=True, help="任务配置文件路径（JSON 格式）")
+    parser.add_argument("--output", "-o", default="task", help="任务输出目录（默认: task，与 generate.py 一致）")
+    parser.add_argument("--simulations", "-n", type=int, default=10000, help="模拟次数（默认: 10000）")
+    parser.add_argument("--agents", "-a", type=int, default=3, help="并行 Agent 数，0 表示不限（默认: 3）")
+    parser.add_argument("--optimistic", type=float, default=0.8, help="乐观系数（默认: 0.8）")
+    parser.add_argument("--pessimistic", type=float, default=1.8, help="悲观系数（默认: 1.8）")
+    parser.add_argument("--seed", type=int, help="随机种子（便于复现）")
+    parser.add_argument("--batch", type=int, help="每批模拟次数（默认按内存预算自动选择）")
+    parser.add_argument("--no-index", action="store_true", help="不写入任务索引和 完成预测.json，只打印结果")
+
+    args = parser.parse_args()
+
+    config_path = Path(args.config)
+    if not config_path.exists():
+        print(f"✗ 配置文件不存在: {config_path}")
+        sys.exit(1)
+    try:
+        config, graph = TaskGraph.load(config_path)
+    except json.JSONDecodeError as e:
+        print(f"✗ 配置文件格式错误: {e}")
+        sys.exit(1)
+
+    output_dir = Path(args.output) / config.get("taskSetName", "defaultTask")
+    try:
+        forecast = Forecast(graph, completed_labels(output_dir), agents=args.agents,
+                            optimistic=args.optimistic, pessimistic=args.pessimistic)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    if np is None:
+        print("⚠ 未安装 NumPy，逐次模拟会比较慢")
+    started = time.perf_counter()
+    result = forecast.run(args.simulations, seed=args.seed, batch=args.batch)
+    elapsed = time.perf_counter() - started
+
+    print(f"✓ 模拟 {args.simulations} 次（{len(forecast)} 个剩余任务），用时 {elapsed:.2f}s")
+    print(f"  剩余工期 P50: {result['p50']}h  P90: {result['p90']}h  按预计时间: {result['baseline']}h")
+    top = sorted(result["critical"].items(), key=lambda item: -item[1])[:5]
+    if top:
+        print("  关键路径概率最高: " + "  ".join(f"{label} {p:.0%}" for label, p in top))
+
+    index_path = output_dir / "任务索引.md"
+    if not args.no_index and index_path.exists():
+        content = index_path.read_text(encoding="utf-8")
+        write_if_changed(index_path, content, replace_section(content, render_section(result, graph)))
+        with open(output_dir / FORECAST_FILE, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✓ 更新: {index_path}")
+    elif not args.no_index:
+        print(f"⚠ 未找到任务索引 {index_path}，请先运行 generate.py")
+    graph.close()
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/forecast"):
+        main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 甘特图（SVG）
+
+- batch：按批次分组，每个任务一行，任务从最早开始时间画起（不限并行度）
+- agents：N 条 Agent 泳道，任务按领用顺序（最早开始时间、松弛时间）派给最早空闲的 Agent
+- 条形长度按预计时间，关键路径（松弛为 0）上的任务高亮，依赖画成箭头（默认已传递归约）
+- SVG 元素逐行写出，不在内存中构建 DOM；画布尺寸在写出前就能算出
+- 缩小视图时：小于 MIN_BAR 像素或互相重叠的条形合并为一个聚合块；
+  行数过多时 batch 模式每个批次只画一行；--window 只画时间窗口内的部分（窗口外的元素直接跳过）
+
+用法:
+    python3 gantt.py tasks.json --mode agents --agents 3 -o 甘特图.svg
+    python3 gantt.py tasks.json --mode batch --window 0:200 -o 前200小时.svg
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from graph_export import transitive_reduction
+from task_graph import TaskGraph, tracing
+
+GANTT_FILE = "甘特图.svg"
+MODES = ("batch", "agents")
+
+# 画布布局（像素）
+LABEL_WIDTH = 150
+MARGIN = 20
+AXIS_HEIGHT = 30
+TASK_ROW = 18
+LANE_ROW = 30
+# 宽度小于该值的条形与相邻条形合并；由小条形合并出的聚合块最宽 MAX_CLUSTER
+MIN_BAR = 2.0
+MAX_CLUSTER = 24.0
+# batch 模式超过该行数时每个批次只画一行
+ROW_LIMIT = 2000
+# 单独画出的任务超过该数时不画依赖箭头
+ARROW_LIMIT = 5000
+
+COLORS = {"bar": "#4e79a7", "critical": "#e15759", "cluster": "#9c9c9c", "band": "#f3f3f3"}
+
+
+def schedule_agents(graph: TaskGraph, agents: int) -> Tuple[array, array, int]:
+    """列表调度：返回 (开始时间, 所在泳道, 总工期)；未排期任务的泳道为 -1"""
+    n = len(graph)
+    start = array("q", bytes(8 * n))
+    lane = array("i", [-1]) * n
+    finish = array("q", bytes(8 * n))
+    pool = [(0, k) for k in range(agents)]
+    for task in graph.dispatch_order():
+        ready = max((finish[d] for d in graph.dependencies(task)), default=0)
+        free, k = heapq.heappop(pool)
+        start[task] = max(ready, free)
+        finish[task] = start[task] + graph.hours[task]
+        lane[task] = k
+        heapq.heappush(pool, (finish[task], k))
+    return start, lane, max((f for f, _ in pool), default=0)
+
+
+class Gantt:
+    """甘特图的行布局和坐标换算"""
+
+    def __init__(self, graph: TaskGraph, mode: str = "agents", agents: int = 3, width: int = 1600,
+                 window: Optional[Tuple[float, float]] = None, keep: Optional[bytearray] = None):
+        self.graph = graph
+        self.mode = mode
+        self.keep = keep
+        if mode == "agents":
+            self.start, lane, self.makespan = schedule_agents(graph, agents)
+            self.rows = [[] for _ in range(agents)]
+            for task in graph.dispatch_order():
+                self.rows[lane[task]].append(task)
+            self.row_titles = [f"Agent {chr(65 + k)}" if k < 26 else f"Agent {k + 1}" for k in range(agents)]
+            self.row_height = LANE_ROW
+            self.bands = []
+        else:
+            self.start, self.makespan = graph.earliest, graph.makespan
+            self.rows, self.row_titles, self.bands = [], [], []
+            detailed = len(graph.order) <= ROW_LIMIT
+            for number, members in enumerate(graph.batches(), 1):
+                members = sorted(members, key=lambda t: (self.start[t], t))
+                if detailed:
+                    self.bands.append((len(self.rows), len(members), f"批次 {number}"))
+                    self.rows.extend([t] for t in members)
+                    self.row_titles.extend(graph.labels[t] for t in members)
+                else:
+                    self.rows.append(members)
+                    self.row_titles.append(f"批次 {number}（{len(members)}）")
+            self.row_height = TASK_ROW if detailed else LANE_ROW
+
+        low, high = window if window else (0, max(self.makespan, 1))
+        self.low, self.high = low, max(high, low + 1)
+        self.scale = width / (self.high - self.low)
+        self.width = LABEL_WIDTH + width + MARGIN
+        self.height = AXIS_HEIGHT + len(self.rows) * self.row_height + MARGIN
+
+    def x(self, hours: float) -> float:
+        return LABEL_WIDTH + (hours - self.low) * self.scale
+
+    def y(self, row: int) -> float:
+        return AXIS_HEIGHT + row * self.row_height
+
+    def visible(self, task: int) -> Optional[Tuple[float, float]]:
+        """任务条形在窗口内的像素区间；完全在窗口外时为 None"""
+        begin = self.start[task]
+        end = begin + self.graph.hours[task]
+        if end < self.low or begin > self.high or (end == begin and not self.low <= begin <= self.high):
+            return None
+        return self.x(max(begin, self.low)), self.x(min(end, self.high))
+
+
+def _ticks(low: float, high: float, target: int = 12) -> Iterator[float]:
+    """时间轴刻度：取 1/2/5 × 10^k 小时中最接近 target 个刻度的步长"""
+    span = high - low
+    step = 1
+    for magnitude in (1, 10, 100, 1000, 10000, 100000):
+        for base in (1, 2, 5):
+            step = base * magnitude
+            if span / step <= target:
+                break
+        else:
+            continue
+        break
+    tick = (int(low) // step) * step
+    while tick <= high:
+        if tick >= low:
+            yield tick
+        tick += step
+
+
+def _group_bars(gantt: Gantt, tasks: List[int]) -> Iterator[Tuple[float, float, List[int]]]:
+    """把一行中的任务合并成要画的块：(x0, x1, 任务)；任务多于一个即为聚合块"""
+    group = None
+    for task in tasks:
+        span = gantt.visible(task)
+        if span is None:
+            continue
+        x0, x1 = span
+        tiny = x1 - x0 < MIN_BAR
+        if group is not None:
+            g0, g1, members = group
+            # 重叠的条形必须合并；相邻的小条形合并到聚合块达到 MAX_CLUSTER 为止
+            overlaps = x0 < g1 - 0.01
+            small = tiny or g1 - g0 < MIN_BAR
+            if overlaps or (small and x0 <= g1 + 0.5 and max(g1, x1) - g0 <= MAX_CLUSTER):
+                members.append(task)
+                group = (g0, max(g1, x1), members)
+                continue
+            yield group
+        group = (x0, x1, [task])
+    if group is not None:
+        yield group
+
+
+def iter_svg(gantt: Gantt) -> Iterator[str]:
+    """逐行产出 SVG"""
+    graph = gantt.graph
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{gantt.width:.0f}" height="{gantt.height:.0f}" '
+           f'font-family="sans-serif" font-size="11">')
+    yield ('<defs><marker id="arrow" viewBox="0 0 6 6" refX="6" refY="3" markerWidth="6" markerHeight="6" '
+           'orient="auto"><path d="M0,0 L6,3 L0,6 z" fill="#555"/></marker></defs>')
+    yield '<rect width="100%" height="100%" fill="white"/>'
+
+    # 批次底色带
+    for i, (first, count, title) in enumerate(gantt.bands):
+        if i % 2:
+            yield (f'<rect x="0" y="{gantt.y(first):.1f}" width="{gantt.width:.0f}" '
+                   f'height="{count * gantt.row_height}" fill="{COLORS["band"]}"><title>{escape(title)}</title></rect>')
+
+    # 时间轴
+    bottom = gantt.y(len(gantt.rows))
+    for tick in _ticks(gantt.low, gantt.high):
+        x = gantt.x(tick)
+        yield f'<line x1="{x:.1f}" y1="{AXIS_HEIGHT - 4}" x2="{x:.1f}" y2="{bottom:.1f}" stroke="#ddd"/>'
+        yield f'<text x="{x:.1f}" y="{AXIS_HEIGHT - 8}" text-anchor="middle">{tick:g}h</text>'
+
+    # 行标题与条形
+    positions: Dict[int, Tuple[float, float, float]] = {}
+    for row, tasks in enumerate(gantt.rows):
+        y = gantt.y(row)
+        bar_height = gantt.row_height - 6
+        yield f'<text x="{MARGIN / 2:.0f}" y="{y + gantt.row_height / 2 + 4:.1f}">{escape(gantt.row_titles[row])}</text>'
+        for x0, x1, members in _group_bars(gantt, tasks):
+            width = max(x1 - x0, 1.0)
+            if len(members) > 1:
+                hours = sum(graph.hours[t] for t in members)
+                tip = f"{len(members)} 个任务: {graph.labels[members[0]]} … {graph.labels[members[-1]]}（{hours}h）"
+                yield (f'<rect x="{x0:.1f}" y="{y + 3:.1f}" width="{width:.1f}" height="{bar_height}" '
+                       f'fill="{COLORS["cluster"]}"><title>{escape(tip)}</title></rect>')
+                continue
+            task = members[0]
+            positions[task] = (x0, x1, y + gantt.row_height / 2)
+            record = graph.record(task)
+            color = COLORS["critical"] if record.slack == 0 else COLORS["bar"]
+            tip = (f"{record.label}: {graph.text(task)['title']}（{record.estimated}，"
+                   f"开始 {gantt.start[task]}h，松弛 {record.slack}h）")
+            yield (f'<rect x="{x0:.1f}" y="{y + 3:.1f}" width="{width:.1f}" height="{bar_height}" rx="2" '
+                   f'fill="{color}"><title>{escape(tip)}</title></rect>')
+            if width >= 7 * len(record.label):
+                yield (f'<text x="{x0 + 3:.1f}" y="{y + gantt.row_height / 2 + 4:.1f}" fill="white">'
+                       f'{escape(record.label)}</text>')
+
+    # 依赖箭头：两端都单独画出时才画
+    if len(positions) <= ARROW_LIMIT:
+        offsets, targets, keep = graph.dep_offsets, graph.dep_targets, gantt.keep
+        for task, (x0, _, y) in positions.items():
+            for edge in range(offsets[task], offsets[task + 1]):
+                dep = targets[edge]
+                if dep < 0 or dep not in positions or (keep is not None and not keep[edge]):
+                    continue
+                _, dx1, dy = positions[dep]
+                mid = (dx1 + x0) / 2
+                yield (f'<path d="M{dx1:.1f},{dy:.1f} C{mid:.1f},{dy:.1f} {mid:.1f},{y:.1f} {x0:.1f},{y:.1f}" '
+                       f'fill="none" stroke="#555" stroke-width="0.8" marker-end="url(#arrow)"/>')
+
+    caption = f"{len(graph)} 个任务 · 总工期 {gantt.makespan}h"
+    if graph.blocked:
+        caption += f" · {graph.blocked} 个任务无法排期（未画出）"
+    yield (f'<text x="{gantt.width - MARGIN:.0f}" y="{gantt.height - 5:.0f}" text-anchor="end" fill="#777">'
+           f'{escape(caption)}</text>')
+    yield "</svg>"
+
+
+def write_gantt(gantt: Gantt, output_path: Path) -> Path:
+    with open(output_path, "w", encoding="utf-8") as f:
+        for line in iter_svg(gantt):
+            f.write(line)
+            f.write("\n")
+    return output_path
+
+
+def parse_window(value: str) -> Tuple[float, float]:
+    """"START:END"（小时）"""
+    try:
+        low, high = (float(v) for v in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"时间窗口应为 起始:结束（小时）: {value}")
+    if high <= low:
+        raise argparse.ArgumentTypeError(f"时间窗口的结束应大于起始: {value}")
+    return low, high
+
+
+def main():
+    parser = argparse.ArgumentParser(description="把任务排期画成 SVG 甘特图")
+    parser.add_argument("config", help="任务配置文件路径（JSON 格式）")
+    parser.add_argument("--mode", "-m", choices=MODES, default="agents", help="batch 按批次 / agents 按 Agent 泳道（默认: agents）")
+    parser.add_argument("--agents", "-a", type=int, default=3, help="agents 模式的 Agent 数（默认: 3）")
+    parser.add_argument("--width", type=int, default=1600, help="时间轴宽度（像素，默认: 1600）")
+    parser.add_argument("--window", type=parse_window, metavar="START:END", help="只画该时间窗口（小时）")
+    parser.add_argument("--keep-transitive", action="store_true", help="依赖箭头保留被传递蕴含的边")
+    parser.add_argument("--output", "-o", default=GANTT_FILE, help=f"输出文件（默认: {GANTT_FILE}）")
+
+    args = parser.parse_args()
+    if args.agents < 1:
+        parser.error("Agent 数至少为 1")
+
+    try:
+        _, graph = TaskGraph.load(args.config)
+    except json.JSONDecodeError as e:
+        print(f"✗ 配置文件格式错误: {e}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    keep = None if args.keep_transitive else transitive_reduction(graph)
+    gantt = Gantt(graph, args.mode, args.agents, args.width, args.window, keep)
+    write_gantt(gantt, Path(args.output))
+    graph.close()
+    print(f"✓ 生成: {args.output}（{len(gantt.rows)} 行，总工期 {gantt.makespan}h，"
+          f"{time.perf_counter() - started:.2f}s）")
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/gantt"):
+        main()
@@ -7,13 +7,26 @@ Ralph Loop Gen - 任务管理模板生成器（Python 版本）
 
 import json
 import os
+import re
 import sys
 import argparse
+import itertools
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from bundle import BUNDLE_FILE, write_bundle
+from gantt import GANTT_FILE, MODES as GANTT_MODES, Gantt, write_gantt
+from graph_export import EXPORT_FILES, DependencyView, iter_ascii, parse_formats, write_graph
+from partition import OVERVIEW_FILE, compact_partitions, partition_graph, partition_overview, write_partition_configs
+from status import SHARD_DIR
+from task_graph import TaskGraph, format_task_id, lock_timeout_minutes, stage, tracing
 
 # 模板文件路径
 TEMPLATES_DIR = Path(__file__).parent / "templates"
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+# 任务数超过该值时不再逐个打印生成的任务文件
+VERBOSE_LIMIT = 200
 
 
 def read_template(template_name: str) -> str:
@@ -33,92 +46,75 @@ def fill_template(template: str, data: dict) -> str:
     return result
 
 
-def format_task_id(task_id: str) -> str:
-    """格式化任务ID"""
-    return f"任务{task_id.zfill(3)}"
-
-
 def get_current_time() -> str:
     """获取当前时间"""
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
-def parse_estimated_time(estimated: str) -> int:
-    """解析预计时间，返回小时数"""
-    import re
-    match = re.search(r"(\d+)", estimated)
-    return int(match.group(1)) if match else 2
+def fill_template_lines(template: str, data: dict) -> Iterator[str]:
+    """流式填充模板占位符
+
+    值可以是普通值，也可以是逐行产出文本的迭代器（行间以换行拼接），
+    这样百万行的任务表不必先拼成一个字符串。
+    """
+    pos = 0
+    for match in PLACEHOLDER.finditer(template):
+        yield template[pos:match.start()]
+        pos = match.end()
+        key = match.group(1)
+        if key not in data:
+            yield match.group(0)
+            continue
+        value = data[key]
+        if isinstance(value, (str, int, float)):
+            yield str(value)
+            continue
+        for i, line in enumerate(value):
+            yield "\n" + line if i else line
+    yield template[pos:]
+
+
+def generate_task_rows(graph: TaskGraph, tasks: Optional[Iterable[int]] = None) -> Iterator[str]:
+    """生成任务列表表格行（tasks 为任务下标，默认全部任务按配置顺序）"""
+    lock_time = get_current_time()
+    for index in range(len(graph)) if tasks is None else tasks:
+        task = graph.record(index)
+        text = graph.text(index)
+        deps = ", ".join(graph.dependency_labels(index) + external_labels(text, "（外部）")) or "-"
+        locked = index == graph.locked
+        status = "Locked" if locked else "Todo"
+        owner = "Agent A" if locked else "-"
+
+        yield (
+            f"| {task.label} | {text['title']} | {status} | "
+            f"{task.priority} | {task.estimated} | "
+            f"{deps} | {owner} | {lock_time if locked else '-'} |"
+        )
 
 
-def generate_task_rows(tasks: list) -> str:
-    """生成任务列表表格行"""
-    rows = []
-    for task in tasks:
-        task_id = format_task_id(task["id"])
-        deps = ", ".join([format_task_id(d) for d in task.get("dependencies", [])]) or "-"
-        status = "Locked" if task["id"] == 1 else "Todo"
-        owner = "Agent A" if task["id"] == 1 else "-"
-        lock_time = get_current_time() if task["id"] == 1 else "-"
+def external_labels(task: dict, suffix: str = "") -> list:
+    """分区任务集中跨分区的依赖（externalDependencies）"""
+    return [f"{format_task_id(d['id'])}{suffix}" for d in task.get("externalDependencies", [])]
 
-        row = (
-            f"| {task_id} | {task['title']} | {status} | "
-            f"{task['priority']} | {task['estimated']} | "
-            f"{deps} | {owner} | {lock_time} |"
-        )
-        rows.append(row)
-    return "\n".join(rows)
 
+def generate_dep_graph(view: DependencyView, tasks: Optional[Iterable[int]] = None) -> Iterator[str]:
+    """生成依赖关系图（默认已去掉传递蕴含的依赖边）"""
+    return iter_ascii(view, tasks)
 
-def generate_dep_graph(tasks: list) -> str:
-    """生成依赖关系图"""
-    lines = []
-    for task in tasks:
-        task_id = format_task_id(task["id"])
-        deps = [format_task_id(d) for d in task.get("dependencies", [])]
 
-        if not deps:
-            lines.append(f"{task_id} ({task['title']})")
-        else:
-            for dep in deps:
-                lines.append(f"{dep} └─→ {task_id} ({task['title']})")
-    return "\n".join(lines)
-
-
-def generate_parallel_groups(tasks: list) -> str:
-    """生成分组信息"""
-    processed = set()
-    groups = []
-    batch = 1
-
-    while len(processed) < len(tasks):
-        # 找出所有依赖都已完成且未处理的任务
-        ready_tasks = [
-            t for t in tasks
-            if t["id"] not in processed
-            and all(d in processed for d in t.get("dependencies", []))
-        ]
-
-        if not ready_tasks:
-            break
-
-        task_list = "\n  ".join([
-            f"- {format_task_id(t['id'])}: {t['title']} (依赖: {', '.join([format_task_id(d) for d in t.get('dependencies', [])]) or '无依赖'})"
-            for t in ready_tasks
-        ])
-
-        parallel_flag = "  ✅ 可并行执行" if len(ready_tasks) > 1 else ""
+def generate_parallel_groups(graph: TaskGraph, groups: Optional[Iterable] = None) -> Iterator[str]:
+    """生成分组信息（批次即任务图的层级；groups 为 (批次号, 任务下标) 序列，默认全部批次）"""
+    for n, (batch, members) in enumerate(enumerate(graph.batches(), 1) if groups is None else groups):
+        if n:
+            yield ""
         wait_text = "初始化" if batch == 1 else f"批次{batch - 1}"
+        yield f"### 批次 {batch}（等待 {wait_text} 完成）"
 
-        groups.append(
-            f"### 批次 {batch}（等待 {wait_text} 完成）\n"
-            f"{task_list}\n"
-            f"{parallel_flag}"
-        )
-
-        processed.update(t["id"] for t in ready_tasks)
-        batch += 1
+        for i, index in enumerate(members):
+            deps = ", ".join(graph.dependency_labels(index)) or "无依赖"
+            yield f"{'  ' if i else ''}- {graph.labels[index]}: {graph.text(index)['title']} (依赖: {deps})"
 
-    return "\n\n".join(groups)
+        yield "  ✅ 可并行执行" if len(members) > 1 else ""
 
 
 def generate_goals_table(goals: list) -> str:
@@ -142,55 +138,58 @@ def generate_goals_table(goals: list) -> str:
     return header + headers + separator + "\n".join(rows)
 
 
-def generate_execution_plan(tasks: list, agent_count: int = 3) -> str:
-    """生成执行计划"""
-    # 简化版执行计划
-    header = "\n## 执行计划（3 Agent 并行）\n\n"
-    lines = []
-
-    # 按批次生成
-    processed = set()
-    batch = 1
-
-    while len(processed) < len(tasks):
-        ready_tasks = [
-            t for t in tasks
-            if t["id"] not in processed
-            and all(d in processed for d in t.get("dependencies", []))
-        ]
-
-        if not ready_tasks:
-            break
-
-        # 分配给不同的 Agent
-        task_lines = []
-        for i, task in enumerate(ready_tasks):
-            agent = f"Agent {chr(65 + i % agent_count)}"
-            task_lines.append(
-                f"  - {agent}: {format_task_id(task['id'])} ({task['estimated']})"
-            )
+def generate_external_deps(config: dict) -> str:
+    """分区任务集的外部依赖表（非分区任务集为空）"""
+    partition = config.get("partition")
+    if not partition or not partition.get("external"):
+        return ""
 
-        lines.append(f"阶段 {batch}:")
-        lines.extend(task_lines)
-        lines.append("")
+    header = (
+        "\n## 外部依赖\n\n"
+        f"> 本任务集是 {partition['taskSetName']} 的第 {partition['number']}/{partition['count']} 个分区。"
+        "下列任务依赖其他分区的任务，领用前先确认依赖任务已在其所在分区完成。\n\n"
+    )
+    headers = "| 任务 | 依赖任务 | 所在分区 |\n"
+    separator = "|------|----------|----------|\n"
+    rows = [f"| {task} | {dep} | {owner} |" for task, dep, owner in partition["external"]]
+    return header + headers + separator + "\n".join(rows)
 
-        processed.update(t["id"] for t in ready_tasks)
-        batch += 1
 
-    return header + "\n".join(lines)
+def generate_execution_plan(graph: TaskGraph, agent_count: int = 3,
+                            groups: Optional[Iterable] = None) -> Iterator[str]:
+    """生成执行计划"""
+    # 简化版执行计划
+    yield "\n## 执行计划（3 Agent 并行）\n"
+
+    # 按批次分配给不同的 Agent
+    empty = True
+    for batch, members in enumerate(graph.batches(), 1) if groups is None else groups:
+        empty = False
+        yield f"阶段 {batch}:"
+        for i, index in enumerate(members):
+            agent = f"Agent {chr(65 + i % agent_count)}"
+            yield f"  - {agent}: {graph.labels[index]} ({graph.estimates[graph.estimate_codes[index]]})"
+        yield ""
+    if empty:
+        yield ""
 
 
-def generate_task_file(config: dict, task: dict, output_dir: Path):
-    """生成任务文件"""
-    template = read_template("task.md")
-    task_id = format_task_id(task["id"])
+def render_task_file(graph: TaskGraph, index: int, template: str) -> str:
+    """渲染任务文件内容"""
+    task = graph.text(index)
+    record = graph.record(index)
+    locked = index == graph.locked
 
     # 生成依赖列表
-    deps = task.get("dependencies", [])
-    if deps:
+    deps = graph.dependency_labels(index)
+    external = task.get("externalDependencies", [])
+    if deps or external:
         deps_list = "\n    ".join([
-            f"- [ ] {format_task_id(d)} (状态: Todo) - 必须先完成"
+            f"- [ ] {d} (状态: Todo) - 必须先完成"
             for d in deps
+        ] + [
+            f"- [ ] {format_task_id(d['id'])} (所在分区: {d['taskSetName']}) - 必须先完成（外部依赖）"
+            for d in external
         ])
     else:
         deps_list = "- 无依赖"
@@ -211,78 +210,186 @@ def generate_task_file(config: dict, task: dict, output_dir: Path):
     criteria_list = "\n- [ ] ".join([""] + acceptance)
 
     # 生成并行提示
+    deps = deps + external_labels(task)
     if deps:
-        parallel_hint = f"- 需等待 {', '.join([format_task_id(d) for d in deps])} 完成"
+        parallel_hint = f"- 需等待 {', '.join(deps)} 完成"
     else:
         parallel_hint = "- 无依赖，可立即开始"
 
     data = {
-        "TASK_ID": task_id,
+        "TASK_ID": record.label,
         "TASK_TITLE": task["title"],
-        "STATUS": "Locked" if task["id"] == 1 else "Todo",
-        "PRIORITY": task["priority"],
-        "ESTIMATED_TIME": task["estimated"],
+        "STATUS": "Locked" if locked else "Todo",
+        "PRIORITY": record.priority,
+        "ESTIMATED_TIME": record.estimated,
         "DESCRIPTION": task["description"],
         "DEPENDENCIES_LIST": deps_list,
         "ACCEPTANCE_CRITERIA": criteria_list,
         "IMPLEMENTATION_STEPS": steps_list,
         "PARALLEL_HINT": parallel_hint,
-        "LOCK_OWNER": "Agent A" if task["id"] == 1 else "-",
-        "LOCK_TIME": get_current_time() if task["id"] == 1 else "-",
-        "LOCK_TIMEOUT": parse_estimated_time(task["estimated"]) * 2,
+        "LOCK_OWNER": "Agent A" if locked else "-",
+        "LOCK_TIME": get_current_time() if locked else "-",
+        "LOCK_TIMEOUT": lock_timeout_minutes(record.hours),
     }
 
-    content = fill_template(template, data)
-    output_path = output_dir / f"{task_id}.md"
-    output_path.write_text(content, encoding="utf-8")
-    print(f"✓ 生成: {output_path}")
-
-
-def generate_index_file(config: dict, tasks: list, output_dir: Path):
-    """生成任务索引文件"""
-    template = read_template("index.md")
-
-    total_tasks = len(tasks)
-    completed = 0
-    in_progress = 0
-    todo = total_tasks - 1
-    locked = 1
+    return fill_template(template, data)
 
-    # 计算总预计时间
-    total_hours = sum(parse_estimated_time(t["estimated"]) for t in tasks)
 
-    data = {
+def generate_task_file(graph: TaskGraph, index: int, output_dir: Path, template: str) -> Path:
+    """生成任务文件"""
+    output_path = output_dir / f"{graph.labels[index]}.md"
+    output_path.write_text(render_task_file(graph, index, template), encoding="utf-8")
+    if len(graph) <= VERBOSE_LIMIT:
+        print(f"✓ 生成: {output_path}")
+    return output_path
+
+
+def index_overview(config: dict, graph: TaskGraph) -> dict:
+    """单文件索引和分片概要共用的统计字段"""
+    total_tasks = len(graph)
+    locked = 1 if graph.locked >= 0 else 0
+    return {
         "TOTAL_TASKS": total_tasks,
-        "COMPLETED": completed,
-        "IN_PROGRESS": in_progress,
-        "TODO": todo,
+        "COMPLETED": 0,
+        "IN_PROGRESS": 0,
+        "TODO": total_tasks - locked,
         "LOCKED": locked,
         "PROJECT_NAME": config.get("projectName", "未命名项目"),
         "CREATED_TIME": get_current_time(),
-        "TASK_ROWS": generate_task_rows(tasks),
-        "DEP_GRAPH": generate_dep_graph(tasks),
-        "PARALLEL_GROUPS": generate_parallel_groups(tasks),
         "PROGRESS_PERCENT": 0,
         "ELAPSED_TIME": 0,
-        "ESTIMATED_REMAINING": f"{total_hours}h",
+        "ESTIMATED_REMAINING": f"{graph.total_hours}h",
         "GOALS_TABLE": generate_goals_table(config.get("goals", [])),
-        "EXECUTION_PLAN": generate_execution_plan(tasks),
+        "EXTERNAL_DEPS": generate_external_deps(config),
     }
 
-    content = fill_template(template, data)
+
+def render_index(config: dict, graph: TaskGraph, view: Optional[DependencyView] = None) -> Iterator[str]:
+    """逐段产出任务索引内容"""
+    template = read_template("index.md")
+
+    data = {
+        **index_overview(config, graph),
+        "TASK_ROWS": generate_task_rows(graph),
+        "DEP_GRAPH": generate_dep_graph(view or DependencyView(graph)),
+        "PARALLEL_GROUPS": generate_parallel_groups(graph),
+        "EXECUTION_PLAN": generate_execution_plan(graph),
+    }
+    return fill_template_lines(template, data)
+
+
+def generate_index_file(config: dict, graph: TaskGraph, output_dir: Path,
+                        view: Optional[DependencyView] = None):
+    """生成任务索引文件（流式写出）"""
     output_path = output_dir / "任务索引.md"
-    output_path.write_text(content, encoding="utf-8")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.writelines(render_index(config, graph, view))
     print(f"✓ 生成: {output_path}")
 
 
-def generate_current_task(config: dict, tasks: list, output_dir: Path):
+def parse_shard_mode(value: str):
+    """"batch" 按批次分片；正整数 N 为每个分片的任务数"""
+    if value == "batch":
+        return value
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"分片方式应为 batch 或正整数: {value}")
+    return size
+
+
+def plan_shards(graph: TaskGraph, shard) -> Iterator[tuple]:
+    """切分索引，产出 (文件名, 标题, 任务下标, [(批次号, 任务下标), ...])"""
+    level = graph.level
+    if shard == "batch":
+        for batch, members in enumerate(graph.batches(), 1):
+            yield f"批次{batch:03d}", f"批次 {batch}", members, [(batch, members)]
+        blocked = [i for i in range(len(graph)) if level[i] < 0]
+        if blocked:
+            yield "未排期", "未排期任务（依赖无法满足）", blocked, []
+        return
+
+    for start in range(0, len(graph), shard):
+        tasks = range(start, min(len(graph), start + shard))
+        # 分片内按批次重新分组，批次内保持配置顺序
+        scheduled = sorted((i for i in tasks if level[i] >= 0), key=level.__getitem__)
+        groups = [(depth + 1, list(members))
+                  for depth, members in itertools.groupby(scheduled, key=level.__getitem__)]
+        number = start // shard + 1
+        yield f"分片{number:03d}", f"分片 {number}", tasks, groups
+
+
+def describe_range(first: str, last: str) -> str:
+    return first if first == last else f"{first} – {last}"
+
+
+def describe_tasks(graph: TaskGraph, tasks) -> str:
+    """分片表中的任务列：连续区间写成 A – B，否则列出（过多时写成 A … B）"""
+    if isinstance(tasks, range):
+        return describe_range(graph.labels[tasks[0]], graph.labels[tasks[-1]])
+    if len(tasks) <= 3:
+        return ", ".join(graph.labels[i] for i in tasks)
+    return f"{graph.labels[tasks[0]]} … {graph.labels[tasks[-1]]}"
+
+
+def generate_sharded_index(config: dict, graph: TaskGraph, output_dir: Path, shard,
+                           view: Optional[DependencyView] = None) -> int:
+    """生成分片索引：任务索引.md 只放概要和分片表，明细写到 任务索引/ 下的分片文件"""
+    view = view or DependencyView(graph)
+    shard_dir = output_dir / SHARD_DIR
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for stale in shard_dir.glob("*.md"):
+        stale.unlink()
+
+    template = read_template("index-shard.md")
+    project_name = config.get("projectName", "未命名项目")
+    shard_rows = []
+    for name, title, tasks, groups in plan_shards(graph, shard):
+        batches = describe_range(str(groups[0][0]), str(groups[-1][0])) if groups else "-"
+        data = {
+            "SHARD_TITLE": title,
+            "PROJECT_NAME": project_name,
+            "SHARD_TASKS": len(tasks),
+            "SHARD_BATCHES": batches,
+            "TASK_ROWS": generate_task_rows(graph, tasks),
+            "DEP_GRAPH": generate_dep_graph(view, tasks),
+            "PARALLEL_GROUPS": generate_parallel_groups(graph, groups),
+            "EXECUTION_PLAN": generate_execution_plan(graph, groups=groups),
+        }
+        with open(shard_dir / f"{name}.md", "w", encoding="utf-8") as f:
+            f.writelines(fill_template_lines(template, data))
+
+        hours = sum(graph.hours[i] for i in tasks)
+        shard_rows.append(
+            f"| [{name}]({SHARD_DIR}/{name}.md) | "
+            f"{describe_tasks(graph, tasks)} | "
+            f"{len(tasks)} | {batches} | {hours}h |"
+        )
+
+    critical = graph.critical_path()
+    data = {
+        **index_overview(config, graph),
+        "BATCH_COUNT": graph.batch_count,
+        "CRITICAL_PATH": f"{graph.makespan}h（{len(critical)} 个任务）",
+        "SHARD_MODE": "每个批次一个分片" if shard == "batch" else f"每 {shard} 个任务一个分片",
+        "SHARD_ROWS": shard_rows,
+    }
+    output_path = output_dir / "任务索引.md"
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.writelines(fill_template_lines(read_template("index-summary.md"), data))
+    print(f"✓ 生成: {output_path}")
+    print(f"✓ 生成: {len(shard_rows)} 个索引分片 → {shard_dir}")
+    return len(shard_rows)
+
+
+def generate_current_task(graph: TaskGraph, output_dir: Path):
     """生成当前任务文件"""
-    if not tasks:
+    if not len(graph):
         return
 
-    first_task = tasks[0]
-    task_id = format_task_id(first_task["id"])
-    task_path = output_dir / f"{task_id}.md"
+    task_path = output_dir / f"{graph.labels[0]}.md"
     task_content = task_path.read_text(encoding="utf-8")
 
     # 更新状态为 In Progress
@@ -293,60 +400,167 @@ def generate_current_task(config: dict, tasks: list, output_dir: Path):
     print(f"✓ 生成: {output_path}")
 
 
+def generate_task_set(config: dict, graph: TaskGraph, output_dir: Path, args) -> int:
+    """生成一个任务集（索引、依赖图、任务文件、当前任务）；返回索引分片数"""
+    completed_dir = output_dir / "completed"
+
+    # 创建目录（bundle 模式不需要 completed/）
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"✓ 创建目录: {output_dir}")
+    if not args.bundle:
+        completed_dir.mkdir(parents=True, exist_ok=True)
+        print(f"✓ 创建目录: {completed_dir}")
+
+    print(f"\n解析到 {len(graph)} 个任务\n")
+    if graph.blocked:
+        print(f"⚠ {graph.blocked} 个任务的依赖无法满足（循环依赖或引用了不存在的任务），不参与批次划分\n")
+
+    # 生成文件
+    with stage("dependency-view"):
+        view = DependencyView(graph, reduce=not args.keep_transitive, min_chain=args.collapse_chains)
+    if view.kept_edges < graph.edge_count:
+        print(f"✓ 依赖图归约: {graph.edge_count} → {view.kept_edges} 条依赖边\n")
+    for fmt in args.graph_export:
+        with stage(f"graph-export-{fmt}"):
+            print(f"✓ 生成: {write_graph(view, fmt, output_dir / EXPORT_FILES[fmt])}")
+    if args.gantt != "none":
+        with stage("gantt"):
+            gantt = Gantt(graph, args.gantt, args.gantt_agents, keep=view.keep)
+            print(f"✓ 生成: {write_gantt(gantt, output_dir / GANTT_FILE)}")
+    template = read_template("task.md")
+    if args.bundle:
+        bodies = (render_task_file(graph, index, template) for index in range(len(graph)))
+        with stage("bundle"):
+            path = write_bundle(output_dir / BUNDLE_FILE, config, graph, bodies,
+                                "".join(render_index(config, graph, view)))
+        print(f"✓ 生成: {path}（{len(graph)} 个任务）")
+        return 0
+
+    shard_count = 0
+    with stage("index"):
+        if args.index_shards:
+            shard_count = generate_sharded_index(config, graph, output_dir, args.index_shards, view)
+        else:
+            generate_index_file(config, graph, output_dir, view)
+    with stage("task-files"):
+        for index in range(len(graph)):
+            generate_task_file(graph, index, output_dir, template)
+    if len(graph) > VERBOSE_LIMIT:
+        print(f"✓ 生成: {len(graph)} 个任务文件")
+    generate_current_task(graph, output_dir)
+    return shard_count
+
+
+def generate_partitions(config: dict, graph: TaskGraph, output_base_dir: Path, args):
+    """把任务图切成 args.partitions 个分区（空分区不生成），每个分区生成一个独立的任务集"""
+    with stage("partition"):
+        part = partition_graph(graph, args.partitions, args.imbalance)
+        parts = compact_partitions(part)
+    if parts < args.partitions:
+        print(f"⚠ 只能切出 {parts} 个非空分区（--partitions {args.partitions}），按 {parts} 个分区生成")
+    output_base_dir.mkdir(parents=True, exist_ok=True)
+    overview_path = output_base_dir / f"{config.get('taskSetName', 'defaultTask')}-{OVERVIEW_FILE}"
+    overview_path.write_text("\n".join(partition_overview(config, graph, part, parts)) + "\n",
+                             encoding="utf-8")
+    paths = write_partition_configs(config, graph, part, parts, output_base_dir)
+    graph.close()
+
+    for path in paths:
+        print(f"\n── {path.parent.name} ──")
+        with stage("load"):
+            sub_config, sub_graph = TaskGraph.load(path)
+        with stage("task-set"):
+            generate_task_set(sub_config, sub_graph, path.parent, args)
+        sub_graph.close()
+
+    print(f"\n✓ 生成: {overview_path}")
+    print(f"✓ 任务图已切分为 {parts} 个任务集：")
+    for path in paths:
+        print(f"  {path.parent}/  （子配置: {path.name}）")
+
+
 def main():
     parser = argparse.ArgumentParser(description="生成任务管理模板")
     parser.add_argument("--config", "-c", required=True, help="任务配置文件路径（JSON 格式）")
     parser.add_argument("--output", "-o", default="task", help="输出目录（默认: task）")
+    parser.add_argument("--graph-export", type=parse_formats, default="mermaid,dot",
+                        help="额外导出的依赖图格式：mermaid、dot，逗号分隔，none 表示不导出（默认: mermaid,dot）")
+    parser.add_argument("--collapse-chains", type=int, default=0, metavar="N",
+                        help="依赖图中把至少 N 个任务的串行链折叠为一个节点（默认: 不折叠）")
+    parser.add_argument("--keep-transitive", action="store_true", help="依赖图保留被传递蕴含的依赖边")
+    parser.add_argument("--gantt", choices=GANTT_MODES + ("none",), default="agents",
+                        help=f"甘特图（{GANTT_FILE}）：agents 按 Agent 泳道，batch 按批次，none 不生成（默认: agents）")
+    parser.add_argument("--gantt-agents", type=int, default=3, help="甘特图的 Agent 泳道数（默认: 3）")
+    parser.add_argument("--index-shards", type=parse_shard_mode, metavar="batch|N",
+                        help="分片索引：batch 为每个批次一个分片，N 为每 N 个任务一个分片（默认: 单文件）")
+    parser.add_argument("--partitions", type=int, metavar="K",
+                        help="把任务图切分为 K 个工时均衡、跨分区依赖少的任务集（多机执行）")
+    parser.add_argument("--imbalance", type=float, default=0.05, help="分区允许的工时偏差比例（默认: 0.05）")
+    parser.add_argument("--bundle", action="store_true",
+                        help=f"把任务集写成单个 SQLite 数据库（{BUNDLE_FILE}），不生成逐个任务的 Markdown 文件")
 
     args = parser.parse_args()
-
-    # 读取配置文件
+    if args.bundle and args.index_shards:
+        parser.error("--bundle 与 --index-shards 不能同时使用（bundle 的任务索引按需用 bundle.py render --index 渲染）")
+    if args.partitions is not None and args.partitions < 1:
+        parser.error("分区数至少为 1")
+    if args.gantt_agents < 1:
+        parser.error("甘特图的 Agent 数至少为 1")
+
+    # 读取配置文件：任务逐个解析进紧凑任务图，文本字段按需再读
     config_path = Path(args.config)
     if not config_path.exists():
         print(f"✗ 配置文件不存在: {config_path}")
         sys.exit(1)
 
     try:
-        config = json.loads(config_path.read_text(encoding="utf-8"))
+        with stage("load"):
+            config, graph = TaskGraph.load(config_path)
     except json.JSONDecodeError as e:
         print(f"✗ 配置文件格式错误: {e}")
         sys.exit(1)
 
+    # 获取任务列表
+    if not len(graph):
+        print("✗ 未找到任务列表")
+        sys.exit(1)
+
     # 获取参数
     task_set_name = config.get("taskSetName", "defaultTask")
     output_base_dir = Path(args.output)
     output_dir = output_base_dir / task_set_name
-    completed_dir = output_dir / "completed"
 
-    # 创建目录
-    output_dir.mkdir(parents=True, exist_ok=True)
-    completed_dir.mkdir(parents=True, exist_ok=True)
-    print(f"✓ 创建目录: {output_dir}")
-    print(f"✓ 创建目录: {completed_dir}")
-
-    # 获取任务列表
-    tasks = config.get("tasks", [])
-    if not tasks:
-        print("✗ 未找到任务列表")
-        sys.exit(1)
-
-    print(f"\n解析到 {len(tasks)} 个任务\n")
+    if args.partitions and args.partitions > 1:
+        generate_partitions(config, graph, output_base_dir, args)
+        return
 
-    # 生成文件
-    generate_index_file(config, tasks, output_dir)
-    for task in tasks:
-        generate_task_file(config, task, output_dir)
-    generate_current_task(config, tasks, output_dir)
+    with stage("task-set"):
+        shard_count = generate_task_set(config, graph, output_dir, args)
+    graph.close()
+    if args.bundle:
+        print("\n✓ 任务集数据库生成完成！")
+        print(f"  领用任务: python3 bundle.py claim {output_dir} --owner 'Agent A' --render")
+        print(f"  渲染索引: python3 bundle.py render {output_dir} --index")
+        return
 
     print("\n✓ 任务模板生成完成！")
     print(f"\n目录结构:")
     print(f"task/{task_set_name}/")
     print(f"├── 任务索引.md")
     print(f"├── 当前任务.md")
-    for task in tasks:
-        print(f"├── {format_task_id(task['id'])}.md")
+    for fmt in args.graph_export:
+        print(f"├── {EXPORT_FILES[fmt]}")
+    if args.gantt != "none":
+        print(f"├── {GANTT_FILE}")
+    if shard_count:
+        print(f"├── {SHARD_DIR}/            # {shard_count} 个索引分片")
+    for label in graph.labels[:VERBOSE_LIMIT]:
+        print(f"├── {label}.md")
+    if len(graph) > VERBOSE_LIMIT:
+        print(f"├── … 共 {len(graph)} 个任务文件")
     print(f"└── completed/")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with tracing("ralph-loop-gen/generate"):
+        main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 依赖关系图导出
+
+- 传递归约：按拓扑序用位集（Python 大整数）累积祖先集合，去掉已被其他路径蕴含的依赖边；
+  位集按拓扑位置分块计算，内存上限固定
+- 可选把长串行链（每一环都只有一进一出）折叠成一个节点
+- 输出 ASCII（任务索引.md 中的依赖关系图）、Mermaid 和 Graphviz DOT
+"""
+
+import argparse
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+from task_graph import TaskGraph, tracing
+
+# 祖先位集的总位数上限（按块计算时每块宽度 = 上限 / 已排期任务数）
+REACH_BUDGET_BITS = 1 << 30
+
+FORMATS = ("ascii", "mermaid", "dot")
+EXPORT_FILES = {"mermaid": "依赖关系图.mmd", "dot": "依赖关系图.dot"}
+
+
+def transitive_reduction(graph: TaskGraph, budget_bits: int = REACH_BUDGET_BITS) -> bytearray:
+    """返回与 graph.dep_targets 一一对应的保留标记（1 = 保留，0 = 被传递蕴含或重复）
+
+    只对已排期（无环、依赖都存在）的任务做归约，其余依赖边原样保留。
+    """
+    keep = bytearray(b"\x01") * graph.edge_count
+    offsets, targets, order = graph.dep_offsets, graph.dep_targets, graph.order
+
+    # 同一依赖写了多次时只保留第一条
+    for task in range(len(graph)):
+        lo, hi = offsets[task], offsets[task + 1]
+        if hi - lo > 1:
+            seen = set()
+            for edge in range(lo, hi):
+                if targets[edge] in seen:
+                    keep[edge] = 0
+                seen.add(targets[edge])
+
+    total = len(order)
+    if not total:
+        return keep
+    position = array("i", [-1]) * len(graph)
+    for pos, task in enumerate(order):
+        position[task] = pos
+
+    width = max(64, min(total, budget_bits // total))
+    ancestors = [0] * total
+    for start in range(0, total, width):
+        end = min(total, start + width)
+        # 上一块留下的位集：拓扑位置在本块之前的任务不可能有本块内的祖先
+        for pos in range(max(0, start - width), start):
+            ancestors[pos] = 0
+
+        for pos in range(start, total):
+            task = order[pos]
+            lo, hi = offsets[task], offsets[task + 1]
+            if lo == hi:
+                continue
+            inherited = 0
+            direct = 0
+            for edge in range(lo, hi):
+                dep = position[targets[edge]]
+                inherited |= ancestors[dep]
+                if start <= dep < end:
+                    direct |= 1 << (dep - start)
+            # 直接依赖若已是另一依赖的祖先，这条边就是多余的
+            if inherited & direct:
+                for edge in range(lo, hi):
+                    dep = position[targets[edge]]
+                    if start <= dep < end and inherited >> (dep - start) & 1:
+                        keep[edge] = 0
+            ancestors[pos] = inherited | direct
+    return keep
+
+
+class DependencyView:
+    """用于展示的依赖图：可选传递归约、可选折叠串行链
+
+    节点以链首任务下标标识；外部（不存在的）依赖沿用 TaskGraph 的负数编号。
+    """
+
+    __slots__ = ("graph", "keep", "head", "chains", "kept_edges")
+
+    def __init__(self, graph: TaskGraph, reduce: bool = True, min_chain: int = 0):
+        self.graph = graph
+        self.keep = transitive_reduction(graph) if reduce else bytearray(b"\x01") * graph.edge_count
+        self.kept_edges = self.keep.count(1)
+        self.head = array("i", range(len(graph)))
+        self.chains = {}
+        if min_chain > 1:
+            self._collapse_chains(min_chain)
+
+    def _collapse_chains(self, min_chain: int):
+        """每一环都恰好一出一入的最长路径折叠为一个节点（chains: 链首 -> (链尾, 长度)）"""
+        graph, keep, head = self.graph, self.keep, self.head
+        n = len(graph)
+        offsets, targets = graph.dep_offsets, graph.dep_targets
+        in_degree = array("i", bytes(4 * n))
+        out_degree = array("i", bytes(4 * n))
+        single = array("i", [-1]) * n
+        for task in range(n):
+            for edge in range(offsets[task], offsets[task + 1]):
+                if keep[edge]:
+                    in_degree[task] += 1
+                    dep = targets[edge]
+                    single[task] = dep
+                    if dep >= 0:
+                        out_degree[dep] += 1
+
+        length = {}
+        tail = {}
+        for task in graph.order:
+            dep = single[task]
+            if in_degree[task] == 1 and dep >= 0 and out_degree[dep] == 1:
+                head[task] = head[dep]
+            first = head[task]
+            length[first] = length.get(first, 0) + 1
+            tail[first] = task
+
+        for task in graph.order:
+            first = head[task]
+            if length[first] < min_chain:
+                head[task] = task
+            elif first == task:
+                self.chains[task] = (tail[task], length[task])
+
+    @property
+    def node_count(self) -> int:
+        return len(self.graph) - sum(size - 1 for _, size in self.chains.values())
+
+    def node_text(self, node: int) -> Tuple[str, str]:
+        """节点的（标签, 标题）"""
+        graph = self.graph
+        if node < 0:
+            return graph.externals[-1 - node], "不存在的任务"
+        if node in self.chains:
+            last, size = self.chains[node]
+            link = " ─→ " if size == 2 else " ─→ … ─→ "
+            return f"{graph.labels[node]}{link}{graph.labels[last]}", f"{size} 个串行任务"
+        return graph.labels[node], graph.text(node)["title"]
+
+    def nodes(self) -> Iterator[int]:
+        """按配置顺序产出节点（折叠链只在链首出现一次）"""
+        for task in range(len(self.graph)):
+            if self.head[task] == task:
+                yield task
+
+    def dependencies(self, node: int) -> Iterator[int]:
+        """节点保留下来的依赖（依赖在某条折叠链中时映射为该链）"""
+        graph = self.graph
+        for edge in range(graph.dep_offsets[node], graph.dep_offsets[node + 1]):
+            if self.keep[edge]:
+                dep = graph.dep_targets[edge]
+                yield self.head[dep] if dep >= 0 else dep
+
+    def externals(self) -> Iterator[int]:
+        return (-1 - k for k in range(len(self.graph.externals)))
+
+
+def iter_ascii(view: DependencyView, tasks: Optional[Iterable[int]] = None) -> Iterator[str]:
+    """任务索引.md 中的依赖关系图：无依赖的节点单独一行，其余每条依赖一行
+
+    tasks 限定只输出这些任务（折叠链内的非链首任务自动略过）。
+    """
+    nodes = view.nodes() if tasks is None else (t for t in tasks if view.head[t] == t)
+    for node in nodes:
+        label, title = view.node_text(node)
+        deps = list(view.dependencies(node))
+        if not deps:
+            yield f"{label} ({title})"
+        for dep in deps:
+            yield f"{view.node_text(dep)[0]} └─→ {label} ({title})"
+
+
+def _node_key(node: int) -> str:
+    return f"t{node}" if node >= 0 else f"x{-1 - node}"
+
+
+def _mermaid_text(text: str) -> str:
+    return text.replace('"', "#quot;")
+
+
+def iter_mermaid(view: DependencyView) -> Iterator[str]:
+    yield "flowchart TD"
+    for node in view.nodes():
+        label, title = view.node_text(node)
+        yield f'  {_node_key(node)}["{_mermaid_text(label)}<br/>{_mermaid_text(title)}"]'
+    for node in view.externals():
+        label, title = view.node_text(node)
+        yield f'  {_node_key(node)}["{_mermaid_text(label)}<br/>{title}"]:::missing'
+    for node in view.nodes():
+        for dep in view.dependencies(node):
+            yield f"  {_node_key(dep)} --> {_node_key(node)}"
+    if view.graph.externals:
+        yield "  classDef missing stroke-dasharray: 4 4"
+
+
+def _dot_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def iter_dot(view: DependencyView) -> Iterator[str]:
+    yield "digraph tasks {"
+    yield "  rankdir=LR;"
+    yield '  node [shape=box, fontname="sans-serif"];'
+    for node in view.nodes():
+        label, title = view.node_text(node)
+        style = ", style=rounded" if node in view.chains else ""
+        yield f'  {_node_key(node)} [label="{_dot_text(label)}\\n{_dot_text(title)}"{style}];'
+    for node in view.externals():
+        label, title = view.node_text(node)
+        yield f'  {_node_key(node)} [label="{_dot_text(label)}\\n{title}", style=dashed];'
+    for node in view.nodes():
+        for dep in view.dependencies(node):
+            yield f"  {_node_key(dep)} -> {_node_key(node)};"
+    yield "}"
+
+
+RENDERERS = {"ascii": iter_ascii, "mermaid": iter_mermaid, "dot": iter_dot}
+
+
+def write_graph(view: DependencyView, fmt: str, output_path: Path) -> Path:
+    with open(output_path, "w", encoding="utf-8") as f:
+        for line in RENDERERS[fmt](view):
+            f.write(line)
+            f.write("\n")
+    return output_path
+
+
+def parse_formats(value: str) -> list:
+    """"mermaid,dot" -> ["mermaid", "dot"]；"none" -> []"""
+    formats = [v.strip() for v in value.split(",") if v.strip() and v.strip() != "none"]
+    unknown = [f for f in formats if f not in EXPORT_FILES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"未知的导出格式: {', '.join(unknown)}（可选: {', '.join(EXPORT_FILES)}, none）")
+    return formats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导出任务依赖关系图（传递归约 + 可选折叠串行链）")
+    parser.add_argument("config", help="任务配置文件路径（JSON 格式）")
+    parser.add_argument("--format", "-f", choices=FORMATS, default="ascii", help="输出格式（默认: ascii）")
+    parser.add_argument("--output", "-o", help="输出文件（默认: 标准输出）")
+    parser.add_argument("--collapse-chains", type=int, default=0, metavar="N",
+                        help="把至少 N 个任务的串行链折叠为一个节点（默认: 不折叠）")
+    parser.add_argument("--keep-transitive", action="store_true", help="保留被传递蕴含的依赖边")
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    _, graph = TaskGraph.load(args.config)
+    loaded = time.perf_counter()
+    view = DependencyView(graph, reduce=not args.keep_transitive, min_chain=args.collapse_chains)
+    reduced = time.perf_counter()
+
+    if args.output:
+        write_graph(view, args.format, Path(args.output))
+    else:
+        for line in RENDERERS[args.format](view):
+            sys.stdout.write(line + "\n")
+    graph.close()
+
+    print(f"任务: {len(graph)}  依赖边: {graph.edge_count} → {view.kept_edges}  节点: {view.node_count}"
+          f"  折叠链: {len(view.chains)}", file=sys.stderr)
+    print(f"加载: {loaded - started:.2f}s  归约: {reduced - loaded:.2f}s"
+          f"  输出: {time.perf_counter() - reduced:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/graph_export"):
+        main()
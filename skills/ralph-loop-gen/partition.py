@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 任务集分区
+
+把任务图切成 K 个子任务集，分给多台机器上的 Agent 各自执行：
+
+- 各分区的预计工时尽量均衡（默认允许 5% 偏差）
+- 跨分区的依赖边尽量少：先按贪心区域生长划出初始分区（优先吸收与当前分区连边最多的任务），
+  再做若干轮边界细化（任务移到连边更多的分区，且不破坏均衡）
+- 每个分区写出一份子配置：分区内的依赖留在 dependencies，跨分区的依赖移到 externalDependencies，
+  由 generate.py 生成独立的任务集
+
+用法:
+    python3 partition.py tasks.json -k 4                # 只看分区统计
+    python3 generate.py --config tasks.json --partitions 4
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from task_graph import TaskGraph, tracing
+
+PARTITION_CONFIG = "任务配置.json"
+OVERVIEW_FILE = "分区总览.md"
+REFINE_PASSES = 8
+
+
+def partition_name(task_set_name: str, number: int) -> str:
+    """第 number 个分区（从 1 开始）的任务集名"""
+    return f"{task_set_name}-分区{number:02d}"
+
+
+def _neighbors(graph: TaskGraph, task: int) -> Iterator[int]:
+    """无向意义下的相邻任务（依赖 + 后继，不含不存在的任务）"""
+    offsets, targets = graph.dep_offsets, graph.dep_targets
+    for edge in range(offsets[task], offsets[task + 1]):
+        if targets[edge] >= 0:
+            yield targets[edge]
+    offsets, targets = graph.succ_offsets, graph.succ_targets
+    for edge in range(offsets[task], offsets[task + 1]):
+        yield targets[edge]
+
+
+def partition_graph(graph: TaskGraph, parts: int, imbalance: float = 0.05,
+                    passes: int = REFINE_PASSES) -> array:
+    """返回每个任务所属的分区编号（0 ~ parts-1）"""
+    n = len(graph)
+    part = array("i", [-1]) * n
+    if parts <= 1 or n == 0:
+        return array("i", bytes(4 * n))
+
+    hours = graph.hours
+    # 区域生长的种子按拓扑序选取，无法排期的任务排在最后
+    seeds = list(graph.order)
+    if len(seeds) < n:
+        scheduled = set(seeds)
+        seeds.extend(t for t in range(n) if t not in scheduled)
+    rank = array("i", bytes(4 * n))
+    for pos, task in enumerate(seeds):
+        rank[task] = pos
+
+    weights = [0] * parts
+    remaining = sum(hours)
+    cursor = 0
+    for p in range(parts - 1):
+        goal = remaining / (parts - p)
+        connections: Dict[int, int] = {}
+        heap: List[Tuple[int, int, int]] = []
+        while weights[p] < goal:
+            task = -1
+            while heap:
+                negative, _, candidate = heapq.heappop(heap)
+                if part[candidate] < 0 and connections.get(candidate) == -negative:
+                    task = candidate
+                    break
+            if task < 0:
+                # 当前区域已无相邻的未分配任务：从拓扑序中下一个未分配的任务重新开始
+                while cursor < n and part[seeds[cursor]] >= 0:
+                    cursor += 1
+                if cursor == n:
+                    break
+                task = seeds[cursor]
+            part[task] = p
+            weights[p] += hours[task]
+            for neighbor in _neighbors(graph, task):
+                if part[neighbor] < 0:
+                    count = connections.get(neighbor, 0) + 1
+                    connections[neighbor] = count
+                    heapq.heappush(heap, (-count, rank[neighbor], neighbor))
+        remaining -= weights[p]
+
+    last = parts - 1
+    for task in range(n):
+        if part[task] < 0:
+            part[task] = last
+            weights[last] += hours[task]
+
+    _refine(graph, part, weights, imbalance, passes)
+    return part
+
+
+def compact_partitions(part: array) -> int:
+    """去掉空分区：分区编号按原顺序重新编为 0 ~ k-1，返回非空分区数 k（任务数少于分区数时会出现空分区）"""
+    mapping = {p: i for i, p in enumerate(sorted(set(part)))}
+    if any(p != i for p, i in mapping.items()):
+        for task, p in enumerate(part):
+            part[task] = mapping[p]
+    return len(mapping)
+
+
+def _refine(graph: TaskGraph, part: array, weights: List[int], imbalance: float, passes: int):
+    """边界细化：把任务移到连边更多的分区；超重的分区允许以最小代价移出任务"""
+    hours = graph.hours
+    target = sum(weights) / len(weights)
+    heaviest = max(hours, default=0)
+    upper = max(target * (1 + imbalance), target + heaviest / 2)
+    lower = target * (1 - imbalance)
+
+    active = range(len(graph))
+    for _ in range(passes):
+        touched = set()
+        for task in active:
+            own = part[task]
+            counts: Dict[int, int] = {}
+            for neighbor in _neighbors(graph, task):
+                q = part[neighbor]
+                counts[q] = counts.get(q, 0) + 1
+            overweight = weights[own] > upper
+            if not overweight and all(q == own for q in counts):
+                continue
+
+            h = hours[task]
+            if weights[own] - h < lower and not overweight:
+                continue
+            internal = counts.get(own, 0)
+            best, best_gain = -1, 0
+            for q, count in counts.items():
+                if q == own or weights[q] + h > upper:
+                    continue
+                gain = count - internal
+                if (best < 0 and (gain > 0 or overweight)) or (best >= 0 and (
+                        gain > best_gain or (gain == best_gain and weights[q] < weights[best]))):
+                    best, best_gain = q, gain
+            if best < 0:
+                continue
+
+            part[task] = best
+            weights[own] -= h
+            weights[best] += h
+            touched.add(task)
+            touched.update(_neighbors(graph, task))
+        if not touched:
+            break
+        active = sorted(touched)
+
+
+def cut_edges(graph: TaskGraph, part: array) -> int:
+    """跨分区的依赖边数"""
+    offsets, targets = graph.dep_offsets, graph.dep_targets
+    return sum(1 for task in range(len(graph))
+               for edge in range(offsets[task], offsets[task + 1])
+               if targets[edge] >= 0 and part[targets[edge]] != part[task])
+
+
+def partition_members(part: array, parts: int) -> List[List[int]]:
+    members = [[] for _ in range(parts)]
+    for task, p in enumerate(part):
+        members[p].append(task)
+    return members
+
+
+def build_partition_config(config: dict, graph: TaskGraph, part: array, members: List[int],
+                           number: int, parts: int) -> dict:
+    """第 number 个分区的子配置；跨分区依赖写进任务的 externalDependencies 和顶层 partition.external"""
+    task_set_name = config.get("taskSetName", "defaultTask")
+    own = number - 1
+    tasks = []
+    external = []
+    for index in members:
+        task = dict(graph.text(index))
+        inside, outside = [], []
+        for raw, target in zip(task.get("dependencies", []), graph.dependencies(index)):
+            if target < 0 or part[target] == own:
+                inside.append(raw)
+            else:
+                owner = partition_name(task_set_name, part[target] + 1)
+                outside.append({"id": raw, "taskSetName": owner})
+                external.append([graph.labels[index], graph.labels[target], owner])
+        task["dependencies"] = inside
+        if outside:
+            task["externalDependencies"] = outside
+        else:
+            task.pop("externalDependencies", None)
+        tasks.append(task)
+
+    sub_config = {key: value for key, value in config.items() if key != "tasks"}
+    sub_config["taskSetName"] = partition_name(task_set_name, number)
+    sub_config["partition"] = {
+        "taskSetName": task_set_name,
+        "number": number,
+        "count": parts,
+        "hours": sum(graph.hours[i] for i in members),
+        "external": external,
+    }
+    sub_config["tasks"] = tasks
+    return sub_config
+
+
+def write_partition_configs(config: dict, graph: TaskGraph, part: array, parts: int,
+                            output_base: Path) -> List[Path]:
+    """写出各分区的子配置：{输出目录}/{分区任务集名}/任务配置.json"""
+    paths = []
+    for number, members in enumerate(partition_members(part, parts), 1):
+        sub_config = build_partition_config(config, graph, part, members, number, parts)
+        directory = output_base / sub_config["taskSetName"]
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / PARTITION_CONFIG
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(sub_config, f, ensure_ascii=False, indent=2)
+        paths.append(path)
+    return paths
+
+
+def partition_overview(config: dict, graph: TaskGraph, part: array, parts: int) -> List[str]:
+    """分区总览（Markdown 行）：每个分区的任务数、工时、跨分区依赖"""
+    task_set_name = config.get("taskSetName", "defaultTask")
+    members = partition_members(part, parts)
+    incoming = [[0] * parts for _ in range(parts)]
+    offsets, targets = graph.dep_offsets, graph.dep_targets
+    for task in range(len(graph)):
+        for edge in range(offsets[task], offsets[task + 1]):
+            dep = targets[edge]
+            if dep >= 0 and part[dep] != part[task]:
+                incoming[part[task]][part[dep]] += 1
+
+    lines = [
+        f"# 分区总览: {config.get('projectName', '未命名项目')}",
+        "",
+        f"**任务总数**: {len(graph)}",
+        f"**总工时**: {graph.total_hours}h",
+        f"**分区数**: {parts}",
+        f"**跨分区依赖**: {cut_edges(graph, part)} / {graph.edge_count}",
+        "",
+        "| 分区 | 任务数 | 预计工时 | 依赖的分区（依赖边数） |",
+        "|------|--------|----------|------------------------|",
+    ]
+    for p in range(parts):
+        name = partition_name(task_set_name, p + 1)
+        hours = sum(graph.hours[i] for i in members[p])
+        sources = ", ".join(f"分区{q + 1:02d}（{count}）" for q, count in enumerate(incoming[p]) if count) or "-"
+        lines.append(f"| [{name}]({name}/任务索引.md) | {len(members[p])} | {hours}h | {sources} |")
+    lines.append("")
+    lines.append("每个分区是独立的任务集；领用有外部依赖的任务前，先确认依赖所在分区中该任务已完成"
+                 "（任务文件在该分区的 `completed/` 下）。")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="把任务图切分为 K 个工时均衡、跨分区依赖少的子任务集")
+    parser.add_argument("config", help="任务配置文件路径（JSON 格式）")
+    parser.add_argument("--parts", "-k", type=int, required=True, help="分区数")
+    parser.add_argument("--imbalance", type=float, default=0.05, help="允许的工时偏差比例（默认: 0.05）")
+    parser.add_argument("--write", metavar="DIR", help="把各分区的子配置写到 DIR/{分区任务集名}/任务配置.json")
+
+    args = parser.parse_args()
+    if args.parts < 1:
+        parser.error("分区数至少为 1")
+
+    try:
+        config, graph = TaskGraph.load(args.config)
+    except json.JSONDecodeError as e:
+        print(f"✗ 配置文件格式错误: {e}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    part = partition_graph(graph, args.parts, args.imbalance)
+    parts = compact_partitions(part)
+    elapsed = time.perf_counter() - started
+    if parts < args.parts:
+        print(f"⚠ 只能切出 {parts} 个非空分区（-k {args.parts}），按 {parts} 个分区输出")
+
+    for line in partition_overview(config, graph, part, parts)[2:-2]:
+        print(line)
+    print(f"\n分区用时: {elapsed:.2f}s")
+    if args.write:
+        for path in write_partition_configs(config, graph, part, parts, Path(args.write)):
+            print(f"✓ 生成: {path}")
+    graph.close()
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/partition"):
+        main()
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 本地并行任务执行器
+
+按任务依赖图真正执行任务：依赖全部完成的任务立即交给有界的进程池运行。
+
+- 每个任务执行一条 shell 命令：任务配置中的 "command" 字段，或 --command 模板
+  （模板变量 {{TASK_ID}} {{TASK_TITLE}} {{TASK_FILE}} {{ATTEMPT}}，替换值已做 shell 转义；
+  同样的信息也通过环境变量 RALPH_TASK_ID 等传给命令）
+- 就绪任务按松弛时间排序，关键路径上的任务优先
+- 失败/超时可重试；超时默认取任务的 LOCK_TIMEOUT（预计时间 × 2 分钟）
+- 每次尝试追加写入 runner/state.jsonl，中断后再次运行会跳过已完成的任务
+- 运行中同步更新任务文件状态（完成的移入 completed/）和任务索引中的进度
+- 结束时报告实际并行度与关键路径（按实测耗时）的对比
+
+用法:
+    python3 runner.py --config tasks.json --command 'make -C build {{TASK_ID}}' --jobs 4
+"""
+
+import argparse
+import heapq
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Optional
+
+from status import IndexWriter, format_seconds, now_text, update_task_file
+from task_graph import TaskGraph, lock_timeout_minutes, tracing
+
+PENDING, READY, RUNNING, DONE, FAILED, SKIPPED = range(6)
+STATUS_NAMES = {PENDING: "Todo", READY: "Todo", RUNNING: "In Progress", DONE: "Done",
+                FAILED: "Blocked", SKIPPED: "Blocked"}
+
+RUNNER_DIR = "runner"
+KILL_GRACE = 5
+
+
+class ProcessTable:
+    """正在运行的子进程（中断时统一终止）"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.processes = {}
+
+    def add(self, key, process):
+        with self.lock:
+            self.processes[key] = process
+
+    def remove(self, key):
+        with self.lock:
+            self.processes.pop(key, None)
+
+    def terminate_all(self):
+        with self.lock:
+            processes = list(self.processes.values())
+        for process in processes:
+            _kill(process, signal.SIGTERM)
+
+
+def _kill(process, sig):
+    """命令以 shell 运行且处于独立的进程组，整组终止"""
+    try:
+        os.killpg(process.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_command(command: str, cwd: Path, env: dict, timeout: Optional[float], log_path: Path,
+                table: ProcessTable, key) -> tuple:
+    """运行一条命令，返回 (退出码, 是否超时, 开始时间, 结束时间)"""
+    started = time.time()
+    with open(log_path, "ab") as log:
+        log.write(f"$ {command}\n".encode("utf-8"))
+        log.flush()
+        process = subprocess.Popen(command, shell=True, cwd=cwd, env=env, stdout=log,
+                                   stderr=subprocess.STDOUT, start_new_session=True)
+        table.add(key, process)
+        timed_out = False
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            _kill(process, signal.SIGTERM)
+            try:
+                process.wait(timeout=KILL_GRACE)
+            except subprocess.TimeoutExpired:
+                _kill(process, signal.SIGKILL)
+                process.wait()
+        finally:
+            table.remove(key)
+    return process.returncode, timed_out, started, time.time()
+
+
+class TaskRunner:
+    """按依赖图调度任务执行"""
+
+    def __init__(self, graph: TaskGraph, output_dir: Path, command: Optional[str], jobs: int,
+                 retries: int = 0, timeout: Optional[float] = None, fail_fast: bool = False,
+                 cwd: Optional[Path] = None, progress_interval: float = 2.0, restart: bool = False):
+        self.graph = graph
+        self.output_dir = output_dir
+        self.command = command
+        self.jobs = max(1, jobs)
+        self.retries = retries
+        self.timeout = timeout
+        self.fail_fast = fail_fast
+        self.cwd = cwd or Path.cwd()
+        self.progress_interval = progress_interval
+
+        n = len(graph)
+        self.state = array("b", [PENDING]) * n
+        self.attempts = array("i", bytes(4 * n))
+        self.duration = array("d", bytes(8 * n))
+        self.pending = array("q", (graph.dep_offsets[i + 1] - graph.dep_offsets[i] for i in range(n)))
+        self.ready = []
+        self.changed = {}
+        self.previous_wall = 0.0  # 此前各次运行的墙钟时间之和（恢复时）
+        self.previous_busy = 0.0  # 恢复的已完成任务的执行时间之和
+        self.stopping = False
+        self.table = ProcessTable()
+
+        self.runner_dir = output_dir / RUNNER_DIR
+        self.log_dir = self.runner_dir / "logs"
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.runner_dir / "state.jsonl"
+        if restart and self.state_path.exists():
+            self.state_path.unlink()
+        self.index = IndexWriter(output_dir)
+
+    # ---------- 状态 ----------
+
+    def _load_state(self) -> int:
+        """重放 state.jsonl：已完成的任务不再执行；返回恢复的任务数"""
+        if not self.state_path.exists():
+            return 0
+        index_of = {label: i for i, label in enumerate(self.graph.labels)}
+        finished = {}
+        with open(self.state_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 上次中断时写了一半的行
+                if record.get("event") == "run":
+                    self.previous_wall += record["end"] - record["start"]
+                elif record.get("task") in index_of:
+                    finished[index_of[record["task"]]] = record
+
+        restored = 0
+        for index, record in finished.items():
+            # 失败的任务在新一轮执行中重新计算重试次数
+            if record["status"] == "done":
+                self.state[index] = DONE
+                self.duration[index] = record["end"] - record["start"]
+                self.previous_busy += self.duration[index]
+                restored += 1
+        return restored
+
+    def _append_state(self, record: dict):
+        with open(self.state_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    # ---------- 调度 ----------
+
+    def _release(self, index: int):
+        """任务完成：后继的未完成依赖数减一，归零即就绪"""
+        for succ in self.graph.successors(index):
+            self.pending[succ] -= 1
+            if not self.pending[succ] and self.state[succ] == PENDING:
+                self._enqueue(succ)
+
+    def _enqueue(self, index: int):
+        self.state[index] = READY
+        heapq.heappush(self.ready, (self.graph.slack[index], index))
+
+    def _skip_descendants(self, index: int):
+        stack = [index]
+        while stack:
+            for succ in self.graph.successors(stack.pop()):
+                if self.state[succ] in (PENDING, READY):
+                    self.state[succ] = SKIPPED
+                    self.changed[self.graph.labels[succ]] = STATUS_NAMES[SKIPPED]
+                    stack.append(succ)
+
+    def _task_command(self, index: int, attempt: int) -> tuple:
+        label = self.graph.labels[index]
+        task = self.graph.text(index)
+        task_file = self.output_dir / f"{label}.md"
+        values = {"TASK_ID": label, "TASK_TITLE": task.get("title", ""),
+                  "TASK_FILE": str(task_file), "ATTEMPT": str(attempt)}
+
+        command = task.get("command") or self.command
+        for key, value in values.items():
+            command = command.replace(f"{{{{{key}}}}}", shlex.quote(value))
+        env = dict(os.environ, **{f"RALPH_{key}": value for key, value in values.items()})
+        return command, env
+
+    def _task_timeout(self, index: int) -> Optional[float]:
+        if self.timeout is not None:
+            return self.timeout or None
+        return lock_timeout_minutes(self.graph.hours[index]) * 60
+
+    def _start(self, pool, running: dict, index: int):
+        attempt = self.attempts[index] + 1
+        self.attempts[index] = attempt
+        self.state[index] = RUNNING
+        label = self.graph.labels[index]
+        self.changed[label] = STATUS_NAMES[RUNNING]
+
+        command, env = self._task_command(index, attempt)
+        update_task_file(self.output_dir, label, "In Progress", start=now_text(time.time()))
+        future = pool.submit(run_command, command, self.cwd, env, self._task_timeout(index),
+                             self.log_dir / f"{label}.log", self.table, index)
+        running[future] = (index, attempt)
+
+    def _finish(self, index: int, attempt: int, result: tuple) -> bool:
+        """记录一次尝试的结果；返回任务是否最终失败"""
+        returncode, timed_out, started, finished = result
+        label = self.graph.labels[index]
+        ok = returncode == 0 and not timed_out
+        status = "done" if ok else "timeout" if timed_out else "failed"
+        self._append_state({"task": label, "status": status, "attempt": attempt, "returncode": returncode,
+                            "start": round(started, 3), "end": round(finished, 3)})
+        self.busy += finished - started
+
+        if ok:
+            self.state[index] = DONE
+            self.duration[index] = finished - started
+            self.changed[label] = STATUS_NAMES[DONE]
+            update_task_file(self.output_dir, label, "Done", end=now_text(finished),
+                             duration=format_seconds(finished - started))
+            self._release(index)
+            return False
+
+        reason = "超时" if timed_out else f"退出码 {returncode}"
+        print(f"✗ {label} 第 {attempt} 次尝试失败（{reason}），日志: {self.log_dir / f'{label}.log'}")
+        if attempt <= self.retries and not self.stopping:
+            self._enqueue(index)
+            self.changed[label] = STATUS_NAMES[READY]
+            update_task_file(self.output_dir, label, "Todo", note=f"runner: 第 {attempt} 次尝试失败（{reason}），重试")
+            return False
+
+        self.state[index] = FAILED
+        self.changed[label] = STATUS_NAMES[FAILED]
+        update_task_file(self.output_dir, label, "Blocked", note=f"runner: 第 {attempt} 次尝试失败（{reason}）")
+        self._skip_descendants(index)
+        return True
+
+    def _interrupted(self, index: int, attempt: int, result: tuple):
+        """被中断的任务退回待执行，下次运行时重新执行"""
+        returncode, _, started, finished = result
+        label = self.graph.labels[index]
+        self._append_state({"task": label, "status": "interrupted", "attempt": attempt, "returncode": returncode,
+                            "start": round(started, 3), "end": round(finished, 3)})
+        self.busy += finished - started
+        self.state[index] = READY
+        self.changed[label] = STATUS_NAMES[READY]
+        update_task_file(self.output_dir, label, "Todo", note="runner: 执行被中断")
+
+    # ---------- 进度 ----------
+
+    def counts(self) -> Dict[int, int]:
+        counts = dict.fromkeys(range(6), 0)
+        for state in self.state:
+            counts[state] += 1
+        return counts
+
+    def _write_progress(self):
+        counts = self.counts()
+        total = len(self.graph)
+        remaining_hours = sum(h for h, s in zip(self.graph.hours, self.state) if s != DONE)
+        elapsed = self.previous_wall + time.time() - self.started
+        self.index.update({
+            "COMPLETED": counts[DONE],
+            "IN_PROGRESS": counts[RUNNING],
+            "TODO": total - counts[DONE] - counts[RUNNING],
+            "LOCKED": 0,
+            "PROGRESS_PERCENT": counts[DONE] * 100 // total if total else 0,
+            "ELAPSED_TIME": round(elapsed / 3600, 2),
+            "ESTIMATED_REMAINING": f"{remaining_hours}h",
+        }, self.changed)
+        self.changed = {}
+        self.last_progress = time.time()
+
+    # ---------- 主循环 ----------
+
+    def run(self) -> dict:
+        self.started = time.time()
+        self.busy = 0.0
+        self.last_progress = 0.0
+        peak = 0
+        restored = self._load_state()
+        if restored:
+            print(f"✓ 从 {self.state_path} 恢复: {restored} 个任务已完成")
+
+        for index in range(len(self.graph)):
+            if self.state[index] == DONE:
+                self._release(index)
+        for index in range(len(self.graph)):
+            if self.state[index] == PENDING and not self.pending[index]:
+                self._enqueue(index)
+
+        running = {}
+        interrupted = False
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            try:
+                while self.ready or running:
+                    while self.ready and len(running) < self.jobs and not self.stopping:
+                        _, index = heapq.heappop(self.ready)
+                        if self.state[index] == READY:
+                            self._start(pool, running, index)
+                    peak = max(peak, len(running))
+                    if not running:
+                        break
+
+                    finished, _ = wait(running, timeout=self.progress_interval, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        index, attempt = running.pop(future)
+                        if self._finish(index, attempt, future.result()) and self.fail_fast:
+                            self.stopping = True
+                            print("✗ --fail-fast: 不再启动新任务，等待运行中的任务结束")
+                    if time.time() - self.last_progress >= self.progress_interval:
+                        self._write_progress()
+            except KeyboardInterrupt:
+                interrupted = True
+                self.stopping = True
+                print("\n✗ 已中断，正在终止运行中的任务…")
+                self.table.terminate_all()
+                for future in list(running):
+                    index, attempt = running.pop(future)
+                    self._interrupted(index, attempt, future.result())
+
+        finished_at = time.time()
+        self._append_state({"event": "run", "start": round(self.started, 3), "end": round(finished_at, 3)})
+        self._write_progress()
+        report = self.report(finished_at - self.started, peak)
+        report["interrupted"] = interrupted
+        with open(self.runner_dir / "report.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+    def critical_path_seconds(self) -> float:
+        """按实测耗时计算的关键路径长度（未完成的任务耗时记为 0）"""
+        finish = array("d", bytes(8 * len(self.graph)))
+        longest = 0.0
+        for index in self.graph.order:
+            start = max((finish[d] for d in self.graph.dependencies(index)), default=0.0)
+            finish[index] = start + self.duration[index]
+            longest = max(longest, finish[index])
+        return longest
+
+    def report(self, wall: float, peak: int) -> dict:
+        """wall 为本次运行的耗时；恢复运行时耗时和执行时间都加上此前的运行，与含恢复任务的关键路径口径一致"""
+        run_wall = wall
+        wall = self.previous_wall + run_wall
+        busy = self.previous_busy + self.busy
+        counts = self.counts()
+        critical = self.critical_path_seconds()
+        total_work = sum(self.duration)
+        return {
+            "tasks": len(self.graph),
+            "done": counts[DONE],
+            "failed": counts[FAILED],
+            "skipped": counts[SKIPPED],
+            "not_run": counts[PENDING] + counts[READY],
+            "jobs": self.jobs,
+            "peak_concurrency": peak,
+            "wall_seconds": round(wall, 3),
+            "run_wall_seconds": round(run_wall, 3),
+            "resumed_wall_seconds": round(self.previous_wall, 3),
+            "busy_seconds": round(busy, 3),
+            "achieved_parallelism": round(busy / wall, 2) if wall else None,
+            "critical_path_seconds": round(critical, 3),
+            "max_parallelism": round(total_work / critical, 2) if critical else None,
+            "critical_path_efficiency": round(critical / wall, 3) if wall and critical else None,
+            "planned_critical_path_hours": self.graph.makespan,
+            "planned_total_hours": self.graph.total_hours,
+        }
+
+
+def print_report(report: dict, report_path: Path):
+    print("\n执行报告:")
+    print(f"  任务: {report['tasks']}  完成: {report['done']}  失败: {report['failed']}"
+          f"  跳过: {report['skipped']}  未执行: {report['not_run']}")
+    print(f"  实际耗时: {format_seconds(report['wall_seconds'])}"
+          f"  累计执行: {format_seconds(report['busy_seconds'])}"
+          f"  峰值并发: {report['peak_concurrency']}/{report['jobs']}")
+    if report["resumed_wall_seconds"]:
+        print(f"  其中本次运行: {format_seconds(report['run_wall_seconds'])}"
+              f"  此前运行: {format_seconds(report['resumed_wall_seconds'])}")
+    if report["achieved_parallelism"] is not None:
+        print(f"  实际并行度: {report['achieved_parallelism']}")
+    if report["critical_path_seconds"]:
+        print(f"  关键路径（实测）: {format_seconds(report['critical_path_seconds'])}"
+              f"  理论最大并行度: {report['max_parallelism']}"
+              f"  实际耗时 / 关键路径: {report['wall_seconds'] / report['critical_path_seconds']:.2f}")
+    print(f"  计划: 关键路径 {report['planned_critical_path_hours']}h / 总工时 {report['planned_total_hours']}h")
+    print(f"  报告: {report_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按依赖图并行执行任务")
+    parser.add_argument("--config", "-c", required=True, help="任务配置文件路径（JSON 格式）")
+    parser.add_argument("--output", "-o", default="task", help="任务输出目录（默认: task，与 generate.py 一致）")
+    parser.add_argument("--command", help="每个任务执行的命令模板（任务配置中的 command 字段优先）")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="最大并发任务数（默认: CPU 数）")
+    parser.add_argument("--retries", type=int, default=0, help="失败或超时后的重试次数（默认: 0）")
+    parser.add_argument("--timeout", type=float,
+                        help="单个任务超时秒数，0 表示不限（默认: 任务的 LOCK_TIMEOUT，即预计时间 × 2 分钟）")
+    parser.add_argument("--fail-fast", action="store_true", help="任一任务最终失败后不再启动新任务")
+    parser.add_argument("--cwd", help="命令的工作目录（默认: 当前目录）")
+    parser.add_argument("--progress-interval", type=float, default=2.0, help="刷新任务索引进度的间隔秒数（默认: 2）")
+    parser.add_argument("--restart", action="store_true", help="忽略上次的执行状态，全部重新执行")
+
+    args = parser.parse_args()
+
+    config_path = Path(args.config)
+    if not config_path.exists():
+        print(f"✗ 配置文件不存在: {config_path}")
+        sys.exit(1)
+    try:
+        config, graph = TaskGraph.load(config_path)
+    except json.JSONDecodeError as e:
+        print(f"✗ 配置文件格式错误: {e}")
+        sys.exit(1)
+    if not len(graph):
+        print("✗ 未找到任务列表")
+        sys.exit(1)
+
+    missing = [graph.labels[i] for i in range(len(graph)) if not args.command and not graph.text(i).get("command")]
+    if missing:
+        print(f"✗ {len(missing)} 个任务没有命令（如 {missing[0]}），请使用 --command 或在配置中设置 command 字段")
+        sys.exit(1)
+
+    output_dir = Path(args.output) / config.get("taskSetName", "defaultTask")
+    if graph.blocked:
+        print(f"⚠ {graph.blocked} 个任务的依赖无法满足，不会执行")
+
+    runner = TaskRunner(graph, output_dir, args.command, args.jobs, retries=args.retries,
+                        timeout=args.timeout, fail_fast=args.fail_fast,
+                        cwd=Path(args.cwd) if args.cwd else None,
+                        progress_interval=args.progress_interval, restart=args.restart)
+    print(f"▶ 执行 {len(graph)} 个任务（并发 {runner.jobs}），日志: {runner.log_dir}")
+    report = runner.run()
+    graph.close()
+    print_report(report, runner.runner_dir / "report.json")
+
+    if report["interrupted"]:
+        sys.exit(130)
+    if report["failed"] or report["skipped"] or report["not_run"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/runner"):
+        main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 任务状态读写
+
+- 就地更新任务文件的状态行和完成记录，完成的任务移入 completed/
+- 就地更新任务索引（单文件或分片）中的统计、进度概览和任务行状态
+- 汇总任务目录的实时进度：按 mtime/size 缓存每个任务文件的解析结果，
+  只重新解析变化过的文件（包括刚移入 completed/ 的文件）
+
+用法:
+    python3 status.py task/my-project            # 刷新任务索引中的统计和进度
+    python3 status.py task/my-project --watch 5  # 每 5 秒刷新一次
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from task_graph import parse_estimated_time, tracing
+
+SHARD_DIR = "任务索引"
+STATUSES = ("Todo", "Locked", "In Progress", "Blocked", "Done")
+
+STATUS_LINE = re.compile(r"^\*\*状态\*\*: .*$", re.M)
+_RECORD_LINE = {
+    "start": re.compile(r"^- 开始时间: .*$", re.M),
+    "end": re.compile(r"^- 完成时间: .*$", re.M),
+    "duration": re.compile(r"^- 耗时: .*$", re.M),
+}
+_LOCK_LINE = {
+    "owner": re.compile(r"^\*\*占用者\*\*: .*$", re.M),
+    "lock_time": re.compile(r"^\*\*锁定时间\*\*: .*$", re.M),
+}
+_RECORD_LABEL = {"start": "开始时间", "end": "完成时间", "duration": "耗时", "owner": "占用者", "lock_time": "锁定时间"}
+_TASK_FIELDS = {
+    "status": re.compile(r"^\*\*状态\*\*: (.*)$", re.M),
+    "estimated": re.compile(r"^\*\*预计时间\*\*: (.*)$", re.M),
+    "locked": re.compile(r"^\*\*锁定时间\*\*: (.*)$", re.M),
+    "start": re.compile(r"^- 开始时间: (.*)$", re.M),
+    "end": re.compile(r"^- 完成时间: (.*)$", re.M),
+}
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+CACHE_FILE = ".status-cache.json"
+CACHE_VERSION = 1
+
+# 索引中的统计/进度字段：模板变量 -> (行前缀, 行后缀)
+INDEX_FIELDS = {
+    "COMPLETED": ("**已完成**: ", ""),
+    "IN_PROGRESS": ("**进行中**: ", ""),
+    "TODO": ("**待开始**: ", ""),
+    "LOCKED": ("**已锁定**: ", ""),
+    "PROGRESS_PERCENT": ("- 总体进度: ", "%"),
+    "ELAPSED_TIME": ("- 已用时间: ", " 小时"),
+    "ESTIMATED_REMAINING": ("- 预计剩余时间: ", ""),
+}
+_INDEX_PATTERNS = {
+    key: re.compile(rf"^{re.escape(prefix)}.*$", re.M) for key, (prefix, _) in INDEX_FIELDS.items()
+}
+
+
+def find_task_file(output_dir: Path, label: str) -> Optional[Path]:
+    """任务文件可能还在任务集目录，也可能已移入 completed/"""
+    for path in (output_dir / f"{label}.md", output_dir / "completed" / f"{label}.md"):
+        if path.exists():
+            return path
+    return None
+
+
+def patch_task_text(content: str, status: str, note: Optional[str] = None, **records: str) -> str:
+    """替换任务文件的状态行和完成记录（records: start/end/duration/owner/lock_time），追加备注"""
+    content = STATUS_LINE.sub(f"**状态**: {status}", content, count=1)
+    for key, value in records.items():
+        if key in _LOCK_LINE:
+            content = _LOCK_LINE[key].sub(lambda _: f"**{_RECORD_LABEL[key]}**: {value}", content, count=1)
+        else:
+            content = _RECORD_LINE[key].sub(lambda _: f"- {_RECORD_LABEL[key]}: {value}", content, count=1)
+    if note:
+        content = content.replace("## 备注\n\n", f"## 备注\n\n- {note}\n", 1)
+    return content
+
+
+def update_task_file(output_dir: Path, label: str, status: str, note: Optional[str] = None,
+                     **records: str) -> Optional[Path]:
+    """更新任务文件的状态（及开始/完成时间、耗时、备注）；Done 的任务移入 completed/"""
+    path = find_task_file(output_dir, label)
+    if path is None:
+        return None
+
+    content = patch_task_text(path.read_text(encoding="utf-8"), status, note, **records)
+    target = output_dir / "completed" / path.name if status == "Done" else output_dir / path.name
+    target.write_text(content, encoding="utf-8")
+    if target != path:
+        path.unlink()
+    return target
+
+
+def patch_index_text(content: str, fields: Dict[str, object], statuses: Dict[str, str]) -> str:
+    """替换统计/进度行，以及任务表中对应任务行的状态列"""
+    for key, value in fields.items():
+        prefix, suffix = INDEX_FIELDS[key]
+        content = _INDEX_PATTERNS[key].sub(lambda _: f"{prefix}{value}{suffix}", content, count=1)
+    if not statuses:
+        return content
+
+    lines = content.split("\n")
+    for i, line in enumerate(lines):
+        if not line.startswith("| 任务"):
+            continue
+        cells = line.split(" | ", 3)
+        label = cells[0][2:]
+        if label in statuses and len(cells) == 4:
+            cells[2] = statuses[label]
+            lines[i] = " | ".join(cells)
+    return "\n".join(lines)
+
+
+class IndexWriter:
+    """把进度写回任务索引；分片索引时任务行在 任务索引/ 下的分片文件里"""
+
+    def __init__(self, output_dir: Path):
+        self.index_path = output_dir / "任务索引.md"
+        self.shard_dir = output_dir / SHARD_DIR
+        self.shard_of = None
+
+    def _shard_map(self) -> Dict[str, Path]:
+        """任务 -> 所在分片（首次用到时扫描一遍分片文件）"""
+        if self.shard_of is None:
+            self.shard_of = {}
+            for shard in sorted(self.shard_dir.glob("*.md")) if self.shard_dir.is_dir() else ():
+                with open(shard, encoding="utf-8") as f:
+                    for line in f:
+                        if line.startswith("| 任务"):
+                            self.shard_of[line[2:line.index(" |", 2)]] = shard
+        return self.shard_of
+
+    def update(self, fields: Dict[str, object], statuses: Optional[Dict[str, str]] = None):
+        statuses = statuses or {}
+        if not self.index_path.exists():
+            return
+        shards = {}
+        if statuses and self.shard_dir.is_dir():
+            shard_of = self._shard_map()
+            for label, status in statuses.items():
+                if label in shard_of:
+                    shards.setdefault(shard_of[label], {})[label] = status
+
+        content = self.index_path.read_text(encoding="utf-8")
+        write_if_changed(self.index_path, content, patch_index_text(content, fields, statuses))
+        for shard, changed in shards.items():
+            content = shard.read_text(encoding="utf-8")
+            write_if_changed(shard, content, patch_index_text(content, {}, changed))
+
+
+def write_if_changed(path: Path, before: str, after: str):
+    """内容有变化时才原子写回"""
+    if after != before:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(after, encoding="utf-8")
+        tmp.replace(path)
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """解析 TIME_FORMAT 时间为时间戳，未填写返回 None"""
+    try:
+        return datetime.strptime(value.strip(), TIME_FORMAT).timestamp()
+    except (AttributeError, ValueError):
+        return None  # 未填写（如 "_______" 或 "-"）
+
+
+def now_text(timestamp: float) -> str:
+    """时间戳格式化为 TIME_FORMAT"""
+    return datetime.fromtimestamp(timestamp).strftime(TIME_FORMAT)
+
+
+def format_seconds(seconds: float) -> str:
+    """耗时格式化为 s / min / h"""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}min"
+    return f"{seconds / 3600:.2f}h"
+
+
+def parse_task_file(path: Path, completed: bool) -> list:
+    """解析一个任务文件：[状态, 预计小时数, 开始时间戳, 完成时间戳]"""
+    content = path.read_text(encoding="utf-8")
+    fields = {}
+    for key, pattern in _TASK_FIELDS.items():
+        match = pattern.search(content)
+        fields[key] = match.group(1).strip() if match else None
+
+    status = "Done" if completed else (fields["status"] or "Todo")
+    start = parse_time(fields["start"]) or parse_time(fields["locked"])
+    return [status, parse_estimated_time(fields["estimated"] or ""), start, parse_time(fields["end"])]
+
+
+def is_task_file(name: str) -> bool:
+    """是否为任务文件（任务*.md，不含任务索引.md）"""
+    return name.startswith("任务") and name.endswith(".md") and name != "任务索引.md"
+
+
+class StatusAggregator:
+    """任务目录的进度汇总
+
+    缓存（.status-cache.json）记录每个任务文件的 mtime、大小和解析结果；
+    每次刷新只 stat 一遍目录，mtime 或大小变了（或路径变了，例如移入 completed/）才重新解析。
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.cache_path = self.output_dir / CACHE_FILE
+        self.entries = self._load_cache()
+        self.parsed = 0
+
+    def _load_cache(self) -> dict:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return cache.get("files", {}) if cache.get("version") == CACHE_VERSION else {}
+
+    def _save_cache(self):
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": self.entries}, f, ensure_ascii=False, separators=(",", ":"))
+        tmp.replace(self.cache_path)
+
+    def scan(self) -> Dict[str, str]:
+        """刷新缓存，返回状态有变化的任务 {任务ID: 状态}"""
+        before = {entry[2]: entry[3] for entry in self.entries.values()}
+        entries = {}
+        self.parsed = 0
+        for folder, completed in ((self.output_dir, False), (self.output_dir / "completed", True)):
+            try:
+                iterator = os.scandir(folder)
+            except FileNotFoundError:
+                continue
+            with iterator:
+                for item in iterator:
+                    if not is_task_file(item.name) or not item.is_file():
+                        continue
+                    key = item.name if not completed else f"completed/{item.name}"
+                    stat = item.stat()
+                    cached = self.entries.get(key)
+                    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                        entries[key] = cached
+                        continue
+                    entries[key] = [stat.st_mtime_ns, stat.st_size, item.name[:-3],
+                                    *parse_task_file(Path(item.path), completed)]
+                    self.parsed += 1
+
+        changed_files = entries != self.entries
+        self.entries = entries
+        if changed_files:
+            self._save_cache()
+
+        statuses = self.statuses()
+        return {label: status for label, status in statuses.items() if before.get(label) != status}
+
+    def statuses(self) -> Dict[str, str]:
+        """任务ID -> 状态（同一任务同时出现在 completed/ 中时以 completed/ 为准）"""
+        result = {}
+        for key, entry in self.entries.items():
+            if key.startswith("completed/") or entry[2] not in result:
+                result[entry[2]] = entry[3]
+        return result
+
+    def summary(self, now: Optional[float] = None) -> dict:
+        """索引中的统计/进度字段"""
+        tasks = {}
+        for key, entry in self.entries.items():
+            if key.startswith("completed/") or entry[2] not in tasks:
+                tasks[entry[2]] = entry
+
+        counts = dict.fromkeys(STATUSES, 0)
+        remaining_hours = 0
+        starts, ends = [], []
+        for _, _, _, status, hours, start, end in tasks.values():
+            counts[status] = counts.get(status, 0) + 1
+            if status != "Done":
+                remaining_hours += hours
+            if start:
+                starts.append(start)
+            if end:
+                ends.append(end)
+
+        total = len(tasks)
+        done = counts["Done"]
+        if starts:
+            finish = max(ends) if done == total and ends else (now or time.time())
+            elapsed = max(0.0, finish - min(starts)) / 3600
+        else:
+            elapsed = 0
+        return {
+            "TOTAL_TASKS": total,
+            "COMPLETED": done,
+            "IN_PROGRESS": counts["In Progress"],
+            "TODO": total - done - counts["In Progress"] - counts["Locked"],
+            "LOCKED": counts["Locked"],
+            "PROGRESS_PERCENT": done * 100 // total if total else 0,
+            "ELAPSED_TIME": round(elapsed, 2),
+            "ESTIMATED_REMAINING": f"{remaining_hours}h",
+        }
+
+
+def refresh_index(output_dir: Path, aggregator: Optional[StatusAggregator] = None) -> dict:
+    """汇总任务目录并把统计、进度和变化的任务行写回任务索引；返回统计字段"""
+    aggregator = aggregator or StatusAggregator(output_dir)
+    changed = aggregator.scan()
+    fields = aggregator.summary()
+    IndexWriter(Path(output_dir)).update({k: v for k, v in fields.items() if k in INDEX_FIELDS}, changed)
+    return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description="汇总任务进度并刷新任务索引")
+    parser.add_argument("task_dir", help="任务集目录（如 task/my-project）")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="按间隔持续刷新")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出统计")
+
+    args = parser.parse_args()
+    output_dir = Path(args.task_dir)
+    if not (output_dir / "任务索引.md").exists():
+        print(f"✗ 未找到任务索引: {output_dir / '任务索引.md'}")
+        sys.exit(1)
+
+    aggregator = StatusAggregator(output_dir)
+    while True:
+        started = time.perf_counter()
+        fields = refresh_index(output_dir, aggregator)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if args.json:
+            print(json.dumps({**fields, "parsed_files": aggregator.parsed, "elapsed_ms": round(elapsed_ms, 2)},
+                             ensure_ascii=False))
+        else:
+            print(f"✓ {fields['COMPLETED']}/{fields['TOTAL_TASKS']} 已完成 ({fields['PROGRESS_PERCENT']}%)"
+                  f"  进行中 {fields['IN_PROGRESS']}  已锁定 {fields['LOCKED']}  待开始 {fields['TODO']}"
+                  f"  已用 {fields['ELAPSED_TIME']} 小时  剩余 {fields['ESTIMATED_REMAINING']}"
+                  f"  （重新解析 {aggregator.parsed} 个文件，{elapsed_ms:.1f} ms）")
+        if not args.watch:
+            break
+        try:
+            time.sleep(args.watch)
+        except KeyboardInterrupt:
+            break
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/status"):
+        main()
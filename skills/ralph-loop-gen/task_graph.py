@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 紧凑任务图
+
+百万级任务集的调度核心：
+- 任务 ID 在加载时驻留为连续整数下标，格式化后的 ID（任务001）只计算一次
+- 依赖/后继关系以 CSR 形式存放在 array 中（安装了 NumPy 时零拷贝地视为 ndarray）
+- 内存中只保留调度字段；标题、描述、步骤等文本按需从配置文件中再次读取
+- 批次（层级）、最早开始时间、最长路径和松弛时间按层整体计算
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 可选，没有时走纯 Python 路径
+    np = None
+
+try:
+    import resource
+except ImportError:  # Windows：没有 resource，峰值内存不可测
+    resource = None
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "skill-profiler" / "scripts"))
+try:
+    from skilltrace import stage, tracing
+except ImportError:
+    from contextlib import nullcontext as stage, nullcontext as tracing
+
+# 一层任务数达到该值时改用 NumPy 批量计算
+WIDE_LEVEL = 256
+# 流式读取配置文件的块大小（字节）
+READ_CHUNK = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"(\d+)")
+
+
+def format_task_id(task_id) -> str:
+    """格式化任务ID（配置中的 ID 可以是 "001" 也可以是 1）"""
+    return f"任务{str(task_id).zfill(3)}"
+
+
+def parse_estimated_time(estimated: str) -> int:
+    """解析预计时间，返回小时数"""
+    match = _NUMBER.search(str(estimated))
+    return int(match.group(1)) if match else 2
+
+
+def lock_timeout_minutes(hours: int) -> int:
+    """任务文件中的锁定超时（预计时间 × 2，单位与 task.md 模板一致：分钟）"""
+    return hours * 2
+
+
+class LabelTable:
+    """格式化后的任务 ID 表：全部 UTF-8 编码后拼在一块连续内存里，按偏移取出"""
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self):
+        self.blob = bytearray()
+        self.offsets = array("q", [0])
+
+    def append(self, label: str):
+        self.blob += label.encode("utf-8")
+        self.offsets.append(len(self.blob))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.blob[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class TaskRecord:
+    """单个任务的调度字段视图（由 TaskGraph 按需构造，不常驻内存）"""
+
+    __slots__ = ("index", "label", "priority", "estimated", "hours", "level", "earliest", "slack")
+
+    def __init__(self, index: int, label: str, priority: str, estimated: str,
+                 hours: int, level: int, earliest: int, slack: int):
+        self.index = index
+        self.label = label
+        self.priority = priority
+        self.estimated = estimated
+        self.hours = hours
+        self.level = level
+        self.earliest = earliest
+        self.slack = slack
+
+    @property
+    def scheduled(self) -> bool:
+        """依赖可满足（没有环、没有引用不存在的任务）"""
+        return self.level >= 0
+
+
+class _ListSource:
+    """文本字段来自已加载的任务字典列表"""
+
+    def __init__(self, tasks: list):
+        self.tasks = tasks
+
+    def get(self, index: int) -> dict:
+        return self.tasks[index]
+
+    def close(self):
+        pass
+
+
+class _FileSource:
+    """文本字段按字节区间从配置文件中重新解析"""
+
+    def __init__(self, path: Path, starts: array, ends: array):
+        self.path = path
+        self.starts = starts
+        self.ends = ends
+        self.handle = None
+
+    def get(self, index: int) -> dict:
+        if self.handle is None:
+            self.handle = open(self.path, "rb")
+        start = self.starts[index]
+        self.handle.seek(start)
+        return json.loads(self.handle.read(self.ends[index] - start))
+
+    def close(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+
+def _utf8(value):
+    """配置以 latin-1 读入（字符偏移 = 字节偏移），保留下来的字符串需还原为 UTF-8"""
+    if isinstance(value, str):
+        try:
+            return value.encode("latin-1").decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            return value
+    return value
+
+
+class _Builder:
+    """逐个接收任务，构建 CSR 依赖表；依赖可以引用后面才出现的任务"""
+
+    def __init__(self):
+        self.slots = {}                 # 原始 ID -> 槽位
+        self.slot_ids = []              # 槽位 -> 原始 ID
+        self.slot_task = array("i")     # 槽位 -> 任务下标（-1 表示尚未出现）
+        self.labels = LabelTable()
+        self.priorities = {}
+        self.estimates = {}
+        self.priority_codes = array("I")
+        self.estimate_codes = array("I")
+        self.hours = array("q")
+        self.dep_offsets = array("q", [0])
+        self.dep_slots = array("i")
+        self.locked = -1
+
+    def slot(self, raw_id) -> int:
+        slot = self.slots.get(raw_id)
+        if slot is None:
+            slot = self.slots[raw_id] = len(self.slot_ids)
+            self.slot_ids.append(raw_id)
+            self.slot_task.append(-1)
+        return slot
+
+    def add(self, raw_id, priority: str, estimated: str, dependencies: list):
+        index = len(self.labels)
+        slot = self.slot(raw_id)
+        if self.slot_task[slot] < 0:
+            self.slot_task[slot] = index
+        if raw_id == 1 and self.locked < 0:
+            self.locked = index
+
+        self.labels.append(format_task_id(raw_id))
+        self.priority_codes.append(self.priorities.setdefault(priority, len(self.priorities)))
+        self.estimate_codes.append(self.estimates.setdefault(estimated, len(self.estimates)))
+        self.hours.append(parse_estimated_time(estimated))
+        self.dep_slots.extend(self.slot(d) for d in dependencies)
+        self.dep_offsets.append(len(self.dep_slots))
+
+    def finish(self, source) -> "TaskGraph":
+        externals = []
+        external_of = {}
+        dep_targets = array("i", bytes(4 * len(self.dep_slots)))
+        for edge, slot in enumerate(self.dep_slots):
+            target = self.slot_task[slot]
+            if target < 0:
+                if slot not in external_of:
+                    external_of[slot] = len(externals)
+                    externals.append(format_task_id(self.slot_ids[slot]))
+                target = -1 - external_of[slot]
+            dep_targets[edge] = target
+
+        return TaskGraph(
+            labels=self.labels,
+            priorities=list(self.priorities),
+            estimates=list(self.estimates),
+            priority_codes=self.priority_codes,
+            estimate_codes=self.estimate_codes,
+            hours=self.hours,
+            dep_offsets=self.dep_offsets,
+            dep_targets=dep_targets,
+            externals=externals,
+            locked=self.locked,
+            source=source,
+        )
+
+
+class TaskGraph:
+    """按列存储的任务图；第 i 个任务即配置中的第 i 个任务"""
+
+    __slots__ = ("labels", "priorities", "estimates", "priority_codes", "estimate_codes", "hours",
+                 "dep_offsets", "dep_targets", "succ_offsets", "succ_targets", "externals", "locked",
+                 "level", "earliest", "slack", "order", "level_offsets", "makespan", "source")
+
+    def __init__(self, labels, priorities, estimates, priority_codes, estimate_codes, hours,
+                 dep_offsets, dep_targets, externals, locked, source):
+        self.labels = labels
+        self.priorities = priorities
+        self.estimates = estimates
+        self.priority_codes = priority_codes
+        self.estimate_codes = estimate_codes
+        self.hours = hours
+        self.dep_offsets = dep_offsets
+        self.dep_targets = dep_targets
+        self.externals = externals
+        self.locked = locked
+        self.source = source
+        with stage("successors"):
+            self._build_successors()
+        with stage("schedule"):
+            self._schedule()
+
+    # ---------- 构建 ----------
+
+    @classmethod
+    def from_tasks(cls, tasks: list) -> "TaskGraph":
+        """从已加载的任务字典列表构建"""
+        builder = _Builder()
+        for task in tasks:
+            builder.add(task["id"], task["priority"], task["estimated"], task.get("dependencies", []))
+        return builder.finish(_ListSource(tasks))
+
+    @classmethod
+    def load(cls, path) -> Tuple[dict, "TaskGraph"]:
+        """流式解析配置文件：返回（去掉 tasks 的配置, 任务图）
+
+        tasks 数组中的任务逐个解析，只保留调度字段和它在文件中的字节区间，
+        文本字段在 text() 时才重新读取。
+        """
+        path = Path(path)
+        builder = _Builder()
+        starts, ends = array("q"), array("q")
+
+        def on_task(task, start, end):
+            builder.add(_utf8(task["id"]), _utf8(task["priority"]), _utf8(task["estimated"]),
+                        [_utf8(d) for d in task.get("dependencies", [])])
+            starts.append(start)
+            ends.append(end)
+
+        with open(path, encoding="latin-1", newline="") as f, stage("parse"):
+            config = _scan_config(_JsonStream(f), on_task)
+        return config, builder.finish(_FileSource(path, starts, ends))
+
+    def _build_successors(self):
+        """由依赖表反推后继表（同样是 CSR）"""
+        n = len(self.labels)
+        counts = array("q", bytes(8 * (n + 1)))
+        for target in self.dep_targets:
+            if target >= 0:
+                counts[target + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+
+        cursor = array("q", counts)
+        self.succ_targets = array("i", bytes(4 * counts[n]))
+        offsets = self.dep_offsets
+        for task in range(n):
+            for edge in range(offsets[task], offsets[task + 1]):
+                target = self.dep_targets[edge]
+                if target >= 0:
+                    self.succ_targets[cursor[target]] = task
+                    cursor[target] += 1
+        self.succ_offsets = counts
+
+    # ---------- 调度计算 ----------
+
+    def _schedule(self):
+        """逐层（Kahn）计算批次、最早开始时间、总工期和松弛时间
+
+        某个依赖无法满足（环、引用不存在的任务）的任务 level 为 -1，不参与排期。
+        """
+        n = len(self.labels)
+        self.level = array("i", [-1]) * n
+        self.earliest = array("q", bytes(8 * n))
+        self.slack = array("q", [-1]) * n
+        self.order = array("i")
+        self.level_offsets = array("q", [0])
+
+        pending = array("q", (self.dep_offsets[i + 1] - self.dep_offsets[i] for i in range(n)))
+        frontier = [i for i in range(n) if not pending[i]]
+        depth = 0
+        while len(frontier):
+            if np is not None and len(frontier) >= WIDE_LEVEL:
+                frontier = self._forward_wide(np.asarray(frontier, dtype=np.int32), depth, pending)
+            else:
+                frontier = self._forward(list(map(int, frontier)), depth, pending)
+            self.level_offsets.append(len(self.order))
+            depth += 1
+
+        self.makespan = max((self.earliest[v] + self.hours[v] for v in self.order), default=0)
+        latest = array("q", [self.makespan]) * n
+        for level in range(depth - 1, -1, -1):
+            start, end = self.level_offsets[level], self.level_offsets[level + 1]
+            if np is not None and end - start >= WIDE_LEVEL:
+                self._backward_wide(start, end, latest)
+            else:
+                self._backward(start, end, latest)
+
+    def _forward(self, frontier, depth: int, pending: array) -> list:
+        level, earliest, hours = self.level, self.earliest, self.hours
+        offsets, targets = self.succ_offsets, self.succ_targets
+        ready = []
+        for task in frontier:
+            level[task] = depth
+            finish = earliest[task] + hours[task]
+            for edge in range(offsets[task], offsets[task + 1]):
+                succ = targets[edge]
+                if earliest[succ] < finish:
+                    earliest[succ] = finish
+                pending[succ] -= 1
+                if not pending[succ]:
+                    ready.append(succ)
+        self.order.extend(frontier)
+        ready.sort()
+        return ready
+
+    def _forward_wide(self, frontier, depth: int, pending: array):
+        level = np.frombuffer(self.level, dtype=np.int32)
+        earliest = np.frombuffer(self.earliest, dtype=np.int64)
+        hours = np.frombuffer(self.hours, dtype=np.int64)
+        remaining = np.frombuffer(pending, dtype=np.int64)
+
+        level[frontier] = depth
+        edges, counts = _gather(np.frombuffer(self.succ_offsets, dtype=np.int64), frontier)
+        self.order.frombytes(frontier.tobytes())
+        if not edges.size:
+            return []
+        succ = np.frombuffer(self.succ_targets, dtype=np.int32)[edges]
+        np.maximum.at(earliest, succ, np.repeat(earliest[frontier] + hours[frontier], counts))
+        np.subtract.at(remaining, succ, 1)
+        candidates = np.unique(succ)
+        return candidates[remaining[candidates] == 0]
+
+    def _backward(self, start: int, end: int, latest: array):
+        hours, earliest, slack = self.hours, self.earliest, self.slack
+        offsets, targets = self.dep_offsets, self.dep_targets
+        for i in range(start, end):
+            task = self.order[i]
+            begin = latest[task] - hours[task]
+            slack[task] = begin - earliest[task]
+            for edge in range(offsets[task], offsets[task + 1]):
+                dep = targets[edge]
+                if latest[dep] > begin:
+                    latest[dep] = begin
+
+    def _backward_wide(self, start: int, end: int, latest: array):
+        tasks = np.frombuffer(self.order, dtype=np.int32)[start:end]
+        hours = np.frombuffer(self.hours, dtype=np.int64)
+        latest_view = np.frombuffer(latest, dtype=np.int64)
+        begin = latest_view[tasks] - hours[tasks]
+        np.frombuffer(self.slack, dtype=np.int64)[tasks] = begin - np.frombuffer(self.earliest, dtype=np.int64)[tasks]
+
+        edges, counts = _gather(np.frombuffer(self.dep_offsets, dtype=np.int64), tasks)
+        if edges.size:
+            deps = np.frombuffer(self.dep_targets, dtype=np.int32)[edges]
+            # 已排期任务的依赖必然都是真实任务，无需过滤外部引用
+            np.minimum.at(latest_view, deps, np.repeat(begin, counts))
+
+    # ---------- 查询 ----------
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __iter__(self) -> Iterator[TaskRecord]:
+        for i in range(len(self.labels)):
+            yield self.record(i)
+
+    def record(self, index: int) -> TaskRecord:
+        return TaskRecord(
+            index,
+            self.labels[index],
+            self.priorities[self.priority_codes[index]],
+            self.estimates[self.estimate_codes[index]],
+            self.hours[index],
+            self.level[index],
+            self.earliest[index],
+            self.slack[index],
+        )
+
+    def text(self, index: int) -> dict:
+        """按需读取任务的完整字典（title、description、steps、acceptance 等）"""
+        return self.source.get(index)
+
+    def dependencies(self, index: int) -> array:
+        """依赖的任务下标；负数 -k-1 表示引用了不存在的任务 externals[k]"""
+        return self.dep_targets[self.dep_offsets[index]:self.dep_offsets[index + 1]]
+
+    def successors(self, index: int) -> array:
+        return self.succ_targets[self.succ_offsets[index]:self.succ_offsets[index + 1]]
+
+    def label_of(self, target: int) -> str:
+        return self.labels[target] if target >= 0 else self.externals[-1 - target]
+
+    def dependency_labels(self, index: int) -> List[str]:
+        return [self.label_of(t) for t in self.dependencies(index)]
+
+    @property
+    def batch_count(self) -> int:
+        return len(self.level_offsets) - 1
+
+    def batches(self) -> Iterator[array]:
+        """按批次产出任务下标（批次内保持配置顺序）"""
+        for level in range(self.batch_count):
+            yield self.order[self.level_offsets[level]:self.level_offsets[level + 1]]
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.dep_targets)
+
+    @property
+    def total_hours(self) -> int:
+        return sum(self.hours)
+
+    @property
+    def blocked(self) -> int:
+        """因环或缺失依赖而无法排期的任务数"""
+        return len(self) - len(self.order)
+
+    def dispatch_order(self) -> List[int]:
+        """领用顺序：最早开始时间优先，其次松弛时间小（关键路径）优先；依赖总排在前面（只含已排期任务）"""
+        earliest, level, slack = self.earliest, self.level, self.slack
+        return sorted(self.order, key=lambda t: (earliest[t], level[t], slack[t], t))
+
+    def critical_path(self) -> List[int]:
+        """一条最长路径（松弛为 0 的任务链），按执行顺序返回任务下标"""
+        if not self.order:
+            return []
+        task = max(self.order, key=lambda v: (self.earliest[v] + self.hours[v], -v))
+        path = [task]
+        while self.earliest[task]:
+            start = self.earliest[task]
+            task = next(d for d in self.dependencies(task)
+                        if self.earliest[d] + self.hours[d] == start and self.slack[d] == 0)
+            path.append(task)
+        path.reverse()
+        return path
+
+    def close(self):
+        self.source.close()
+
+
+def _gather(offsets, nodes):
+    """CSR 中一组节点的全部边下标，以及每个节点的边数"""
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64), counts
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.arange(total, dtype=np.int64) + shift, counts
+
+
+# ---------- 流式 JSON 扫描 ----------
+
+class _JsonStream:
+    """按块读取配置文件的游标；已消费的前缀随时丢弃，缓冲区大小与文件大小无关
+
+    文件以 latin-1 打开，字符偏移即字节偏移。
+    """
+
+    def __init__(self, handle, chunk_size: int = READ_CHUNK):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.base = 0
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        data = self.handle.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        if self.pos >= self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.base += self.pos
+            self.pos = 0
+        self.buffer += data
+        return True
+
+    def peek(self) -> str:
+        """跳过空白，返回下一个字符（文件结束时为空串）"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def decode(self):
+        """解析下一个完整的 JSON 值，返回 (值, 原始 JSON 文本, 起始字节偏移, 结束字节偏移)"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self.fill():
+                    raise
+                continue
+            # 数字等值可能恰好在块边界处被截断，读完下一块再确认
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            start = self.base + self.pos
+            text = self.buffer[self.pos:end]
+            self.pos = end
+            return value, text, start, self.base + end
+
+
+def _scan_config(stream: _JsonStream, on_task) -> dict:
+    """解析顶层配置对象；tasks 数组中的元素逐个交给 on_task(task, start, end)
+
+    顶层也可以直接是任务数组（如 examples/full-project.json）。
+    """
+    config = {}
+    if stream.peek() == "\xef":
+        stream.pos += 3 if stream.buffer.startswith("\xef\xbb\xbf") else 0
+    if stream.peek() == "[":
+        _scan_tasks(stream, on_task)
+    else:
+        stream.expect("{")
+        if stream.peek() == "}":
+            stream.pos += 1
+        else:
+            while True:
+                key, _, _, _ = stream.decode()
+                if not isinstance(key, str):
+                    raise json.JSONDecodeError("Expecting property name", stream.buffer, stream.pos)
+                key = _utf8(key)
+                stream.expect(":")
+                if key == "tasks" and stream.peek() == "[":
+                    _scan_tasks(stream, on_task)
+                else:
+                    _, text, _, _ = stream.decode()
+                    config[key] = json.loads(text.encode("latin-1"))
+                if stream.peek() != ",":
+                    break
+                stream.pos += 1
+            stream.expect("}")
+
+    if stream.peek():
+        raise json.JSONDecodeError("Extra data", stream.buffer, stream.pos)
+    return config
+
+
+def _scan_tasks(stream: _JsonStream, on_task):
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+        return
+    while True:
+        task, _, start, end = stream.decode()
+        if not isinstance(task, dict):
+            raise json.JSONDecodeError("Expecting task object", stream.buffer, stream.pos)
+        on_task(task, start, end)
+        if stream.peek() != ",":
+            break
+        stream.pos += 1
+    stream.expect("]")
+
+
+def write_synthetic_config(path: Path, count: int, width: int = 64, max_deps: int = 3, seed: int = 0):
+    """生成 count 个任务的合成配置（每个任务依赖前 width 个任务中的若干个），用于压测"""
+    rng = random.Random(seed)
+    priorities = ("High", "Medium", "Low")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"taskSetName": "synthetic", "projectName": "合成压测项目", "tasks": [\n')
+        for i in range(1, count + 1):
+            window = range(max(1, i - width), i)
+            deps = rng.sample(window, min(len(window), rng.randint(0, max_deps)))
+            task = {
+                "id": str(i).zfill(3),
+                "title": f"合成任务 {i}",
+                "priority": priorities[i % 3],
+                "estimated": f"{rng.randint(1, 8)}h",
+                "description": f"压测用任务 {i}",
+                "steps": ["实现", "自测"],
+                "acceptance": ["通过验收"],
+                "dependencies": [str(d).zfill(3) for d in sorted(deps)],
+            }
+            f.write(json.dumps(task, ensure_ascii=False))
+            f.write(",\n" if i < count else "\n")
+        f.write("]}\n")
+
+
+def peak_memory_mb() -> float:
+    """进程峰值常驻内存（MB）；没有 resource 模块的平台返回 0"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="任务图统计 / 压测")
+    parser.add_argument("config", nargs="?", help="任务配置文件路径（JSON 格式）")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="先生成 N 个任务的合成配置写到 config 路径")
+    parser.add_argument("--memory-budget", type=float, metavar="MB", help="峰值内存超出预算时以非零状态退出")
+
+    args = parser.parse_args()
+    if not args.config:
+        parser.error("需要配置文件路径")
+
+    path = Path(args.config)
+    if args.synthetic:
+        started = time.perf_counter()
+        write_synthetic_config(path, args.synthetic)
+        print(f"✓ 生成合成配置: {path} ({args.synthetic} 个任务, {time.perf_counter() - started:.1f}s)")
+
+    started = time.perf_counter()
+    config, graph = TaskGraph.load(path)
+    elapsed = time.perf_counter() - started
+    critical = graph.critical_path()
+
+    print(f"项目: {config.get('projectName', '未命名项目')}")
+    print(f"任务: {len(graph)}  依赖: {graph.edge_count}  批次: {graph.batch_count}  无法排期: {graph.blocked}")
+    print(f"总工时: {graph.total_hours}h  关键路径: {graph.makespan}h ({len(critical)} 个任务)")
+    if critical:
+        shown = " → ".join(graph.labels[i] for i in critical[:8])
+        print(f"关键路径: {shown}{' → …' if len(critical) > 8 else ''}")
+    print(f"加载 + 排期: {elapsed:.2f}s  峰值内存: {peak_memory_mb():.0f} MB"
+          f"  ({'NumPy' if np is not None else '纯 Python'})")
+    graph.close()
+
+    if args.memory_budget and peak_memory_mb() > args.memory_budget:
+        print(f"✗ 峰值内存超出预算 {args.memory_budget:.0f} MB")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/task_graph"):
+        main()
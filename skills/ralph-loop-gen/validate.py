@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Ralph Loop Gen - 任务目录一致性检查
+
+Agent 各自修改 任务索引.md、任务NNN.md 和 当前任务.md，时间长了会互相矛盾。
+本脚本并行解析整个任务目录，汇总成一份状态表，报告：
+
+- 任务索引中的状态与任务文件不一致（任务文件为准；completed/ 下的任务一律视为 Done）
+- completed/ 中状态不是 Done 的任务、仍在任务集目录中的 Done 任务、同时出现在两处的任务
+- 锁定已超时（锁定时间 + 锁定超时 早于现在）仍为 Locked 的任务
+- 依赖未全部完成却已 In Progress / Done 的任务
+- 当前任务.md 与对应任务文件状态不一致
+- 索引中有而没有任务文件、有任务文件而索引中没有的任务
+- 索引中的统计数字与实际不符
+
+--fix 只改写有冲突的文件：修正状态行、释放过期锁、把 Done 的任务移入 completed/、
+修正索引中冲突的任务行（分片索引只改涉及的分片）和统计。
+
+用法:
+    python3 validate.py task/my-project
+    python3 validate.py task/my-project --fix
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from status import (INDEX_FIELDS, SHARD_DIR, STATUS_LINE, IndexWriter, is_task_file,
+                    parse_time, write_if_changed, patch_task_text, update_task_file)
+from task_graph import stage, tracing
+
+# 任务文件数超过该值时用多进程解析
+PARALLEL_THRESHOLD = 2000
+CHUNK_SIZE = 500
+
+_FIELDS = {
+    "status": re.compile(r"^\*\*状态\*\*: (.*)$", re.M),
+    "owner": re.compile(r"^\*\*占用者\*\*: (.*)$", re.M),
+    "lock_time": re.compile(r"^\*\*锁定时间\*\*: (.*)$", re.M),
+    "timeout": re.compile(r"^\*\*锁定超时\*\*: (\d+)", re.M),
+}
+_DEPENDENCY = re.compile(r"^\s*- \[[ xX]\] (\S+) \((?!所在分区)", re.M)
+_HEADING = re.compile(r"^# (\S+?):", re.M)
+
+ISSUE_TITLES = {
+    "index_status": "索引状态与任务文件不一致",
+    "completed_not_done": "completed/ 中的任务状态不是 Done",
+    "done_not_moved": "Done 的任务没有移入 completed/",
+    "duplicate": "任务同时在任务集目录和 completed/ 中",
+    "expired_lock": "锁定已超时",
+    "deps_not_done": "依赖未完成就已开始",
+    "current_task": "当前任务.md 与任务文件不一致",
+    "missing_file": "索引中的任务没有任务文件",
+    "missing_row": "任务文件不在索引中",
+    "index_counts": "索引统计与实际不符",
+}
+
+
+def parse_task(path: str, completed: bool) -> dict:
+    """解析一个任务文件中与一致性相关的字段"""
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    task = {"path": path, "label": Path(path).stem, "completed": completed}
+    for key, pattern in _FIELDS.items():
+        match = pattern.search(content)
+        task[key] = match.group(1).strip() if match else None
+    section = content.split("## 依赖任务", 1)[-1].split("\n## ", 1)[0] if "## 依赖任务" in content else ""
+    task["deps"] = _DEPENDENCY.findall(section)
+    return task
+
+
+def _parse_chunk(chunk: List[tuple]) -> List[dict]:
+    return [parse_task(path, completed) for path, completed in chunk]
+
+
+def scan_task_files(output_dir: Path, jobs: Optional[int] = None) -> List[dict]:
+    """并行解析任务集目录和 completed/ 中的全部任务文件"""
+    files = []
+    for folder, completed in ((output_dir, False), (output_dir / "completed", True)):
+        if not folder.is_dir():
+            continue
+        with os.scandir(folder) as entries:
+            files.extend((entry.path, completed) for entry in entries
+                         if is_task_file(entry.name) and entry.is_file())
+
+    if len(files) < PARALLEL_THRESHOLD or jobs == 1:
+        return _parse_chunk(files)
+    chunks = [files[i:i + CHUNK_SIZE] for i in range(0, len(files), CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [task for result in pool.map(_parse_chunk, chunks) for task in result]
+
+
+def scan_index(output_dir: Path) -> Dict[str, str]:
+    """索引（含分片）中的任务行：任务ID -> 状态"""
+    rows = {}
+    paths = [output_dir / "任务索引.md"]
+    shard_dir = output_dir / SHARD_DIR
+    if shard_dir.is_dir():
+        paths.extend(sorted(shard_dir.glob("*.md")))
+    for path in paths:
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("| 任务"):
+                    cells = line.split(" | ", 3)
+                    if len(cells) == 4:
+                        rows[cells[0][2:]] = cells[2]
+    return rows
+
+
+class Validator:
+    """任务目录的统一状态表与冲突检查"""
+
+    def __init__(self, output_dir: Path, jobs: Optional[int] = None, now: Optional[float] = None):
+        self.output_dir = Path(output_dir)
+        self.now = now or time.time()
+        with stage("scan-files"):
+            self.files = scan_task_files(self.output_dir, jobs)
+        with stage("scan-index"):
+            self.rows = scan_index(self.output_dir)
+        self.issues: List[dict] = []
+        self.expired = set()
+
+        # 统一状态表：同一任务两处都有时以 completed/ 为准
+        self.tasks: Dict[str, dict] = {}
+        self.duplicates: Dict[str, dict] = {}
+        for task in self.files:
+            other = self.tasks.get(task["label"])
+            if other is not None:
+                root = other if task["completed"] else task
+                self.duplicates[task["label"]] = root
+                if not task["completed"]:
+                    continue
+            self.tasks[task["label"]] = task
+
+    def state(self, label: str) -> Optional[str]:
+        """任务的实际状态"""
+        task = self.tasks.get(label)
+        if task is None:
+            return None
+        return "Done" if task["completed"] else (task["status"] or "Todo")
+
+    def _issue(self, kind: str, label: str, detail: str, fix: Optional[str] = None):
+        self.issues.append({"kind": kind, "task": label, "detail": detail, "fix": fix})
+
+    def check(self) -> List[dict]:
+        self.issues = []
+        self.expired = set()
+        for label, root in self.duplicates.items():
+            self._issue("duplicate", label, f"{Path(root['path']).name} 与 completed/{label}.md 同时存在")
+
+        for label, task in self.tasks.items():
+            status = task["status"] or "Todo"
+            state = self.state(label)
+            if task["completed"] and status != "Done":
+                self._issue("completed_not_done", label, f"状态为 {status}", "状态改为 Done")
+            if not task["completed"] and status == "Done":
+                self._issue("done_not_moved", label, "状态为 Done", "移入 completed/")
+
+            if state == "Locked":
+                locked_at = parse_time(task["lock_time"])
+                timeout = int(task["timeout"]) if task["timeout"] else None
+                if locked_at and timeout is not None and locked_at + timeout * 60 < self.now:
+                    self.expired.add(label)
+                    overdue = (self.now - locked_at) / 60 - timeout
+                    self._issue("expired_lock", label,
+                                f"{task['owner'] or '-'} 于 {task['lock_time']} 锁定，已超时 {overdue:.0f} 分钟",
+                                "释放锁定（状态改为 Todo）")
+
+            if state in ("In Progress", "Done"):
+                pending = [d for d in task["deps"] if d in self.tasks and self.state(d) != "Done"]
+                if pending:
+                    detail = f"状态为 {state}，但依赖 " + ", ".join(f"{d}（{self.state(d)}）" for d in pending)
+                    self._issue("deps_not_done", label, detail + " 未完成")
+
+            row = self.rows.get(label)
+            if row is None:
+                if self.rows:
+                    self._issue("missing_row", label, "索引中没有该任务")
+            elif row != self._expected(label):
+                self._issue("index_status", label, f"索引为 {row}，任务文件为 {state}",
+                            f"索引改为 {self._expected(label)}")
+
+        for label in self.rows:
+            if label not in self.tasks:
+                self._issue("missing_file", label, f"没有 {label}.md")
+
+        self._check_current_task()
+        self._check_counts()
+        return self.issues
+
+    def _expected(self, label: str) -> str:
+        """修复后的状态（过期的锁会被释放）"""
+        state = self.state(label)
+        return "Todo" if label in self.expired else state
+
+    def _check_current_task(self):
+        path = self.output_dir / "当前任务.md"
+        if not path.exists():
+            return
+        content = path.read_text(encoding="utf-8")
+        heading = _HEADING.search(content)
+        match = _FIELDS["status"].search(content)
+        if not heading or not match or heading.group(1) not in self.tasks:
+            return
+        label = heading.group(1)
+        status, state = match.group(1).strip(), self.state(label)
+        # 当前任务.md 生成时就把领用的任务标为 In Progress，只报告与任务文件真正冲突的情况
+        if status != state and not (status == "In Progress" and state == "Locked"):
+            self._issue("current_task", label, f"当前任务.md 为 {status}，任务文件为 {state}", f"改为 {state}")
+
+    def counts(self) -> Dict[str, int]:
+        """修复后索引中应有的统计字段"""
+        counts = dict.fromkeys(("Done", "In Progress", "Locked"), 0)
+        for label in self.tasks:
+            state = self._expected(label)
+            if state in counts:
+                counts[state] += 1
+        total = len(self.tasks)
+        return {
+            "COMPLETED": counts["Done"],
+            "IN_PROGRESS": counts["In Progress"],
+            "TODO": total - sum(counts.values()),
+            "LOCKED": counts["Locked"],
+            "PROGRESS_PERCENT": counts["Done"] * 100 // total if total else 0,
+        }
+
+    def _check_counts(self):
+        path = self.output_dir / "任务索引.md"
+        if not path.exists():
+            return
+        content = path.read_text(encoding="utf-8")
+        wrong = []
+        for key, value in self.counts().items():
+            prefix, suffix = INDEX_FIELDS[key]
+            match = re.search(rf"^{re.escape(prefix)}(\d+)", content, re.M)
+            if match and int(match.group(1)) != value:
+                wrong.append(f"{prefix.strip(' *-:')} {match.group(1)}{suffix} → {value}{suffix}")
+        if wrong:
+            self._issue("index_counts", "-", "，".join(wrong), "刷新统计")
+
+    # ---------- 修复 ----------
+
+    def fix(self) -> int:
+        """只改写有冲突的文件；返回改写的文件数"""
+        changed = set()
+        statuses = {}
+        for issue in self.issues:
+            kind, label = issue["kind"], issue["task"]
+            task = self.tasks.get(label)
+            if kind == "completed_not_done":
+                path = Path(task["path"])
+                content = path.read_text(encoding="utf-8")
+                write_if_changed(path, content, patch_task_text(content, "Done"))
+                changed.add(path)
+            elif kind == "done_not_moved":
+                changed.add(update_task_file(self.output_dir, label, "Done"))
+            elif kind == "expired_lock":
+                update_task_file(self.output_dir, label, "Todo", note="validate: 锁定超时，已释放",
+                                 owner="-", lock_time="-")
+                changed.add(Path(task["path"]))
+            elif kind == "index_status":
+                statuses[label] = self._expected(label)
+            elif kind == "current_task":
+                path = self.output_dir / "当前任务.md"
+                content = path.read_text(encoding="utf-8")
+                write_if_changed(path, content,
+                                  STATUS_LINE.sub(f"**状态**: {self.state(label)}", content, count=1))
+                changed.add(path)
+
+        if statuses or any(i["kind"] == "index_counts" for i in self.issues):
+            IndexWriter(self.output_dir).update(self.counts(), statuses)
+            changed.add(self.output_dir / "任务索引.md")
+        return len(changed)
+
+
+def print_issues(issues: List[dict]):
+    by_kind: Dict[str, List[dict]] = {}
+    for issue in issues:
+        by_kind.setdefault(issue["kind"], []).append(issue)
+    for kind, items in by_kind.items():
+        print(f"\n✗ {ISSUE_TITLES[kind]}（{len(items)}）")
+        for issue in items[:20]:
+            fix = f"  [--fix: {issue['fix']}]" if issue["fix"] else ""
+            print(f"  - {issue['task']}: {issue['detail']}{fix}")
+        if len(items) > 20:
+            print(f"  … 另有 {len(items) - 20} 项")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查任务目录中索引、任务文件和当前任务的一致性")
+    parser.add_argument("task_dir", help="任务集目录（如 task/my-project）")
+    parser.add_argument("--fix", action="store_true", help="改写有冲突的文件")
+    parser.add_argument("--jobs", "-j", type=int, help="解析任务文件的进程数（默认: CPU 数）")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出问题列表")
+
+    args = parser.parse_args()
+    output_dir = Path(args.task_dir)
+    if not output_dir.is_dir():
+        print(f"✗ 任务集目录不存在: {output_dir}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    validator = Validator(output_dir, args.jobs)
+    with stage("check"):
+        issues = validator.check()
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(issues, ensure_ascii=False, indent=2))
+    else:
+        print(f"检查 {len(validator.tasks)} 个任务、{len(validator.rows)} 条索引行，用时 {elapsed * 1000:.0f} ms")
+        if issues:
+            print_issues(issues)
+        else:
+            print("✓ 未发现不一致")
+
+    if args.fix and issues:
+        with stage("fix"):
+            count = validator.fix()
+        remaining = [i for i in Validator(output_dir, args.jobs).check() if i["fix"]]
+        print(f"\n✓ 已改写 {count} 个文件" + (f"，仍有 {len(remaining)} 项未修复" if remaining else ""))
+        issues = [i for i in issues if not i["fix"]]
+
+    if issues:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with tracing("ralph-loop-gen/validate"):
+        main()
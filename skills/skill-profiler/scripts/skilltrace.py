@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+skilltrace - opt-in stage timing, memory and cProfile tracing for skill scripts
+
+Scripts wrap their entry point in `tracing(name)` and mark expensive sections
+with `stage(name)`. Both are no-ops (a shared null context, no imports) unless
+tracing is switched on:
+
+    SKILLTRACE=1 python3 generate.py ...          # trace into ~/.cache/skilltrace
+    SKILLTRACE=/tmp/traces python3 generate.py ...
+    python3 generate.py ... --trace               # same as SKILLTRACE=1
+    python3 generate.py ... --trace-profile       # also run cProfile
+
+    SKILLTRACE_PROFILE=1   run cProfile as well (writes <trace>.prof)
+    SKILLTRACE_MEMORY=0    skip tracemalloc (it slows allocation-heavy code)
+
+Each traced run writes one JSON file: wall time, exit code, tracemalloc peak,
+per-stage calls / total / max wall time / peak memory (nested stages are named
+"outer/inner"), and the top cProfile functions. trace_report.py aggregates them.
+
+Scripts without hooks can be traced as a whole:
+
+    python3 skilltrace.py path/to/script.py [args...]
+
+Stages entered from worker threads are timed exactly; their memory peaks are
+approximate because tracemalloc keeps one peak for the whole process. Child
+processes are not traced.
+"""
+
+import os
+import sys
+import time
+
+ENV_VAR = "SKILLTRACE"
+DEFAULT_TRACE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "skilltrace")
+TRACE_VERSION = 1
+PROFILE_TOP = 30
+
+_FLAGS = {"--trace": False, "--trace-profile": True}
+
+_session = None
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullStage()
+
+
+def trace_dir():
+    """Directory traces are written to (and read from by trace_report.py)"""
+    value = os.environ.get(ENV_VAR, "")
+    return value if value not in ("", "0", "1") else DEFAULT_TRACE_DIR
+
+
+def stage(name):
+    """Context manager timing one stage of the active trace; free when tracing is off"""
+    session = _session
+    if session is None:
+        return _NULL
+    return _Stage(session, name)
+
+
+class _Stage:
+    __slots__ = ("session", "name", "frame")
+
+    def __init__(self, session, name):
+        self.session = session
+        self.name = name
+
+    def __enter__(self):
+        self.frame = self.session.push(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.session.pop(self.frame)
+        return False
+
+
+class _Frame:
+    __slots__ = ("path", "start", "base", "peak")
+
+    def __init__(self, path, base):
+        self.path = path
+        self.base = base
+        self.peak = base
+        self.start = time.perf_counter()
+
+
+class _Session:
+    def __init__(self, script, memory, profile):
+        import threading
+
+        self.script = script
+        self.argv = sys.argv[1:]
+        self.started = time.time()
+        self.memory = memory
+        self.profile = profile
+        self.profiler = None
+        self.own_tracemalloc = False
+        self.stats = {}  # stage path -> [calls, total s, max s, peak bytes, growth bytes]
+        self.open = []  # frames open on any thread, for peak bookkeeping
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def start(self):
+        if self.memory:
+            import tracemalloc
+
+            self.tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.own_tracemalloc = True
+        if self.profile:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:  # another profiler is already active
+                self.profiler = None
+        self.t0 = time.perf_counter()
+
+    def _fold_peak(self):
+        """Record the tracemalloc peak into every open frame, then reset it"""
+        current, peak = self.tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak)
+        for frame in self.open:
+            if peak > frame.peak:
+                frame.peak = peak
+        self.tracemalloc.reset_peak()
+        return current
+
+    def push(self, name):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        path = f"{stack[-1].path}/{name}" if stack else name
+        with self.lock:
+            base = self._fold_peak() if self.memory else 0
+            frame = _Frame(path, base)
+            self.open.append(frame)
+        stack.append(frame)
+        return frame
+
+    def pop(self, frame):
+        elapsed = time.perf_counter() - frame.start
+        stack = self.local.stack
+        if stack[-1] is frame:
+            stack.pop()
+        else:  # interleaved coroutines can leave stages out of order
+            stack.remove(frame)
+        with self.lock:
+            if self.memory:
+                self._fold_peak()
+            self.open.remove(frame)
+            entry = self.stats.get(frame.path)
+            if entry is None:
+                entry = self.stats[frame.path] = [0, 0.0, 0.0, 0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+            entry[3] = max(entry[3], frame.peak)
+            entry[4] = max(entry[4], frame.peak - frame.base)
+
+    def finish(self, exit_code, error):
+        wall = time.perf_counter() - self.t0
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.memory:
+            self._fold_peak()
+            if self.own_tracemalloc:
+                self.tracemalloc.stop()
+
+        trace = {
+            "version": TRACE_VERSION,
+            "script": self.script,
+            "argv": self.argv,
+            "pid": os.getpid(),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "python": sys.version.split()[0],
+            "wall_ms": round(wall * 1000, 3),
+            "exit_code": exit_code,
+            "error": error,
+            "peak_bytes": self.peak if self.memory else None,
+            "stages": [
+                {
+                    "name": path,
+                    "calls": calls,
+                    "total_ms": round(total * 1000, 3),
+                    "max_ms": round(longest * 1000, 3),
+                    "peak_bytes": peak if self.memory else None,
+                    "growth_bytes": growth if self.memory else None,
+                }
+                for path, (calls, total, longest, peak, growth) in self.stats.items()
+            ],
+            "profile": None,
+        }
+        return self._write(trace)
+
+    def _write(self, trace):
+        import json
+
+        directory = trace_dir()
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in self.script)
+        path = os.path.join(directory, f"{safe}-{stamp}-{os.getpid()}.json")
+        if self.profiler is not None:
+            trace["profile"] = self._profile_summary(path[:-5] + ".prof")
+
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+        return path
+
+    def _profile_summary(self, prof_path):
+        import pstats
+
+        self.profiler.dump_stats(prof_path)
+        stats = pstats.Stats(self.profiler).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:PROFILE_TOP]
+        return {
+            "file": prof_path,
+            "top": [
+                {
+                    "function": f"{os.path.basename(filename)}:{line}({name})",
+                    "calls": calls,
+                    "tottime_ms": round(tottime * 1000, 3),
+                    "cumtime_ms": round(cumtime * 1000, 3),
+                }
+                for (filename, line, name), (_, calls, tottime, cumtime, _) in ranked
+            ],
+        }
+
+
+class tracing:
+    """Trace the enclosed block (normally a script's whole main) as one run
+
+    Switched on by SKILLTRACE or by --trace / --trace-profile on the command
+    line; the flags are removed from sys.argv before the script parses it.
+    Inside an already traced run this is just a stage.
+    """
+
+    def __init__(self, script, enabled=None, profile=None):
+        self.script = script
+        flags = [arg for arg in sys.argv[1:] if arg in _FLAGS]
+        if flags:
+            sys.argv[1:] = [arg for arg in sys.argv[1:] if arg not in _FLAGS]
+        if enabled is None:
+            enabled = bool(flags) or os.environ.get(ENV_VAR, "") not in ("", "0")
+        if profile is None:
+            profile = any(_FLAGS[flag] for flag in flags) or os.environ.get(f"{ENV_VAR}_PROFILE") == "1"
+        self.enabled = enabled
+        self.profile = profile
+        self.memory = os.environ.get(f"{ENV_VAR}_MEMORY") != "0"
+        self.inner = None
+        self.session = None
+
+    def __enter__(self):
+        global _session
+        if _session is not None:
+            self.inner = _Stage(_session, self.script)
+            self.inner.__enter__()
+        elif self.enabled:
+            self.session = _Session(self.script, self.memory, self.profile)
+            self.session.start()
+            _session = self.session
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _session
+        if self.inner is not None:
+            return self.inner.__exit__(exc_type, exc, tb)
+        if self.session is None:
+            return False
+
+        _session = None
+        if exc_type is None:
+            exit_code, error = 0, None
+        elif issubclass(exc_type, SystemExit):
+            code = exc.code
+            exit_code, error = (code if isinstance(code, int) else 0 if code is None else 1), None
+        elif issubclass(exc_type, KeyboardInterrupt):
+            exit_code, error = 130, "KeyboardInterrupt"
+        else:
+            exit_code, error = 1, f"{exc_type.__name__}: {exc}"
+        try:
+            path = self.session.finish(exit_code, error)
+            print(f"skilltrace: {path}", file=sys.stderr)
+        except OSError as e:
+            print(f"skilltrace: could not write trace: {e}", file=sys.stderr)
+        return False
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        print("usage: skilltrace.py [--trace-profile] SCRIPT [ARGS...]\n\n"
+              "Run a Python script as one traced run (its own stages are recorded if it has hooks).\n"
+              f"Traces go to {trace_dir()} (set {ENV_VAR}=DIR to change).")
+        sys.exit(0 if len(sys.argv) > 1 else 2)
+
+    import runpy
+
+    profile = sys.argv[1] == "--trace-profile"
+    script = sys.argv[2 if profile else 1]
+    sys.argv = [script] + sys.argv[(3 if profile else 2):]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    with tracing(os.path.splitext(os.path.basename(script))[0], enabled=True, profile=profile or None):
+        runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+trace_report - aggregate skilltrace JSON traces across runs
+
+Shows, per script, how many runs were traced and their wall time and memory,
+then the hottest stages across all runs (total time, per-run p50/p95, share of
+the script's wall time, peak memory growth), and optionally the cProfile
+functions with the most own time summed over the profiled runs.
+
+    python3 trace_report.py                       # traces in ~/.cache/skilltrace
+    python3 trace_report.py /tmp/traces --script ralph-loop-gen/generate
+    python3 trace_report.py --since 24 --top 15 --profile
+    python3 trace_report.py --json > report.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from skilltrace import TRACE_VERSION, trace_dir
+
+
+def load_traces(paths: List[str], script: Optional[str] = None, since_hours: Optional[float] = None,
+                last: Optional[int] = None) -> List[Dict]:
+    """Read trace files (directories are searched for *.json), oldest first"""
+    files = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path])
+
+    cutoff = time.time() - since_hours * 3600 if since_hours else None
+    traces = []
+    for path in files:
+        if cutoff and os.path.getmtime(path) < cutoff:
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"skipping {path}: {e}", file=sys.stderr)
+            continue
+        if not isinstance(trace, dict) or trace.get("version") != TRACE_VERSION:
+            continue
+        if script and script not in trace["script"]:
+            continue
+        traces.append(trace)
+
+    traces.sort(key=lambda trace: trace["started"])
+    if last:
+        by_script = defaultdict(list)
+        for trace in traces:
+            by_script[trace["script"]].append(trace)
+        traces = [trace for runs in by_script.values() for trace in runs[-last:]]
+    return traces
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = q * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(traces: List[Dict], top: int = 20) -> Dict:
+    """Per-script run statistics, hottest stages and top profiled functions"""
+    scripts = {}
+    runs_by_script = defaultdict(list)
+    for trace in traces:
+        runs_by_script[trace["script"]].append(trace)
+    for name, runs in sorted(runs_by_script.items()):
+        walls = [run["wall_ms"] for run in runs]
+        peaks = [run["peak_bytes"] for run in runs if run.get("peak_bytes") is not None]
+        scripts[name] = {
+            "runs": len(runs),
+            "failed": sum(1 for run in runs if run.get("exit_code")),
+            "wall_p50_ms": round(percentile(walls, 0.5), 3),
+            "wall_p95_ms": round(percentile(walls, 0.95), 3),
+            "wall_max_ms": round(max(walls), 3),
+            "peak_max_bytes": max(peaks) if peaks else None,
+        }
+
+    per_run = defaultdict(list)  # (script, stage) -> total ms in each run
+    calls = defaultdict(int)
+    growth = defaultdict(int)
+    for trace in traces:
+        for entry in trace["stages"]:
+            key = (trace["script"], entry["name"])
+            per_run[key].append(entry["total_ms"])
+            calls[key] += entry["calls"]
+            if entry.get("growth_bytes") is not None:
+                growth[key] = max(growth[key], entry["growth_bytes"])
+
+    wall_total = {name: sum(run["wall_ms"] for run in runs) for name, runs in runs_by_script.items()}
+    stages = []
+    for (name, stage), totals in per_run.items():
+        total = sum(totals)
+        stages.append({
+            "script": name,
+            "stage": stage,
+            "runs": len(totals),
+            "calls": calls[(name, stage)],
+            "total_ms": round(total, 3),
+            "p50_ms": round(percentile(totals, 0.5), 3),
+            "p95_ms": round(percentile(totals, 0.95), 3),
+            "share": round(total / wall_total[name], 4) if wall_total[name] else 0.0,
+            "growth_max_bytes": growth.get((name, stage)),
+        })
+    stages.sort(key=lambda entry: entry["total_ms"], reverse=True)
+
+    functions = defaultdict(lambda: [0, 0.0, 0.0, 0])
+    for trace in traces:
+        for entry in (trace.get("profile") or {}).get("top", []):
+            item = functions[(trace["script"], entry["function"])]
+            item[0] += entry["calls"]
+            item[1] += entry["tottime_ms"]
+            item[2] += entry["cumtime_ms"]
+            item[3] += 1
+    profile = [
+        {"script": name, "function": function, "runs": runs, "calls": n,
+         "tottime_ms": round(tottime, 3), "cumtime_ms": round(cumtime, 3)}
+        for (name, function), (n, tottime, cumtime, runs) in functions.items()
+    ]
+    profile.sort(key=lambda entry: entry["tottime_ms"], reverse=True)
+
+    return {"traces": len(traces), "scripts": scripts, "stages": stages[:top], "profile": profile[:top]}
+
+
+def format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if abs(value) < 1024:
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GB"
+
+
+def print_table(headers: List[str], rows: List[List[str]], left: int = 2):
+    """Plain-text table; the first `left` columns are left-aligned, the rest right-aligned"""
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    for row in [headers, ["-" * width for width in widths]] + rows:
+        print("  ".join(str(cell).ljust(width) if i < left else str(cell).rjust(width)
+                        for i, (cell, width) in enumerate(zip(row, widths))))
+
+
+def print_report(report: Dict, show_profile: bool):
+    print(f"{report['traces']} traced runs\n")
+    print_table(
+        ["script", "runs", "failed", "p50", "p95", "max", "peak mem"],
+        [[name, s["runs"], s["failed"], f"{s['wall_p50_ms']:.1f}ms", f"{s['wall_p95_ms']:.1f}ms",
+          f"{s['wall_max_ms']:.1f}ms", format_bytes(s["peak_max_bytes"])]
+         for name, s in report["scripts"].items()],
+        left=1,
+    )
+
+    print("\nHot stages (summed over runs)\n")
+    print_table(
+        ["script", "stage", "runs", "calls", "total", "p50/run", "p95/run", "share", "mem growth"],
+        [[s["script"], s["stage"], s["runs"], s["calls"], f"{s['total_ms']:.1f}ms", f"{s['p50_ms']:.1f}ms",
+          f"{s['p95_ms']:.1f}ms", f"{s['share'] * 100:.1f}%", format_bytes(s["growth_max_bytes"])]
+         for s in report["stages"]],
+    )
+
+    if show_profile:
+        if not report["profile"]:
+            print("\nNo profiled runs (use --trace-profile or SKILLTRACE_PROFILE=1)")
+            return
+        print("\nTop functions by own time (profiled runs)\n")
+        print_table(
+            ["script", "function", "runs", "calls", "own", "cumulative"],
+            [[p["script"], p["function"], p["runs"], p["calls"], f"{p['tottime_ms']:.1f}ms",
+              f"{p['cumtime_ms']:.1f}ms"] for p in report["profile"]],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate skilltrace traces and show the hottest stages")
+    parser.add_argument("paths", nargs="*", help=f"Trace files or directories (default: {trace_dir()})")
+    parser.add_argument("--script", help="Only traces whose script name contains this text")
+    parser.add_argument("--since", type=float, metavar="HOURS", help="Only traces written in the last HOURS hours")
+    parser.add_argument("--last", type=int, metavar="N", help="Only the last N runs of each script")
+    parser.add_argument("--top", type=int, default=20, help="Number of stages / functions to list (default: 20)")
+    parser.add_argument("--profile", action="store_true", help="Also list the cProfile functions with most own time")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    traces = load_traces(args.paths or [trace_dir()], args.script, args.since, args.last)
+    if not traces:
+        print("No traces found. Run a script with SKILLTRACE=1 or --trace first.", file=sys.stderr)
+        sys.exit(1)
+
+    report = summarize(traces, args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, args.profile)
+
+
+if __name__ == "__main__":
+    main()
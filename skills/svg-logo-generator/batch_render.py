@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Batch Variant Renderer
+把 预设 × 调色板 × 尺寸 × 布局 的网格交给进程池批量渲染
+
+- 文件名取 SVG 内容的 sha256，相同输出只写一次
+- manifest.json 记录 变体 -> 文件；引擎或预设源码未变时，再次运行直接跳过已有变体
+- index.html 为所有变体生成一张对照表（contact sheet）
+
+用法:
+    python3 batch_render.py --out variants
+    python3 batch_render.py --sizes 64,128,256,512 --paddings 0,32 --backgrounds none,dark \\
+        --generated-palettes 24 --out variants
+"""
+
+import argparse
+import colorsys
+import hashlib
+import html
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from logo_presets import PALETTES, PRESETS, build
+from svg_engine import stage, tracing
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENGINE_SOURCES = ("svg_engine.py", "logo_presets.py", "svg_optimize.py")
+DEFAULT_PALETTE = "default"
+CHUNK_SIZE = 64
+
+
+def engine_fingerprint(optimize=False):
+    """引擎和预设源码（及是否优化）的哈希；变化后 manifest 中的记录全部失效"""
+    digest = hashlib.sha256(b"optimize" if optimize else b"")
+    for name in ENGINE_SOURCES:
+        with open(os.path.join(HERE, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def hsl(hue, saturation, lightness):
+    r, g, b = colorsys.hls_to_rgb(hue % 1.0, lightness, saturation)
+    return f"#{round(r * 255):02X}{round(g * 255):02X}{round(b * 255):02X}"
+
+
+def generated_palettes(count):
+    """沿色相环均匀取 count 组调色板"""
+    palettes = {}
+    for i in range(count):
+        hue = i / count
+        palettes[f"hue-{round(hue * 360):03d}"] = {
+            "primary": hsl(hue, 0.75, 0.55),
+            "secondary": hsl(hue + 1 / 12, 0.70, 0.62),
+            "accent": hsl(hue + 0.5, 0.90, 0.55),
+            "dark": hsl(hue, 0.60, 0.15),
+            "light": "#FFFFFF",
+        }
+    return palettes
+
+
+def variant_key(preset, palette, size, padding, background):
+    return f"{preset}|{palette}|{size}|{padding:g}|{background or 'none'}"
+
+
+def expand_grid(presets, palettes, sizes, paddings, backgrounds):
+    """网格展开为 (key, preset, palette 名, 颜色, size, padding, background) 列表"""
+    return [
+        (variant_key(preset, name, size, padding, background), preset, name, colors, size, padding, background)
+        for preset, (name, colors), size, padding, background
+        in itertools.product(presets, palettes.items(), sizes, paddings, backgrounds)
+    ]
+
+
+def render_chunk(out_dir, optimize, chunk):
+    """子进程中渲染一组变体；返回 [(key, 文件名, 状态), ...]，状态为 written 或 duplicate"""
+    if optimize:
+        from svg_optimize import optimize_svg
+    results = []
+    for key, preset, _, colors, size, padding, background in chunk:
+        layout = {"padding": padding, "background": background}
+        svg = build(preset, colors, size, layout).to_string()
+        data = (optimize_svg(svg) if optimize else svg).encode("utf-8")
+        name = hashlib.sha256(data).hexdigest()[:16] + ".svg"
+        target = os.path.join(out_dir, name)
+
+        if os.path.exists(target):
+            results.append((key, name, "duplicate"))
+            continue
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+        results.append((key, name, "written"))
+    return results
+
+
+def load_manifest(out_dir, fingerprint):
+    try:
+        with open(os.path.join(out_dir, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if manifest.get("engine") != fingerprint:
+        return {}
+    return manifest.get("variants", {})
+
+
+def save_manifest(out_dir, fingerprint, variants):
+    path = os.path.join(out_dir, "manifest.json")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"engine": fingerprint, "variants": variants}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def write_contact_sheet(out_dir, grid, files):
+    """按预设分组的 HTML 对照表，流式写出"""
+    path = os.path.join(out_dir, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Logo variants</title>\n"
+                "<style>body{font:13px system-ui,sans-serif;margin:24px;background:#F8FAFC}"
+                "section{display:flex;flex-wrap:wrap;gap:12px}"
+                "figure{margin:0;width:148px;text-align:center}"
+                "img{width:128px;height:128px;background:repeating-conic-gradient(#E2E8F0 0 25%,#fff 0 50%) 0 0/16px 16px}"
+                "figcaption{color:#475569;word-break:break-all}</style></head><body>\n")
+        f.write(f"<h1>{len(grid)} variants, {len(set(files.values()))} unique files</h1>\n")
+        for preset, variants in itertools.groupby(grid, key=lambda v: v[1]):
+            f.write(f"<h2>{html.escape(preset)}</h2>\n<section>\n")
+            for key, _, palette, _, size, padding, background in variants:
+                caption = f"{palette} · {size}px · pad {padding:g} · bg {background or 'none'}"
+                f.write(f'<figure><img loading="lazy" src="{files[key]}" title="{html.escape(key)}">'
+                        f"<figcaption>{html.escape(caption)}</figcaption></figure>\n")
+            f.write("</section>\n")
+        f.write("</body></html>\n")
+    return path
+
+
+def batch_render(out_dir, presets, palettes, sizes, paddings=(0,), backgrounds=(None,), workers=None,
+                 force=False, optimize=False):
+    """渲染整个网格，返回统计信息"""
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+    fingerprint = engine_fingerprint(optimize)
+    grid = expand_grid(presets, palettes, sizes, paddings, backgrounds)
+
+    with stage("manifest"):
+        files = {} if force else load_manifest(out_dir, fingerprint)
+    files = {k: v for k, v in files.items() if os.path.exists(os.path.join(out_dir, v))}
+    pending = [v for v in grid if v[0] not in files]
+    stats = {"variants": len(grid), "skipped": len(grid) - len(pending), "written": 0, "duplicate": 0}
+
+    chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+    if chunks:
+        with stage("render"), ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(render_chunk, itertools.repeat(out_dir), itertools.repeat(optimize), chunks):
+                for key, name, status in results:
+                    files[key] = name
+                    stats[status] += 1
+
+    save_manifest(out_dir, fingerprint, files)
+    stats["unique_files"] = len({files[v[0]] for v in grid})
+    with stage("contact-sheet"):
+        stats["contact_sheet"] = write_contact_sheet(out_dir, grid, files)
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["variants_per_second"] = round(len(pending) / elapsed, 1) if elapsed and pending else None
+    return stats
+
+
+def split_list(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a grid of logo variants in parallel")
+    parser.add_argument("--presets", default="all", help="Comma-separated presets, or 'all'.")
+    parser.add_argument("--palettes", default="all",
+                        help=f"Comma-separated palettes ('{DEFAULT_PALETTE}' keeps the preset colors), or 'all'.")
+    parser.add_argument("--generated-palettes", type=int, default=0, help="Add N palettes spread around the hue wheel.")
+    parser.add_argument("--sizes", default="512", help="Comma-separated output sizes in px.")
+    parser.add_argument("--paddings", default="0", help="Comma-separated inner paddings in design units.")
+    parser.add_argument("--backgrounds", default="none", help="Comma-separated backgrounds (color, palette role or 'none').")
+    parser.add_argument("--out", default="variants", help="Output directory.")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and render every variant again.")
+    parser.add_argument("--optimize", action="store_true", help="Minify every variant with svg_optimize.py.")
+
+    args = parser.parse_args()
+
+    presets = list(PRESETS) if args.presets == "all" else split_list(args.presets)
+    unknown = [p for p in presets if p not in PRESETS]
+    if unknown:
+        parser.error(f"Unknown presets: {', '.join(unknown)} (available: {', '.join(PRESETS)})")
+
+    available = {DEFAULT_PALETTE: None, **PALETTES, **generated_palettes(args.generated_palettes)}
+    if args.palettes == "all":
+        palettes = available
+    else:
+        names = split_list(args.palettes)
+        unknown = [n for n in names if n not in available]
+        if unknown:
+            parser.error(f"Unknown palettes: {', '.join(unknown)} (available: {', '.join(available)})")
+        palettes = {n: available[n] for n in names}
+
+    sizes = [int(s) for s in split_list(args.sizes)]
+    paddings = [float(p) for p in split_list(args.paddings)]
+    backgrounds = [None if b == "none" else b for b in split_list(args.backgrounds)]
+
+    stats = batch_render(args.out, presets, palettes, sizes, paddings, backgrounds,
+                         workers=args.workers, force=args.force, optimize=args.optimize)
+
+    print(f"✅ {stats['variants']} variants → {stats['unique_files']} unique files in {args.out}")
+    print(f"   Written: {stats['written']}  Identical: {stats['duplicate']}  Skipped: {stats['skipped']}")
+    if stats["variants_per_second"]:
+        print(f"⚡ {stats['variants_per_second']} variants/s ({stats['elapsed_seconds']}s)")
+    print(f"🖼  Contact sheet: {stats['contact_sheet']}")
+
+
+if __name__ == "__main__":
+    with tracing("svg-logo-generator/batch_render"):
+        main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Logo Presets
+把原有的 folder-site logo 设计移植为可参数化的预设：配色、尺寸、布局均可替换
+
+用法:
+    python3 logo_presets.py --list
+    python3 logo_presets.py --preset tech-v2 --palette indigo --size 256 --output logo.svg
+    python3 logo_presets.py --preset folder --color primary=#E11D48 --padding 32 --output -
+"""
+
+import argparse
+import os
+
+from svg_engine import (DESIGN_SIZE, Scene, circle, drop_shadow, group, line, linear_gradient, path, rect,
+                        stage, text, tracing)
+
+# 调色板角色：primary 主色 / secondary 辅助色 / accent 强调色 / dark 阴影或深色 / light 前景白
+ROLES = ("primary", "secondary", "accent", "dark", "light")
+
+PALETTES = {
+    "blue": {"primary": "#3B82F6", "secondary": "#10B981", "accent": "#F59E0B", "dark": "#1E293B", "light": "#FFFFFF"},
+    "ios": {"primary": "#007AFF", "secondary": "#64D2FF", "accent": "#FF9F0A", "dark": "#1C1C1E", "light": "#FFFFFF"},
+    "indigo": {"primary": "#6366F1", "secondary": "#8B5CF6", "accent": "#F472B6", "dark": "#1E1B4B", "light": "#FFFFFF"},
+    "emerald": {"primary": "#10B981", "secondary": "#34D399", "accent": "#FBBF24", "dark": "#064E3B", "light": "#FFFFFF"},
+    "sky": {"primary": "#0EA5E9", "secondary": "#38BDF8", "accent": "#F97316", "dark": "#0C4A6E", "light": "#FFFFFF"},
+    "violet": {"primary": "#5856D6", "secondary": "#AF52DE", "accent": "#FFD60A", "dark": "#2E1065", "light": "#FFFFFF"},
+    "rose": {"primary": "#E11D48", "secondary": "#FB7185", "accent": "#FACC15", "dark": "#4C0519", "light": "#FFFFFF"},
+    "slate": {"primary": "#334155", "secondary": "#64748B", "accent": "#22D3EE", "dark": "#0F172A", "light": "#F8FAFC"},
+}
+
+PRESETS = {}
+
+
+class Preset:
+    __slots__ = ("name", "build", "defaults", "description")
+
+    def __init__(self, name, build, defaults, description):
+        self.name = name
+        self.build = build
+        self.defaults = defaults
+        self.description = description
+
+
+def preset(name, description, **defaults):
+    """注册预设；defaults 是原设计的配色，未指定的角色取 blue 调色板"""
+    def register(build):
+        PRESETS[name] = Preset(name, build, {**PALETTES["blue"], **defaults}, description)
+        return build
+    return register
+
+
+@preset("folder", "文件夹 + 飞出的文档页 + 链接徽章（logo_generator.py）")
+def folder(scene, c):
+    folder_fill = scene.define(linear_gradient("folderGradient", [("0%", c["primary"]), ("100%", c["secondary"])]))
+    page_fill = scene.define(linear_gradient("pageGradient", [("0%", "#FFFFFF", 0.95), ("100%", "#F1F5F9")]))
+    shadow = scene.define(drop_shadow("shadow", 4, 8, 12, c["dark"], 0.3))
+
+    scene.add(
+        group(
+            path("M 64 160 L 200 160 L 220 180 L 448 180 L 448 420 L 64 420 Z", fill=folder_fill),
+            path("M 64 160 L 180 160 L 200 180 L 180 180 L 180 160 Z", fill=c["primary"]),
+            path("M 64 200 L 200 200 L 220 220 L 448 220 L 448 420 L 64 420 Z", fill=folder_fill, opacity=0.3),
+            filter=shadow,
+        ),
+        group(
+            rect(-80, -100, 160, 200, rx=8, fill=page_fill),
+            path("M 80 -100 L 80 -60 L 60 -60 L 60 -100 Z", fill=c["secondary"], opacity=0.8),
+            rect(-60, -60, 100, 8, rx=4, fill="#CBD5E1"),
+            *[rect(-60, y, w, 6, rx=3, fill="#E2E8F0") for y, w in ((-40, 120), (-20, 100), (0, 110), (20, 80))],
+            circle(0, 70, 24, fill=c["accent"], opacity=0.9),
+            path("M -8 62 L 0 70 L 8 62 M -8 70 L 0 78 L 8 70", stroke=c["light"], stroke_width=3, fill="none",
+                 stroke_linecap="round", stroke_linejoin="round"),
+            transform="translate(256, 280)", filter=shadow,
+        ),
+        group(
+            circle(0, 0, 36, fill=c["accent"], opacity=0.9),
+            path("M -12 -8 L -4 -8 L -4 4 L -12 4 Z M 4 -8 L 12 -8 L 12 4 L 4 4 Z", fill=c["light"], opacity=0.9),
+            path("M -4 16 L 0 20 L 4 16", stroke=c["light"], stroke_width=3, fill="none",
+                 stroke_linecap="round", stroke_linejoin="round"),
+            transform="translate(380, 120)",
+        ),
+        circle(140, 130, 8, fill=c["accent"], opacity=0.8),
+        circle(100, 380, 6, fill=c["light"], opacity=0.3),
+        circle(420, 360, 10, fill=c["secondary"], opacity=0.4),
+    )
+
+
+@preset("tech", "细圆环 + 线条文件夹 + 连接线（logo_tech.py v1）", primary="#0A84FF", secondary="#64D2FF")
+def tech(scene, c):
+    g = scene.define(linear_gradient("g", [("0%", c["primary"]), ("100%", c["secondary"])]))
+
+    scene.add(
+        circle(256, 256, 230, fill="none", stroke=g, stroke_width=4),
+        *[circle(x, y, 6, fill=c["primary"]) for x, y in ((256, 100), (412, 256), (256, 412), (100, 256))],
+        group(
+            path("M 140 180 L 220 180 L 250 210 L 372 210 L 372 370 L 140 370 Z"),
+            path("M 140 180 L 200 180 L 230 210"),
+            line(190, 260, 322, 260, stroke_width=6),
+            line(190, 310, 270, 310, stroke_width=6),
+            fill="none", stroke=g, stroke_width=8, stroke_linecap="round", stroke_linejoin="round",
+        ),
+        group(
+            line(372, 210, 420, 162),
+            circle(420, 162, 4, fill=c["primary"], stroke="none"),
+            fill="none", stroke=g, stroke_width=3, stroke_linecap="round",
+        ),
+    )
+
+
+@preset("tech-v2", "更极简的线条文件夹（logo_tech.py v2）", primary="#007AFF")
+def tech_v2(scene, c):
+    scene.add(
+        circle(256, 256, 240, fill="none", stroke=c["primary"], stroke_width=3, opacity=0.4),
+        group(
+            path("M 128 176 L 208 176 L 240 208 L 384 208 L 384 368 L 128 368 Z"),
+            line(184, 256, 336, 256),
+            line(184, 304, 272, 304),
+            fill="none", stroke=c["primary"], stroke_width=10, stroke_linecap="round", stroke_linejoin="round",
+        ),
+        circle(384, 208, 8, fill=c["primary"]),
+        circle(256, 112, 5, fill=c["primary"], opacity=0.5),
+        circle(432, 256, 5, fill=c["primary"], opacity=0.5),
+    )
+
+
+@preset("tech-v3", "斜切角外框 + 线条文件夹（logo_tech.py v3）", primary="#5856D6")
+def tech_v3(scene, c):
+    scene.add(
+        path("M 100 100 L 380 100 L 440 160 L 440 440 L 100 440 Z", fill="none", stroke=c["primary"],
+             stroke_width=4, stroke_linejoin="round", opacity=0.3),
+        group(
+            path("M 144 192 L 224 192 L 256 224 L 368 224 L 368 352 L 144 352 Z"),
+            line(200, 264, 312, 264),
+            line(200, 304, 272, 304),
+            fill="none", stroke=c["primary"], stroke_width=12, stroke_linecap="round", stroke_linejoin="round",
+        ),
+        group(
+            line(440, 100, 440, 160),
+            line(100, 100, 380, 100),
+            line(440, 440, 368, 352),
+            stroke=c["primary"], stroke_width=3,
+        ),
+        circle(368, 224, 6, fill=c["primary"]),
+        circle(100, 100, 5, fill=c["primary"], opacity=0.5),
+        circle(440, 100, 5, fill=c["primary"], opacity=0.5),
+    )
+
+
+@preset("simple", "渐变圆底 + 白色线条文件夹（logo_v2.py）",
+        primary="#6366F1", secondary="#8B5CF6", dark="#1E1B4B")
+def simple(scene, c):
+    g = scene.define(linear_gradient("g", [("0%", c["primary"]), ("100%", c["secondary"])]))
+    s = scene.define(drop_shadow("s", 0, 8, 16, c["dark"], 0.25, margin="50%"))
+
+    scene.add(
+        circle(256, 256, 240, fill=g, filter=s),
+        group(
+            path("M 120 170 L 200 170 L 230 200 L 392 200 L 392 380 L 120 380 Z"),
+            path("M 120 170 L 180 170 L 210 200"),
+            path("M 170 260 L 342 260", stroke_width=16, opacity=0.6),
+            path("M 170 300 L 310 300", stroke_width=16, opacity=0.6),
+            path("M 170 340 L 260 340", stroke_width=16, opacity=0.6),
+            fill="none", stroke=c["light"], stroke_width=24, stroke_linecap="round", stroke_linejoin="round",
+        ),
+    )
+
+
+@preset("circle", "纯色圆底 + 粗线条文件夹（logo_v2.py）")
+def circle_logo(scene, c):
+    scene.add(
+        circle(256, 256, 240, fill=c["primary"]),
+        group(
+            path("M 130 180 L 210 180 L 240 210 L 382 210 L 382 360 L 130 360 Z"),
+            line(170, 260, 342, 260),
+            line(170, 310, 280, 310),
+            fill="none", stroke=c["light"], stroke_width=28, stroke_linecap="round", stroke_linejoin="round",
+        ),
+    )
+
+
+@preset("fs", "FS 字母组合（logo_v2.py）", primary="#10B981", secondary="#34D399", dark="#064E3B")
+def fs(scene, c):
+    g = scene.define(linear_gradient("g", [("0%", c["secondary"]), ("100%", c["primary"])]))
+    font = {"font_family": "system-ui, sans-serif", "font_size": 280, "font_weight": "bold"}
+
+    scene.add(
+        rect(0, 0, DESIGN_SIZE, DESIGN_SIZE, rx=64, fill=g),
+        text("F", 160, 380, fill=c["light"], **font),
+        text("S", 270, 380, fill=c["dark"], opacity=0.9, **font),
+    )
+
+
+@preset("minimal-folder", "圆角矩形 + 半透明文件夹（logo_v2.py 推荐版本）", primary="#0EA5E9")
+def minimal_folder(scene, c):
+    scene.add(
+        rect(60, 100, 392, 312, rx=40, fill=c["primary"]),
+        path("M 60 140 L 180 140 L 210 170 L 452 170 L 452 380 L 60 380 Z", fill=c["light"], opacity=0.3),
+        group(
+            line(120, 240, 392, 240),
+            line(120, 300, 300, 300),
+            stroke=c["light"], stroke_width=20, stroke_linecap="round", opacity=0.9,
+        ),
+    )
+
+
+def resolve_palette(name, palette=None):
+    """palette 可以是调色板名、角色到颜色的 dict（覆盖预设默认值）或 None"""
+    colors = dict(PRESETS[name].defaults)
+    if isinstance(palette, str):
+        if palette not in PALETTES:
+            raise ValueError(f"Unknown palette: {palette} (available: {', '.join(PALETTES)})")
+        colors.update(PALETTES[palette])
+    elif palette:
+        unknown = set(palette) - set(ROLES)
+        if unknown:
+            raise ValueError(f"Unknown palette roles: {', '.join(sorted(unknown))} (roles: {', '.join(ROLES)})")
+        colors.update(palette)
+    return colors
+
+
+def build(name, palette=None, size=None, layout=None):
+    """按预设构建 Scene
+
+    layout:
+        padding     设计坐标下的内边距，内容按比例缩放到中间
+        background  整张画布的底色（颜色或调色板角色名）
+        radius      背景圆角
+    """
+    if name not in PRESETS:
+        raise ValueError(f"Unknown preset: {name} (available: {', '.join(PRESETS)})")
+    layout = layout or {}
+    colors = resolve_palette(name, palette)
+
+    content = Scene(size=size)
+    PRESETS[name].build(content, colors)
+
+    scene = Scene(size=size)
+    scene.defs = content.defs
+    background = layout.get("background")
+    if background:
+        scene.add(rect(0, 0, DESIGN_SIZE, DESIGN_SIZE, rx=layout.get("radius") or None,
+                       fill=colors.get(background, background)))
+
+    padding = layout.get("padding") or 0
+    if padding:
+        scale = (DESIGN_SIZE - 2 * padding) / DESIGN_SIZE
+        scene.add(group(*content.body, transform=f"translate({padding} {padding}) scale({scale:.6g})"))
+    else:
+        scene.add(*content.body)
+    return scene
+
+
+def render(name, output="logo.svg", palette=None, size=None, layout=None, optimize=False):
+    with stage("build"):
+        scene = build(name, palette, size, layout)
+    if not optimize:
+        with stage("write"):
+            return scene.write(output)
+
+    from svg_optimize import optimize_svg
+    with stage("optimize"):
+        svg = optimize_svg(scene.to_string())
+    if output is None or output == "-":
+        print(svg)
+        return None
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(svg)
+    return output
+
+
+def parse_colors(pairs):
+    colors = {}
+    for pair in pairs or []:
+        role, sep, value = pair.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected ROLE=#HEX, got {pair}")
+        colors[role] = value
+    return colors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a parameterized SVG logo preset")
+    parser.add_argument("--preset", default="minimal-folder", help="Preset name (see --list).")
+    parser.add_argument("--palette", help="Named palette (see --list); defaults to the preset's original colors.")
+    parser.add_argument("--color", action="append", metavar="ROLE=#HEX", help="Override one palette role; repeatable.")
+    parser.add_argument("--size", type=int, help="Output width/height in px (the viewBox stays 512x512).")
+    parser.add_argument("--padding", type=float, default=0, help="Inner padding in design units.")
+    parser.add_argument("--background", help="Canvas background color or palette role.")
+    parser.add_argument("--radius", type=float, default=0, help="Background corner radius.")
+    parser.add_argument("--output", default="logo.svg", help="Output path, or '-' for stdout.")
+    parser.add_argument("--optimize", action="store_true", help="Minify the SVG with svg_optimize.py.")
+    parser.add_argument("--list", action="store_true", help="List presets and palettes.")
+
+    args = parser.parse_args()
+
+    if args.list:
+        print("Presets:")
+        for p in PRESETS.values():
+            print(f"  {p.name:<16} {p.description}")
+        print("Palettes:")
+        for name, colors in PALETTES.items():
+            print(f"  {name:<16} {' '.join(colors[r] for r in ROLES)}")
+        return
+
+    palette = args.palette
+    overrides = parse_colors(args.color)
+    if overrides:
+        if palette and palette not in PALETTES:
+            parser.error(f"Unknown palette: {palette} (available: {', '.join(PALETTES)})")
+        palette = {**(PALETTES[palette] if palette else {}), **overrides}
+
+    layout = {"padding": args.padding, "background": args.background, "radius": args.radius}
+    try:
+        output = render(args.preset, args.output, palette, args.size, layout, args.optimize)
+    except ValueError as e:
+        parser.error(str(e))
+    if output:
+        print(f"✅ Logo generated: {output}")
+
+
+if __name__ == "__main__":
+    with tracing("svg-logo-generator/logo_presets"):
+        main()
@@ -0,0 +1,943 @@
+#!/usr/bin/env python3
+"""
+Favicon Rasterizer
+纯 Python 光栅化：把 logo 导出为 16–512px 的 PNG 和多尺寸 favicon.ico，不依赖 cairo / Pillow
+
+支持本项目用到的图元子集：path（M/L/H/V/C/S/Q/T/A/Z）、rect（含圆角）、circle、ellipse、
+line、polyline、polygon、g、transform、线性渐变（objectBoundingBox / userSpaceOnUse）、
+fill / stroke / opacity、stroke-linecap / stroke-linejoin。
+filter（阴影）和 text 会被忽略；组的 opacity 直接乘到子元素上（子元素重叠处与浏览器略有差异）。
+
+渲染结果按 SVG 内容哈希缓存在 ~/.cache/svg-logo-generator/raster（SVG_LOGO_CACHE 可覆盖），
+未改动的 logo 不会重复光栅化；批量导出时未命中的尺寸交给进程池并行渲染。
+
+用法:
+    python3 rasterize.py logo.svg --out-dir icons
+    python3 rasterize.py variants/*.svg --out-dir icons --sizes 16,32,64 --ico-sizes 16,32
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import re
+import struct
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+from svg_engine import stage, tracing
+from svg_optimize import NUMBER, PATH_PARAMS, PATH_TOKEN, local_name
+
+DEFAULT_SIZES = (16, 32, 48, 64, 128, 180, 192, 256, 512)
+DEFAULT_ICO_SIZES = (16, 32, 48)
+DEFAULT_SUPERSAMPLE = 4
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "svg-logo-generator", "raster")
+# 曲线展平的最大弦高误差（设备像素）
+FLATNESS = 0.2
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+INHERITED = {"fill", "stroke", "stroke-width", "stroke-linecap", "stroke-linejoin", "stroke-miterlimit",
+             "fill-opacity", "stroke-opacity", "fill-rule", "visibility"}
+NAMED_COLORS = {
+    "black": (0, 0, 0), "white": (255, 255, 255), "red": (255, 0, 0), "green": (0, 128, 0),
+    "blue": (0, 0, 255), "gray": (128, 128, 128), "grey": (128, 128, 128), "yellow": (255, 255, 0),
+    "orange": (255, 165, 0), "purple": (128, 0, 128), "currentcolor": (0, 0, 0),
+}
+_TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+
+
+# ---------------------------------------------------------------- 几何与变换
+
+def multiply(m, n):
+    """m ∘ n（先应用 n 再应用 m），矩阵按 SVG 的 (a, b, c, d, e, f) 记法"""
+    a, b, c, d, e, f = m
+    A, B, C, D, E, F = n
+    return (a * A + c * B, b * A + d * B, a * C + c * D, b * C + d * D, a * E + c * F + e, b * E + d * F + f)
+
+
+def invert(m):
+    a, b, c, d, e, f = m
+    det = a * d - b * c
+    if det == 0:
+        return None
+    return (d / det, -b / det, -c / det, a / det, (c * f - d * e) / det, (b * e - a * f) / det)
+
+
+def apply(m, points):
+    a, b, c, d, e, f = m
+    return [(a * x + c * y + e, b * x + d * y + f) for x, y in points]
+
+
+def scale_of(m):
+    return math.sqrt(abs(m[0] * m[3] - m[1] * m[2])) or 1.0
+
+
+def parse_transform(value):
+    m = IDENTITY
+    for name, args in _TRANSFORM.findall(value or ""):
+        v = [float(n) for n in NUMBER.findall(args)]
+        if name == "matrix" and len(v) == 6:
+            t = tuple(v)
+        elif name == "translate":
+            t = (1, 0, 0, 1, v[0], v[1] if len(v) > 1 else 0)
+        elif name == "scale":
+            t = (v[0], 0, 0, v[1] if len(v) > 1 else v[0], 0, 0)
+        elif name == "rotate":
+            r = math.radians(v[0])
+            t = (math.cos(r), math.sin(r), -math.sin(r), math.cos(r), 0, 0)
+            if len(v) == 3:
+                t = multiply(multiply((1, 0, 0, 1, v[1], v[2]), t), (1, 0, 0, 1, -v[1], -v[2]))
+        elif name == "skewX":
+            t = (1, 0, math.tan(math.radians(v[0])), 1, 0, 0)
+        elif name == "skewY":
+            t = (1, math.tan(math.radians(v[0])), 0, 1, 0, 0)
+        else:
+            continue
+        m = multiply(m, t)
+    return m
+
+
+def segment_count(length_px, minimum=2, maximum=128):
+    return max(minimum, min(maximum, int(math.sqrt(max(length_px, 0.0) / FLATNESS) / 2) + 1))
+
+
+def ellipse_points(cx, cy, rx, ry, k, start=0.0, sweep=2 * math.pi):
+    """椭圆弧折线；k 为用户坐标到设备像素的缩放"""
+    r = max(rx, ry) * k
+    steps = 8 if r <= FLATNESS else int(abs(sweep) / (2 * math.acos(max(-1.0, 1 - FLATNESS / r)))) + 1
+    steps = max(4, min(256, steps))
+    return [(cx + rx * math.cos(start + sweep * i / steps), cy + ry * math.sin(start + sweep * i / steps))
+            for i in range(steps + 1)]
+
+
+def arc_points(x0, y0, rx, ry, rotation, large, sweep, x, y, k):
+    """SVG 端点参数化椭圆弧 -> 折线（不含起点）"""
+    if rx == 0 or ry == 0:
+        return [(x, y)]
+    rx, ry = abs(rx), abs(ry)
+    phi = math.radians(rotation)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (x0 - x) / 2, (y0 - y) / 2
+    x1 = cos_phi * dx + sin_phi * dy
+    y1 = -sin_phi * dx + cos_phi * dy
+    scale = x1 * x1 / (rx * rx) + y1 * y1 / (ry * ry)
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+    num = rx * rx * ry * ry - rx * rx * y1 * y1 - ry * ry * x1 * x1
+    den = rx * rx * y1 * y1 + ry * ry * x1 * x1
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large == sweep:
+        coef = -coef
+    cx1, cy1 = coef * rx * y1 / ry, -coef * ry * x1 / rx
+    cx = cos_phi * cx1 - sin_phi * cy1 + (x0 + x) / 2
+    cy = sin_phi * cx1 + cos_phi * cy1 + (y0 + y) / 2
+
+    def angle(ux, uy, vx, vy):
+        return math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+
+    start = angle(1, 0, (x1 - cx1) / rx, (y1 - cy1) / ry)
+    delta = angle((x1 - cx1) / rx, (y1 - cy1) / ry, (-x1 - cx1) / rx, (-y1 - cy1) / ry)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+
+    points = ellipse_points(0, 0, rx, ry, k, start, delta)[1:]
+    return [(cx + cos_phi * px - sin_phi * py, cy + sin_phi * px + cos_phi * py) for px, py in points] or [(x, y)]
+
+
+def cubic_points(p0, p1, p2, p3, k):
+    length = (math.dist(p0, p1) + math.dist(p1, p2) + math.dist(p2, p3)) * k
+    n = segment_count(length)
+    out = []
+    for i in range(1, n + 1):
+        t = i / n
+        u = 1 - t
+        out.append((u * u * u * p0[0] + 3 * u * u * t * p1[0] + 3 * u * t * t * p2[0] + t * t * t * p3[0],
+                    u * u * u * p0[1] + 3 * u * u * t * p1[1] + 3 * u * t * t * p2[1] + t * t * t * p3[1]))
+    return out
+
+
+def quadratic_points(p0, p1, p2, k):
+    c1 = (p0[0] + 2 / 3 * (p1[0] - p0[0]), p0[1] + 2 / 3 * (p1[1] - p0[1]))
+    c2 = (p2[0] + 2 / 3 * (p1[0] - p2[0]), p2[1] + 2 / 3 * (p1[1] - p2[1]))
+    return cubic_points(p0, c1, c2, p2, k)
+
+
+def flatten_path(d, k):
+    """path 数据 -> [(折线点列表, 是否闭合), ...]（用户坐标）"""
+    tokens = PATH_TOKEN.findall(d or "")
+    subpaths = []
+    points = []
+    x = y = start_x = start_y = 0.0
+    last_control = None
+    last_command = None
+    command = None
+    i = 0
+
+    def finish(closed):
+        nonlocal points
+        if len(points) > 1 or (points and closed):
+            subpaths.append((points, closed))
+        points = []
+
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+        if command is None:
+            break
+        upper = command.upper()
+        relative = command.islower()
+        if upper == "Z":
+            if points:
+                finish(True)
+            x, y = start_x, start_y
+            last_command, last_control = "Z", None
+            continue
+        count = PATH_PARAMS[upper]
+        args = tokens[i:i + count]
+        if len(args) < count or any(a.isalpha() for a in args):
+            break
+        args = [float(a) for a in args]
+        i += count
+        ox, oy = (x, y) if relative else (0.0, 0.0)
+
+        if upper == "M":
+            finish(False)
+            x, y = args[0] + ox, args[1] + oy
+            start_x, start_y = x, y
+            points = [(x, y)]
+            command = "l" if relative else "L"
+            last_control = None
+        else:
+            if not points:
+                points = [(x, y)]
+            if upper == "L":
+                x, y = args[0] + ox, args[1] + oy
+                points.append((x, y))
+                last_control = None
+            elif upper == "H":
+                x = args[0] + (x if relative else 0.0)
+                points.append((x, y))
+                last_control = None
+            elif upper == "V":
+                y = args[0] + (y if relative else 0.0)
+                points.append((x, y))
+                last_control = None
+            elif upper in "CS":
+                if upper == "C":
+                    c1 = (args[0] + ox, args[1] + oy)
+                    c2, end = (args[2] + ox, args[3] + oy), (args[4] + ox, args[5] + oy)
+                else:
+                    c1 = (2 * x - last_control[0], 2 * y - last_control[1]) \
+                        if last_command in "CS" and last_control else (x, y)
+                    c2, end = (args[0] + ox, args[1] + oy), (args[2] + ox, args[3] + oy)
+                points.extend(cubic_points((x, y), c1, c2, end, k))
+                last_control = c2
+                x, y = end
+            elif upper in "QT":
+                if upper == "Q":
+                    c, end = (args[0] + ox, args[1] + oy), (args[2] + ox, args[3] + oy)
+                else:
+                    c = (2 * x - last_control[0], 2 * y - last_control[1]) \
+                        if last_command in "QT" and last_control else (x, y)
+                    end = (args[0] + ox, args[1] + oy)
+                points.extend(quadratic_points((x, y), c, end, k))
+                last_control = c
+                x, y = end
+            elif upper == "A":
+                end_x, end_y = args[5] + ox, args[6] + oy
+                points.extend(arc_points(x, y, args[0], args[1], args[2], int(args[3]), int(args[4]),
+                                         end_x, end_y, k))
+                x, y = end_x, end_y
+                last_control = None
+        last_command = upper
+    finish(False)
+    return subpaths
+
+
+def num(elem, name, default=0.0, reference=None):
+    value = elem.get(name)
+    if value is None:
+        return default
+    value = value.strip()
+    if value.endswith("%"):
+        return float(value[:-1]) / 100 * (reference if reference is not None else 1.0)
+    match = NUMBER.match(value)
+    return float(match.group()) if match else default
+
+
+def shape_geometry(elem, tag, k):
+    """元素 -> [(点列表, 是否闭合), ...]（用户坐标）"""
+    if tag == "path":
+        return flatten_path(elem.get("d"), k)
+    if tag == "rect":
+        x, y, w, h = num(elem, "x"), num(elem, "y"), num(elem, "width"), num(elem, "height")
+        if w <= 0 or h <= 0:
+            return []
+        rx, ry = elem.get("rx"), elem.get("ry")
+        rx = num(elem, "rx") if rx is not None else (num(elem, "ry") if ry is not None else 0.0)
+        ry = num(elem, "ry") if ry is not None else rx
+        rx, ry = min(rx, w / 2), min(ry, h / 2)
+        if rx <= 0 or ry <= 0:
+            return [([(x, y), (x + w, y), (x + w, y + h), (x, y + h)], True)]
+        quarter = math.pi / 2
+        points = (ellipse_points(x + w - rx, y + ry, rx, ry, k, -quarter, quarter)
+                  + ellipse_points(x + w - rx, y + h - ry, rx, ry, k, 0, quarter)
+                  + ellipse_points(x + rx, y + h - ry, rx, ry, k, quarter, quarter)
+                  + ellipse_points(x + rx, y + ry, rx, ry, k, 2 * quarter, quarter))
+        return [(points, True)]
+    if tag == "circle":
+        r = num(elem, "r")
+        return [(ellipse_points(num(elem, "cx"), num(elem, "cy"), r, r, k)[:-1], True)] if r > 0 else []
+    if tag == "ellipse":
+        rx, ry = num(elem, "rx"), num(elem, "ry")
+        if rx <= 0 or ry <= 0:
+            return []
+        return [(ellipse_points(num(elem, "cx"), num(elem, "cy"), rx, ry, k)[:-1], True)]
+    if tag == "line":
+        return [([(num(elem, "x1"), num(elem, "y1")), (num(elem, "x2"), num(elem, "y2"))], False)]
+    if tag in ("polyline", "polygon"):
+        values = [float(v) for v in NUMBER.findall(elem.get("points") or "")]
+        points = list(zip(values[0::2], values[1::2]))
+        return [(points, tag == "polygon")] if len(points) > 1 else []
+    return []
+
+
+def oriented(polygon):
+    """统一为同一绕向，非零环绕规则下多个描边多边形才能正确求并"""
+    area = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(polygon, polygon[1:] + polygon[:1]))
+    return polygon if area >= 0 else polygon[::-1]
+
+
+def stroke_polygons(subpaths, width, cap, join, miter_limit, k):
+    """描边 -> 一组多边形（线段四边形 + 连接 + 端帽），按非零规则填充"""
+    h = width / 2
+    polygons = []
+
+    def disc(p):
+        polygons.append(oriented(ellipse_points(p[0], p[1], h, h, k)[:-1]))
+
+    for points, closed in subpaths:
+        pts = [p for i, p in enumerate(points) if i == 0 or p != points[i - 1]]
+        if closed and len(pts) > 1 and pts[0] == pts[-1]:
+            pts.pop()
+        if len(pts) == 1:
+            if cap == "round":
+                disc(pts[0])
+            elif cap == "square":
+                x, y = pts[0]
+                polygons.append([(x - h, y - h), (x + h, y - h), (x + h, y + h), (x - h, y + h)])
+            continue
+
+        segments = list(zip(pts, pts[1:] + (pts[:1] if closed else [])))
+        normals = []
+        for (x0, y0), (x1, y1) in segments:
+            length = math.hypot(x1 - x0, y1 - y0)
+            nx, ny = -(y1 - y0) / length * h, (x1 - x0) / length * h
+            normals.append((nx, ny))
+            polygons.append(oriented([(x0 + nx, y0 + ny), (x1 + nx, y1 + ny), (x1 - nx, y1 - ny), (x0 - nx, y0 - ny)]))
+
+        joins = range(len(segments)) if closed else range(1, len(segments))
+        for j in joins:
+            q = segments[j][0]
+            na, nb = normals[j - 1], normals[j]
+            if join == "round":
+                disc(q)
+                continue
+            bx, by = segments[j][1][0] - q[0], segments[j][1][1] - q[1]
+            side = 1 if na[0] * bx + na[1] * by < 0 else -1
+            a = (q[0] + side * na[0], q[1] + side * na[1])
+            b = (q[0] + side * nb[0], q[1] + side * nb[1])
+            cos_phi = (na[0] * nb[0] + na[1] * nb[1]) / (h * h)
+            if join not in ("bevel",) and cos_phi > -0.999 and 2 / math.sqrt(2 * (1 + cos_phi)) <= miter_limit:
+                mx = q[0] + side * (na[0] + nb[0]) / (1 + cos_phi)
+                my = q[1] + side * (na[1] + nb[1]) / (1 + cos_phi)
+                polygons.append(oriented([q, a, (mx, my), b]))
+            else:
+                polygons.append(oriented([q, a, b]))
+
+        if not closed:
+            for p, (nx, ny), direction in ((pts[0], normals[0], -1), (pts[-1], normals[-1], 1)):
+                if cap == "round":
+                    disc(p)
+                elif cap == "square":
+                    dx, dy = ny * direction, -nx * direction
+                    polygons.append(oriented([(p[0] + nx, p[1] + ny), (p[0] + nx + dx, p[1] + ny + dy),
+                                              (p[0] - nx + dx, p[1] - ny + dy), (p[0] - nx, p[1] - ny)]))
+    return polygons
+
+
+# ---------------------------------------------------------------- 颜色与渐变
+
+def parse_color(value):
+    """-> (r, g, b) 0..1，none/transparent 返回 None"""
+    if value is None:
+        return None
+    value = value.strip()
+    lower = value.lower()
+    if lower in ("none", "transparent"):
+        return None
+    if lower.startswith("#"):
+        digits = lower[1:]
+        if len(digits) in (3, 4):
+            digits = "".join(ch * 2 for ch in digits[:3])
+        try:
+            return tuple(int(digits[i:i + 2], 16) / 255 for i in (0, 2, 4))
+        except ValueError:
+            return None
+    if lower.startswith("rgb"):
+        parts = NUMBER.findall(lower)
+        if len(parts) >= 3:
+            scale = 100 if "%" in lower else 255
+            return tuple(min(1.0, float(p) / scale) for p in parts[:3])
+    rgb = NAMED_COLORS.get(lower)
+    return tuple(v / 255 for v in rgb) if rgb else (0.0, 0.0, 0.0)
+
+
+def style_props(elem):
+    props = dict(elem.attrib)
+    for declaration in (elem.get("style") or "").split(";"):
+        name, sep, value = declaration.partition(":")
+        if sep:
+            props[name.strip()] = value.strip()
+    return props
+
+
+def opacity_value(value, default=1.0):
+    try:
+        return max(0.0, min(1.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+class Gradient:
+    """线性渐变：t 是设备坐标的仿射函数，颜色查 256 级色表"""
+
+    __slots__ = ("x1", "y1", "x2", "y2", "units", "transform", "lut", "solid")
+
+    def __init__(self, elem, ids):
+        chain = [elem]
+        while True:
+            href = chain[-1].get("href") or chain[-1].get("{http://www.w3.org/1999/xlink}href")
+            target = ids.get(href[1:]) if href and href.startswith("#") else None
+            if target is None or target in chain:
+                break
+            chain.append(target)
+
+        def inherited(name, default):
+            for e in chain:
+                if e.get(name) is not None:
+                    return e.get(name)
+            return default
+
+        self.units = inherited("gradientUnits", "objectBoundingBox")
+        self.transform = parse_transform(inherited("gradientTransform", ""))
+        holder = ET.Element("g", {n: inherited(n, d) for n, d in
+                                  (("x1", "0%"), ("y1", "0%"), ("x2", "100%"), ("y2", "0%"))})
+        self.x1, self.y1, self.x2, self.y2 = (num(holder, n) for n in ("x1", "y1", "x2", "y2"))
+
+        stops = []
+        for stop in next((e for e in chain if any(local_name(c.tag) == "stop" for c in e)), elem):
+            if local_name(stop.tag) != "stop":
+                continue
+            props = style_props(stop)
+            offset = num(stop, "offset")
+            offset = max(stops[-1][0] if stops else 0.0, min(1.0, max(0.0, offset)))
+            color = parse_color(props.get("stop-color", "black")) or (0.0, 0.0, 0.0)
+            alpha = 0.0 if parse_color(props.get("stop-color", "black")) is None else 1.0
+            stops.append((offset, color, alpha * opacity_value(props.get("stop-opacity"))))
+        self.solid = None
+        if not stops:
+            self.solid = ((0.0, 0.0, 0.0), 0.0)
+            self.lut = []
+        elif len(stops) == 1:
+            self.solid = (stops[0][1], stops[0][2])
+            self.lut = []
+        else:
+            self.lut = [self._color_at(i / 255, stops) for i in range(256)]
+
+    @staticmethod
+    def _color_at(t, stops):
+        if t <= stops[0][0]:
+            return stops[0][1] + (stops[0][2],)
+        for (o0, c0, a0), (o1, c1, a1) in zip(stops, stops[1:]):
+            if t <= o1:
+                f = (t - o0) / (o1 - o0) if o1 > o0 else 1.0
+                return tuple(c0[i] + (c1[i] - c0[i]) * f for i in range(3)) + (a0 + (a1 - a0) * f,)
+        return stops[-1][1] + (stops[-1][2],)
+
+    def paint(self, ctm, bbox):
+        """返回 (A, B, C, lut)，使 t = A*X + B*Y + C（X、Y 为设备像素中心）"""
+        m = ctm
+        if self.units != "userSpaceOnUse":
+            x0, y0, x1, y1 = bbox
+            m = multiply(m, (x1 - x0 or 1.0, 0, 0, y1 - y0 or 1.0, x0, y0))
+        m = multiply(m, self.transform)
+        inverse = invert(m)
+        vx, vy = self.x2 - self.x1, self.y2 - self.y1
+        length2 = vx * vx + vy * vy
+        if inverse is None or length2 == 0:
+            return None
+        a, b, c, d, e, f = inverse
+        return ((a * vx + b * vy) / length2, (c * vx + d * vy) / length2,
+                ((e - self.x1) * vx + (f - self.y1) * vy) / length2, self.lut)
+
+
+# ---------------------------------------------------------------- 扫描线光栅化
+
+class Canvas:
+    """预乘 alpha 的浮点 RGBA 画布，逐行存储"""
+
+    __slots__ = ("width", "height", "supersample", "rows")
+
+    def __init__(self, width, height, supersample=DEFAULT_SUPERSAMPLE):
+        self.width = width
+        self.height = height
+        self.supersample = supersample
+        self.rows = [[0.0] * (width * 4) for _ in range(height)]
+
+    def fill(self, polygons, paint, opacity, evenodd=False):
+        """polygons 为设备坐标；paint 为 (r, g, b, a) 或 Gradient.paint() 的结果"""
+        edges = []
+        for polygon in polygons:
+            for (x0, y0), (x1, y1) in zip(polygon, polygon[1:] + polygon[:1]):
+                if y0 == y1:
+                    continue
+                direction = 1
+                if y0 > y1:
+                    x0, y0, x1, y1 = x1, y1, x0, y0
+                    direction = -1
+                edges.append((y0, y1, x0, (x1 - x0) / (y1 - y0), direction))
+        if not edges:
+            return
+
+        xs_all = [x for polygon in polygons for x, _ in polygon]
+        left = max(0, int(math.floor(min(xs_all))))
+        right = min(self.width, int(math.ceil(max(xs_all))) + 1)
+        top = max(0, int(math.floor(min(e[0] for e in edges))))
+        bottom = min(self.height, int(math.ceil(max(e[1] for e in edges))))
+        if left >= right or top >= bottom:
+            return
+
+        edges.sort()
+        span_width = right - left
+        weight = 1.0 / self.supersample
+        offsets = [(s + 0.5) / self.supersample for s in range(self.supersample)]
+        gradient = len(paint) == 4 and isinstance(paint[3], list)
+        if not gradient:
+            pr, pg, pb, pa = paint
+            pa *= opacity
+        next_edge = 0
+        active = []
+
+        for py in range(top, bottom):
+            while next_edge < len(edges) and edges[next_edge][0] < py + 1:
+                active.append(edges[next_edge])
+                next_edge += 1
+            active = [e for e in active if e[1] > py]
+            if not active:
+                continue
+
+            diff = [0.0] * (span_width + 2)
+            touched = False
+            for offset in offsets:
+                sy = py + offset
+                crossings = sorted((x0 + (sy - y0) * slope, direction)
+                                   for y0, y1, x0, slope, direction in active if y0 <= sy < y1)
+                winding = 0
+                start = None
+                for x, direction in crossings:
+                    before = winding
+                    winding += direction
+                    inside_before = (before & 1) if evenodd else before != 0
+                    inside_after = (winding & 1) if evenodd else winding != 0
+                    if not inside_before and inside_after:
+                        start = x
+                    elif inside_before and not inside_after:
+                        a = min(max(start - left, 0.0), span_width)
+                        b = min(max(x - left, 0.0), span_width)
+                        if b <= a:
+                            continue
+                        touched = True
+                        ia, ib = int(a), int(b)
+                        if ia == ib:
+                            diff[ia] += (b - a) * weight
+                            diff[ia + 1] -= (b - a) * weight
+                        else:
+                            diff[ia] += (ia + 1 - a) * weight
+                            diff[ia + 1] -= (ia + 1 - a) * weight - weight
+                            diff[ib] += (b - ib) * weight - weight
+                            diff[ib + 1] -= (b - ib) * weight
+            if not touched:
+                continue
+
+            row = self.rows[py]
+            coverage = list(accumulate(diff))
+            if gradient:
+                ga, gb, gc, lut = paint
+                t_row = gb * (py + 0.5) + gc
+            for i in range(span_width):
+                c = coverage[i]
+                if c <= 0.001:
+                    continue
+                if c > 1.0:
+                    c = 1.0
+                if gradient:
+                    t = ga * (left + i + 0.5) + t_row
+                    pr, pg, pb, pa = lut[0 if t <= 0 else 255 if t >= 1 else int(t * 255 + 0.5)]
+                    alpha = c * pa * opacity
+                else:
+                    alpha = c * pa
+                if alpha <= 0.0:
+                    continue
+                k = (left + i) * 4
+                keep = 1.0 - alpha
+                row[k] = pr * alpha + row[k] * keep
+                row[k + 1] = pg * alpha + row[k + 1] * keep
+                row[k + 2] = pb * alpha + row[k + 2] * keep
+                row[k + 3] = alpha + row[k + 3] * keep
+
+    def to_rgba(self):
+        """预乘浮点 -> 非预乘 8 位 RGBA；空行直接跳过"""
+        out = bytearray(self.width * self.height * 4)
+        stride = self.width * 4
+        for y, row in enumerate(self.rows):
+            base = y * stride
+            for i, a in enumerate(row[3::4]):
+                if a <= 0.0:
+                    continue
+                k = i * 4
+                scale = 255.0 / a
+                r = int(row[k] * scale + 0.5)
+                g = int(row[k + 1] * scale + 0.5)
+                b = int(row[k + 2] * scale + 0.5)
+                o = base + k
+                out[o] = r if r < 255 else 255
+                out[o + 1] = g if g < 255 else 255
+                out[o + 2] = b if b < 255 else 255
+                out[o + 3] = int(a * 255 + 0.5)
+        return bytes(out)
+
+
+class Renderer:
+    SHAPES = {"path", "rect", "circle", "ellipse", "line", "polyline", "polygon"}
+    SKIPPED = {"defs", "clipPath", "mask", "pattern", "symbol", "marker", "filter", "linearGradient",
+               "radialGradient", "title", "desc", "metadata", "style"}
+
+    def __init__(self, root, size, supersample=DEFAULT_SUPERSAMPLE):
+        self.root = root
+        self.ids = {e.get("id"): e for e in root.iter() if e.get("id") is not None}
+        self.gradients = {}
+        self.warnings = set()
+        self.canvas = Canvas(size, size, supersample)
+
+        view_box = [float(v) for v in NUMBER.findall(root.get("viewBox") or "")]
+        if len(view_box) != 4 or view_box[2] <= 0 or view_box[3] <= 0:
+            view_box = [0.0, 0.0, num(root, "width", size), num(root, "height", size)]
+        vx, vy, vw, vh = view_box
+        s = min(size / vw, size / vh)
+        self.base = (s, 0.0, 0.0, s, (size - vw * s) / 2 - vx * s, (size - vh * s) / 2 - vy * s)
+
+    def render(self):
+        self.visit(self.root, self.base, {"fill": "black"}, 1.0)
+        return self.canvas
+
+    def visit(self, elem, ctm, inherited, opacity):
+        for child in elem:
+            if not isinstance(child.tag, str):  # 注释、处理指令
+                continue
+            tag = local_name(child.tag)
+            if tag in self.SKIPPED:
+                continue
+            props = style_props(child)
+            if props.get("display") == "none":
+                continue
+            state = dict(inherited)
+            state.update((k, v) for k, v in props.items() if k in INHERITED)
+            child_ctm = multiply(ctm, parse_transform(child.get("transform"))) if child.get("transform") else ctm
+            child_opacity = opacity * opacity_value(props.get("opacity"))
+            if child_opacity <= 0:
+                continue
+            if props.get("filter"):
+                self.warnings.add("filter effects are ignored")
+
+            if tag in ("g", "svg", "a"):
+                self.visit(child, child_ctm, state, child_opacity)
+            elif tag in self.SHAPES:
+                if state.get("visibility") != "hidden":
+                    self.draw(child, tag, child_ctm, state, child_opacity)
+            elif tag == "text":
+                self.warnings.add("text is not rasterized")
+            elif tag == "use":
+                target = self.ids.get((child.get("href") or child.get("{http://www.w3.org/1999/xlink}href") or "#")[1:])
+                if target is not None:
+                    offset = multiply(child_ctm, (1, 0, 0, 1, num(child, "x"), num(child, "y")))
+                    holder = ET.Element("g")
+                    holder.append(target)
+                    self.visit(holder, offset, state, child_opacity)
+
+    def resolve_paint(self, value, opacity, ctm, bbox):
+        """-> (r, g, b, a)、渐变 (A, B, C, lut, opacity) 或 None（不绘制）"""
+        if value is None:
+            return None
+        value = value.strip()
+        if not value.startswith("url("):
+            color = parse_color(value)
+            return color + (opacity,) if color is not None else None
+
+        ref = value[4:value.index(")")].strip("'\" #")
+        target = self.ids.get(ref)
+        if target is None or local_name(target.tag) not in ("linearGradient", "radialGradient"):
+            return None
+        if ref not in self.gradients:
+            self.gradients[ref] = Gradient(target, self.ids)
+        gradient = self.gradients[ref]
+        if gradient.solid is not None:
+            color, alpha = gradient.solid
+            return color + (alpha * opacity,)
+
+        paint = gradient.paint(ctm, bbox) if local_name(target.tag) == "linearGradient" else None
+        if paint is None:
+            if local_name(target.tag) == "radialGradient":
+                self.warnings.add("radial gradients are drawn with their middle color")
+            r, g, b, a = gradient.lut[128]
+            return (r, g, b, a * opacity)
+        return paint + (opacity,)
+
+    def draw(self, elem, tag, ctm, state, opacity):
+        k = scale_of(ctm)
+        subpaths = shape_geometry(elem, tag, k)
+        if not subpaths:
+            return
+        xs = [x for points, _ in subpaths for x, _ in points]
+        ys = [y for points, _ in subpaths for _, y in points]
+        bbox = (min(xs), min(ys), max(xs), max(ys))
+
+        if tag not in ("line", "polyline"):
+            paint = self.resolve_paint(state.get("fill"), opacity_value(state.get("fill-opacity")), ctm, bbox)
+            if paint is not None:
+                polygons = [apply(ctm, points) for points, _ in subpaths if len(points) > 2]
+                self._fill(polygons, paint, opacity, state.get("fill-rule") == "evenodd")
+
+        paint = self.resolve_paint(state.get("stroke"), opacity_value(state.get("stroke-opacity")), ctm, bbox)
+        width = num(ET.Element("g", {"w": state.get("stroke-width", "1")}), "w", 1.0)
+        if paint is not None and width > 0:
+            polygons = stroke_polygons(subpaths, width, state.get("stroke-linecap", "butt"),
+                                       state.get("stroke-linejoin", "miter"),
+                                       float(state.get("stroke-miterlimit", 4)), k)
+            self._fill([apply(ctm, p) for p in polygons], paint, opacity, False)
+
+    def _fill(self, polygons, paint, opacity, evenodd):
+        if len(paint) == 5:  # 渐变：(A, B, C, lut, 填充透明度)
+            self.canvas.fill(polygons, paint[:4], opacity * paint[4], evenodd)
+        else:
+            r, g, b, a = paint
+            self.canvas.fill(polygons, (r, g, b, a), opacity, evenodd)
+
+
+def render_rgba(svg, size, supersample=DEFAULT_SUPERSAMPLE):
+    """SVG 文本 -> (RGBA bytes, 警告列表)"""
+    renderer = Renderer(ET.fromstring(svg), size, supersample)
+    return renderer.render().to_rgba(), sorted(renderer.warnings)
+
+
+# ---------------------------------------------------------------- PNG / ICO 编码
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def encode_png(width, height, rgba):
+    stride = width * 4
+    raw = b"".join(b"\x00" + rgba[y * stride:(y + 1) * stride] for y in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+            + png_chunk(b"IDAT", zlib.compress(raw, 9))
+            + png_chunk(b"IEND", b""))
+
+
+def encode_ico(images):
+    """images: [(size, png bytes), ...]；ICO 内直接嵌入 PNG（Windows Vista 起支持）"""
+    header = struct.pack("<HHH", 0, 1, len(images))
+    offset = len(header) + 16 * len(images)
+    entries = b""
+    for size, png in images:
+        dim = 0 if size >= 256 else size
+        entries += struct.pack("<BBBBHHII", dim, dim, 0, 0, 1, 32, len(png), offset)
+        offset += len(png)
+    return header + entries + b"".join(png for _, png in images)
+
+
+def render_png(svg, size, supersample=DEFAULT_SUPERSAMPLE):
+    rgba, warnings = render_rgba(svg, size, supersample)
+    return encode_png(size, size, rgba), warnings
+
+
+# ---------------------------------------------------------------- 缓存与批量导出
+
+def renderer_version():
+    """光栅器及其路径解析（svg_optimize.py）源码的哈希，任一改动都让缓存失效"""
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ("rasterize.py", "svg_optimize.py"):
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+class RasterCache:
+    """按 (光栅器版本, SVG 内容, 尺寸, 超采样) 哈希缓存 PNG"""
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SVG_LOGO_CACHE") or DEFAULT_CACHE_DIR
+        os.makedirs(self.path, exist_ok=True)
+        self.version = renderer_version()
+
+    def key(self, svg, size, supersample):
+        digest = hashlib.sha256(f"{self.version}:{size}:{supersample}:".encode())
+        digest.update(svg.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        try:
+            with open(os.path.join(self.path, key + ".png"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, png):
+        target = os.path.join(self.path, key + ".png")
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, target)
+
+
+def _render_job(job):
+    svg, size, supersample = job
+    return render_png(svg, size, supersample)
+
+
+def export_icons(svg_paths, out_dir, sizes=DEFAULT_SIZES, ico_sizes=DEFAULT_ICO_SIZES,
+                 supersample=DEFAULT_SUPERSAMPLE, workers=None, cache=None):
+    """为每个 SVG 导出 icon-<size>.png 和 favicon.ico；返回统计信息"""
+    started = time.perf_counter()
+    sources = {}
+    for path in svg_paths:
+        with open(path, encoding="utf-8") as f:
+            sources[path] = f.read()
+
+    needed = sorted(set(sizes) | set(ico_sizes))
+    pngs = {}
+    pending = []
+    with stage("cache-lookup"):
+        for path, svg in sources.items():
+            for size in needed:
+                key = cache.key(svg, size, supersample) if cache else None
+                png = cache.get(key) if cache else None
+                if png is not None:
+                    pngs[path, size] = png
+                else:
+                    pending.append((path, size, key))
+
+    warnings = {}
+    jobs = [(sources[path], size, supersample) for path, size, _ in pending]
+    with stage("render"):
+        if len(jobs) > 1 and workers != 1:
+            # 大尺寸最慢，先提交以平衡各进程的负载
+            order = sorted(range(len(jobs)), key=lambda i: -jobs[i][1])
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = dict(zip(order, pool.map(_render_job, [jobs[i] for i in order])))
+            results = [results[i] for i in range(len(jobs))]
+        else:
+            results = [_render_job(job) for job in jobs]
+
+    for (path, size, key), (png, job_warnings) in zip(pending, results):
+        pngs[path, size] = png
+        if cache:
+            cache.put(key, png)
+        if job_warnings:
+            warnings.setdefault(path, set()).update(job_warnings)
+
+    single = len(sources) == 1
+    names = {} if single else output_names(list(sources))
+    for path in sources:
+        target = out_dir if single else os.path.join(out_dir, names[path])
+        os.makedirs(target, exist_ok=True)
+        for size in sizes:
+            with open(os.path.join(target, f"icon-{size}.png"), "wb") as f:
+                f.write(pngs[path, size])
+        if ico_sizes:
+            with open(os.path.join(target, "favicon.ico"), "wb") as f:
+                f.write(encode_ico([(size, pngs[path, size]) for size in sorted(ico_sizes)]))
+
+    elapsed = time.perf_counter() - started
+    return {
+        "files": len(sources),
+        "images": len(sources) * len(needed),
+        "rendered": len(pending),
+        "cached": len(sources) * len(needed) - len(pending),
+        "elapsed_seconds": round(elapsed, 3),
+        "warnings": {path: sorted(w) for path, w in warnings.items()},
+        # 文件名重复、改用其他子目录名的输入
+        "renamed": {path: name for path, name in names.items()
+                    if name != os.path.splitext(os.path.basename(path))[0]},
+    }
+
+
+def output_names(paths):
+    """每个输入的输出子目录名：文件名去掉扩展名；重名时加上所在目录名（a/logo.svg → a-logo），仍重名再加序号"""
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    repeated = {stem for stem in stems if stems.count(stem) > 1}
+    names, used = {}, set()
+    for path, stem in zip(paths, stems):
+        name = stem
+        if stem in repeated:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            name = f"{parent}-{stem}" if parent else stem
+        candidate, n = name, 2
+        while candidate in used:
+            candidate = f"{name}-{n}"
+            n += 1
+        used.add(candidate)
+        names[path] = candidate
+    return names
+
+
+def parse_sizes(value):
+    return [int(v) for v in value.split(",") if v.strip()] if value else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rasterize SVG logos to PNG icons and a multi-size favicon.ico")
+    parser.add_argument("files", nargs="+", help="SVG files to rasterize.")
+    parser.add_argument("--out-dir", default="icons", help="Output directory (one subdirectory per input when several).")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated PNG sizes.")
+    parser.add_argument("--ico-sizes", default=",".join(map(str, DEFAULT_ICO_SIZES)),
+                        help="Comma-separated sizes embedded in favicon.ico ('' to skip).")
+    parser.add_argument("--supersample", type=int, default=DEFAULT_SUPERSAMPLE, help="Vertical samples per pixel row.")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count, 1 disables the pool).")
+    parser.add_argument("--no-cache", action="store_true", help="Render every size even if it is cached.")
+
+    args = parser.parse_args()
+    cache = None if args.no_cache else RasterCache()
+    stats = export_icons(args.files, args.out_dir, parse_sizes(args.sizes), parse_sizes(args.ico_sizes),
+                         args.supersample, args.workers, cache)
+
+    print(f"✅ {stats['files']} logos → {stats['images']} images in {args.out_dir} "
+          f"({stats['rendered']} rendered, {stats['cached']} cached, {stats['elapsed_seconds']}s)")
+    for path, name in stats["renamed"].items():
+        print(f"   {path} → {os.path.join(args.out_dir, name)} (duplicate file name)")
+    for path, warnings in stats["warnings"].items():
+        print(f"⚠️  {path}: {'; '.join(warnings)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    with tracing("svg-logo-generator/rasterize"):
+        main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+SVG Scene Engine
+轻量 SVG 场景引擎：图形是带 __slots__ 的元素对象，序列化为一次流式写出
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "skill-profiler", "scripts"))
+try:
+    from skilltrace import stage, tracing
+except ImportError:
+    from contextlib import nullcontext as stage, nullcontext as tracing
+
+SVG_NS = "http://www.w3.org/2000/svg"
+DESIGN_SIZE = 512
+
+_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"))
+
+
+def fmt(value):
+    """数值去掉多余的小数位，序列/元组按空格拼接（用于 points 等属性）"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        return f"{value:.3f}".rstrip("0").rstrip(".")
+    if isinstance(value, (list, tuple)):
+        return " ".join(fmt(v) for v in value)
+    return str(value)
+
+
+def escape(text):
+    for raw, entity in _ESCAPES:
+        text = text.replace(raw, entity)
+    return text
+
+
+def attr_name(key):
+    """stroke_width -> stroke-width；class_ -> class"""
+    return key.rstrip("_").replace("_", "-")
+
+
+class Element:
+    """SVG 元素：标签名、属性、子元素和可选文本"""
+
+    __slots__ = ("tag", "attrs", "children", "text")
+
+    def __init__(self, tag, attrs=None, children=None, text=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = children or []
+        self.text = text
+
+    def add(self, *children):
+        self.children.extend(c for c in children if c is not None)
+        return self
+
+    def set(self, **attrs):
+        self.attrs.update((attr_name(k), v) for k, v in attrs.items() if v is not None)
+        return self
+
+    def iter_chunks(self, depth=0, indent="  "):
+        """逐段产出 SVG 文本，不在内存中拼接整个文档"""
+        pad = indent * depth if indent else ""
+        newline = "\n" if indent is not None else ""
+        head = pad + "<" + self.tag + "".join(
+            f' {k}="{escape(fmt(v))}"' for k, v in self.attrs.items())
+
+        if not self.children and self.text is None:
+            yield head + " />" + newline
+            return
+        if not self.children:
+            yield head + ">" + escape(str(self.text)) + "</" + self.tag + ">" + newline
+            return
+
+        yield head + ">" + newline
+        if self.text is not None:
+            yield pad + (indent or "") + escape(str(self.text)) + newline
+        for child in self.children:
+            yield from child.iter_chunks(depth + 1, indent)
+        yield pad + "</" + self.tag + ">" + newline
+
+
+def element(tag, *children, text=None, **attrs):
+    return Element(tag, children=[c for c in children if c is not None], text=text).set(**attrs)
+
+
+def circle(cx, cy, r, **attrs):
+    return element("circle", cx=cx, cy=cy, r=r, **attrs)
+
+
+def rect(x, y, width, height, **attrs):
+    return element("rect", x=x, y=y, width=width, height=height, **attrs)
+
+
+def line(x1, y1, x2, y2, **attrs):
+    return element("line", x1=x1, y1=y1, x2=x2, y2=y2, **attrs)
+
+
+def path(d, **attrs):
+    return element("path", d=d, **attrs)
+
+
+def polygon(points, **attrs):
+    return element("polygon", points=points, **attrs)
+
+
+def text(content, x, y, **attrs):
+    return element("text", text=content, x=x, y=y, **attrs)
+
+
+def group(*children, **attrs):
+    return element("g", *children, **attrs)
+
+
+def linear_gradient(id, stops, x1="0%", y1="0%", x2="100%", y2="100%"):
+    """stops: [(offset, color) 或 (offset, color, opacity), ...]"""
+    return element("linearGradient", *[
+        element("stop", offset=stop[0], stop_color=stop[1],
+                stop_opacity=stop[2] if len(stop) > 2 else 1)
+        for stop in stops
+    ], id=id, x1=x1, y1=y1, x2=x2, y2=y2)
+
+
+def drop_shadow(id, dx, dy, blur, color, opacity, margin="20%"):
+    start = f"-{margin}"
+    extent = f"{100 + 2 * int(margin.rstrip('%'))}%"
+    return element("filter", element("feDropShadow", dx=dx, dy=dy, stdDeviation=blur,
+                                     flood_color=color, flood_opacity=opacity),
+                   id=id, x=start, y=start, width=extent, height=extent)
+
+
+class Scene:
+    """一个 SVG 文档：viewBox 固定为设计坐标，size 只决定输出的 width/height"""
+
+    __slots__ = ("view_width", "view_height", "size", "defs", "body")
+
+    def __init__(self, view_width=DESIGN_SIZE, view_height=DESIGN_SIZE, size=None):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.size = size
+        self.defs = []
+        self.body = []
+
+    def define(self, definition):
+        """加入 <defs>，返回可直接用于 fill/stroke/filter 的 url(#id)"""
+        self.defs.append(definition)
+        return f"url(#{definition.attrs['id']})"
+
+    def add(self, *elements):
+        self.body.extend(e for e in elements if e is not None)
+        return self
+
+    def root(self):
+        attrs = {"viewBox": (0, 0, self.view_width, self.view_height), "xmlns": SVG_NS}
+        if self.size is not None:
+            width, height = self.size if isinstance(self.size, (list, tuple)) else (self.size, self.size)
+            attrs["width"] = width
+            attrs["height"] = height
+        children = ([Element("defs", children=self.defs)] if self.defs else []) + self.body
+        return Element("svg", attrs, children)
+
+    def iter_chunks(self, indent="  "):
+        yield from self.root().iter_chunks(0, indent)
+
+    def to_string(self, indent="  "):
+        return "".join(self.iter_chunks(indent))
+
+    def write(self, output="logo.svg", indent="  "):
+        """流式写出到路径、已打开的文件对象或 "-"（stdout）；返回写出的路径"""
+        if output is None or output == "-":
+            sys.stdout.writelines(self.iter_chunks(indent))
+            return None
+        if hasattr(output, "write"):
+            output.writelines(self.iter_chunks(indent))
+            return getattr(output, "name", None)
+
+        directory = os.path.dirname(os.path.abspath(output))
+        os.makedirs(directory, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            f.writelines(self.iter_chunks(indent))
+        return output
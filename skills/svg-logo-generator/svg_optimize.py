@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+SVG Optimizer
+压缩生成的 logo：去注释和缩进、删除未引用的 defs、合并相同的渐变、
+缩短 path 数据和数值，并报告每个文件节省的字节数
+
+用法:
+    python3 svg_optimize.py logo.svg                  # 写出 logo.min.svg
+    python3 svg_optimize.py variants/*.svg --in-place
+    python3 svg_optimize.py logo.svg --out-dir dist --precision 1
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import string
+import xml.etree.ElementTree as ET
+
+from svg_engine import stage, tracing
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+DEFAULT_PRECISION = 2
+
+SHAPES = {"rect", "circle", "ellipse", "line", "path", "polygon", "polyline"}
+TEXT_ELEMENTS = {"text", "tspan", "textPath", "title", "desc", "style"}
+# 这些容器里的图形不直接绘制（裁剪、遮罩、图案等），不做可见性判断
+NON_RENDERED = {"defs", "clipPath", "mask", "pattern", "symbol", "marker"}
+GRADIENTS = {"linearGradient", "radialGradient"}
+# <defs> 中即使没有被引用也会生效的元素
+KEEP_IN_DEFS = {"style", "script"}
+
+NUMERIC_ATTRS = {
+    "x", "y", "x1", "y1", "x2", "y2", "cx", "cy", "r", "rx", "ry", "fx", "fy", "width", "height",
+    "dx", "dy", "opacity", "fill-opacity", "stroke-opacity", "stop-opacity", "flood-opacity",
+    "stroke-width", "stroke-miterlimit", "stdDeviation", "font-size", "offset",
+}
+LIST_ATTRS = {"viewBox", "points", "stroke-dasharray"}
+COLOR_ATTRS = {"fill", "stroke", "stop-color", "flood-color", "color"}
+PRESENTATION_PROPS = {
+    "fill", "fill-opacity", "fill-rule", "stroke", "stroke-width", "stroke-opacity", "stroke-linecap",
+    "stroke-linejoin", "stroke-miterlimit", "stroke-dasharray", "opacity", "stop-color", "stop-opacity",
+    "flood-color", "flood-opacity", "font-family", "font-size", "font-weight", "text-anchor", "display",
+    "visibility",
+}
+# 非继承属性的默认值可以直接删除（继承属性删掉会改变继承结果）
+REMOVABLE_DEFAULTS = {
+    "*": {"opacity": "1"},
+    "stop": {"stop-opacity": "1"},
+    "linearGradient": {"x1": "0%", "y1": "0%", "x2": "100%", "y2": "0%"},
+}
+
+PATH_PARAMS = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4, "T": 2, "A": 7, "Z": 0}
+PATH_TOKEN = re.compile(r"[MmLlHhVvCcSsQqTtAaZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_HEX_COLOR = re.compile(r"#([0-9a-fA-F])\1([0-9a-fA-F])\2([0-9a-fA-F])\3")
+_URL_REF = re.compile(r"url\(\s*['\"]?#([^)'\"\s]+)['\"]?\s*\)")
+
+
+def local_name(tag):
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else tag
+
+
+def namespace(tag):
+    return tag[1:].split("}", 1)[0] if isinstance(tag, str) and tag.startswith("{") else None
+
+
+def fmt_number(value, precision=DEFAULT_PRECISION):
+    """最短的数值写法：去尾零、去前导零（0.5 -> .5，-0.5 -> -.5）"""
+    text = f"{round(value, precision):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        text = "0"
+    if text.startswith("0."):
+        text = text[1:]
+    elif text.startswith("-0."):
+        text = "-" + text[2:]
+    return text
+
+
+def join_numbers(numbers, previous=None):
+    """拼接数值，只在必要处加空格（负号和第二个小数点本身就是分隔符）"""
+    out = []
+    for number in numbers:
+        if previous is not None and not (number.startswith("-") or
+                                         (number.startswith(".") and "." in previous and "e" not in previous)):
+            out.append(" ")
+        out.append(number)
+        previous = number
+    return "".join(out)
+
+
+def parse_path(d):
+    """解析为 [(命令大写, 是否相对, [参数...]), ...]；格式异常时抛出 ValueError"""
+    tokens = PATH_TOKEN.findall(d)
+    if re.sub(r"[\s,]+", "", d) != "".join(tokens):
+        raise ValueError(f"Unsupported path data: {d[:40]}")
+    segments = []
+    command = None
+    i = 0
+    while i < len(tokens):
+        if tokens[i].isalpha():
+            command = tokens[i]
+            i += 1
+            if command in "Zz":
+                segments.append(("Z", False, []))
+                continue
+        elif command is None or command in "Zz":
+            raise ValueError(f"Path data without command: {d[:40]}")
+        count = PATH_PARAMS[command.upper()]
+        args = tokens[i:i + count]
+        if len(args) < count or any(a.isalpha() for a in args):
+            raise ValueError(f"Truncated path segment: {d[:40]}")
+        segments.append((command.upper(), command.islower(), [float(a) for a in args]))
+        i += count
+        if command in "Mm":
+            command = "l" if command == "m" else "L"
+    return segments
+
+
+def absolutize(segments):
+    x = y = start_x = start_y = 0.0
+    out = []
+    for command, relative, args in segments:
+        if command == "Z":
+            out.append(("Z", []))
+            x, y = start_x, start_y
+        elif command == "H":
+            x = args[0] + (x if relative else 0)
+            out.append(("H", [x]))
+        elif command == "V":
+            y = args[0] + (y if relative else 0)
+            out.append(("V", [y]))
+        elif command == "A":
+            end_x, end_y = args[5] + (x if relative else 0), args[6] + (y if relative else 0)
+            out.append(("A", args[:5] + [end_x, end_y]))
+            x, y = end_x, end_y
+        else:
+            points = [v + ((x if j % 2 == 0 else y) if relative else 0) for j, v in enumerate(args)]
+            out.append((command, points))
+            x, y = points[-2], points[-1]
+            if command == "M":
+                start_x, start_y = x, y
+    return out
+
+
+def optimize_path(d, precision=DEFAULT_PRECISION):
+    """逐段在绝对/相对写法中取较短者，水平/竖直线改写为 H/V，省略重复的命令字母"""
+    try:
+        segments = absolutize(parse_path(d))
+    except ValueError:
+        return d
+
+    def snap(v):
+        return round(v, precision)
+
+    out = []
+    # 省略字母时沿用的命令：M 之后是 L，m 之后是 l，其余为上一条命令本身
+    implicit = None
+    last_number = None
+    x = y = start_x = start_y = 0.0
+
+    for command, args in segments:
+        if command == "Z":
+            out.append("z")
+            implicit, last_number = None, None
+            x, y = start_x, start_y
+            continue
+
+        if command == "A":
+            end = [snap(args[5]), snap(args[6])]
+            head = [fmt_number(args[0], precision), fmt_number(args[1], precision),
+                    fmt_number(args[2], precision), str(int(args[3])), str(int(args[4]))]
+            candidates = [("A", head + [fmt_number(v, precision) for v in end]),
+                          ("a", head + [fmt_number(end[0] - x, precision), fmt_number(end[1] - y, precision)])]
+            new_x, new_y = end
+        elif command == "H" or command == "V" or (command == "L" and (snap(args[0]) == x or snap(args[1]) == y)):
+            if command == "L":
+                command = "H" if snap(args[1]) == y else "V"
+                args = [args[0]] if command == "H" else [args[1]]
+            value = snap(args[0])
+            origin = x if command == "H" else y
+            candidates = [(command, [fmt_number(value, precision)]),
+                          (command.lower(), [fmt_number(value - origin, precision)])]
+            new_x, new_y = (value, y) if command == "H" else (x, value)
+        else:
+            points = [snap(v) for v in args]
+            relative = [p - (x if j % 2 == 0 else y) for j, p in enumerate(points)]
+            candidates = [(command, [fmt_number(v, precision) for v in points]),
+                          (command.lower(), [fmt_number(v, precision) for v in relative])]
+            new_x, new_y = points[-2], points[-1]
+
+        best = None
+        for letter, numbers in candidates:
+            if letter == implicit and last_number is not None:
+                text = join_numbers(numbers, last_number)
+            else:
+                text = letter + join_numbers(numbers)
+            if best is None or len(text) < len(best[0]):
+                best = (text, letter, numbers)
+
+        text, letter, numbers = best
+        out.append(text)
+        implicit = {"M": "L", "m": "l"}.get(letter, letter)
+        last_number = numbers[-1]
+        x, y = new_x, new_y
+        if command == "M":
+            start_x, start_y = x, y
+
+    return "".join(out)
+
+
+def compact_numbers(value, precision):
+    return NUMBER.sub(lambda m: fmt_number(float(m.group()), precision), value)
+
+
+def compact_list(value, precision):
+    numbers = NUMBER.findall(value)
+    if re.sub(r"[\s,]+", "", value) != "".join(numbers):
+        return value
+    return join_numbers([fmt_number(float(n), precision) for n in numbers])
+
+
+def compact_transform(value, precision):
+    """变换里的缩放/旋转对精度更敏感，多保留 3 位"""
+    value = compact_numbers(value, precision + 3)
+    value = re.sub(r"\s*,\s*|\s+", " ", value)
+    return re.sub(r"\s*([()])\s*", r"\1", value).strip()
+
+
+def references(root):
+    """文档中所有 url(#id) 和 href="#id" 引用的 id（含 <style> 文本中的 url(#id)）"""
+    refs = set()
+    for elem in root.iter():
+        if local_name(elem.tag) == "style" and elem.text:
+            refs.update(_URL_REF.findall(elem.text))
+        for name, value in elem.attrib.items():
+            refs.update(_URL_REF.findall(value))
+            if local_name(name) == "href" and value.startswith("#"):
+                refs.add(value[1:])
+    return refs
+
+
+def replace_references(root, mapping):
+    if not mapping:
+        return
+
+    def url(match):
+        return f"url(#{mapping.get(match.group(1), match.group(1))})"
+
+    for elem in root.iter():
+        if local_name(elem.tag) == "style" and elem.text and "url(" in elem.text:
+            elem.text = _URL_REF.sub(url, elem.text)
+        for name, value in list(elem.attrib.items()):
+            if "url(" in value:
+                elem.set(name, _URL_REF.sub(url, value))
+            elif local_name(name) == "href" and value[1:] in mapping and value.startswith("#"):
+                elem.set(name, "#" + mapping[value[1:]])
+
+
+def inline_styles(root):
+    """style 里的展示属性改写为同名属性（文档中有 <style> 时不动，以免改变层叠顺序）"""
+    if any(local_name(e.tag) == "style" for e in root.iter()):
+        return
+    for elem in root.iter():
+        style = elem.get("style")
+        if style is None:
+            continue
+        remaining = []
+        for declaration in style.split(";"):
+            prop, sep, value = declaration.partition(":")
+            prop, value = prop.strip(), value.strip()
+            if not sep:
+                continue
+            if prop in PRESENTATION_PROPS and "!important" not in value:
+                elem.set(prop, value)
+            else:
+                remaining.append(f"{prop}:{value}")
+        if remaining:
+            elem.set("style", ";".join(remaining))
+        else:
+            del elem.attrib["style"]
+
+
+def clean_attributes(root, precision):
+    for elem in root.iter():
+        tag = local_name(elem.tag)
+        defaults = dict(REMOVABLE_DEFAULTS["*"])
+        # 引用了其他渐变的渐变会继承未指定的坐标，不能删
+        if not any(local_name(k) == "href" for k in elem.attrib):
+            defaults.update(REMOVABLE_DEFAULTS.get(tag, {}))
+        for name, value in list(elem.attrib.items()):
+            ns = namespace(name)
+            if ns is not None and ns not in (XLINK_NS, XML_NS):
+                del elem.attrib[name]  # 编辑器私有属性（inkscape、sodipodi 等）
+                continue
+            key = local_name(name)
+            value = value.strip()
+            if key == "d":
+                value = optimize_path(value, precision)
+            elif key in NUMERIC_ATTRS and NUMBER.fullmatch(value):
+                value = fmt_number(float(value), precision)
+            elif key in LIST_ATTRS:
+                value = compact_list(value, precision)
+            elif key in ("transform", "gradientTransform"):
+                value = compact_transform(value, precision)
+            elif key in COLOR_ATTRS and _HEX_COLOR.fullmatch(value):
+                value = _HEX_COLOR.sub(r"#\1\2\3", value).lower()
+            if defaults.get(key) == value or (key in defaults and NUMBER.fullmatch(value or "x")
+                                              and NUMBER.fullmatch(defaults[key])
+                                              and float(value) == float(defaults[key])):
+                del elem.attrib[name]
+            else:
+                elem.set(name, value)
+
+
+def remove_invisible(root):
+    """删除既无填充又无描边的图形，以及因此变空的 <g>"""
+    removed = 0
+
+    def visit(parent, fill, stroke):
+        nonlocal removed
+        for child in list(parent):
+            tag = local_name(child.tag)
+            if tag in NON_RENDERED or not isinstance(child.tag, str):
+                continue
+            child_fill = child.get("fill", fill)
+            child_stroke = child.get("stroke", stroke)
+            if tag in SHAPES and child.get("id") is None:
+                no_fill = child_fill == "none" or tag == "line"
+                no_stroke = child_stroke in (None, "none")
+                if (no_fill and no_stroke) or child.get("opacity") == "0" or child.get("display") == "none":
+                    parent.remove(child)
+                    removed += 1
+                    continue
+            visit(child, child_fill, child_stroke)
+            if tag == "g" and len(child) == 0 and child.get("id") is None:
+                parent.remove(child)
+                removed += 1
+
+    visit(root, None, None)
+    return removed
+
+
+def merge_gradients(root):
+    """内容完全相同的渐变只保留第一个，其余引用改指向它"""
+    seen = {}
+    mapping = {}
+    for defs in [e for e in root.iter() if local_name(e.tag) == "defs"]:
+        for child in list(defs):
+            if local_name(child.tag) not in GRADIENTS or child.get("id") is None:
+                continue
+            signature = (
+                local_name(child.tag),
+                tuple(sorted((k, v) for k, v in child.attrib.items() if k != "id")),
+                tuple((local_name(s.tag), tuple(sorted(s.attrib.items()))) for s in child),
+            )
+            if signature in seen:
+                mapping[child.get("id")] = seen[signature]
+                defs.remove(child)
+            else:
+                seen[signature] = child.get("id")
+    replace_references(root, mapping)
+    return len(mapping)
+
+
+def remove_unused_defs(root):
+    """删除 <defs> 中带 id 但未被引用的子元素；<style>、<script> 和没有 id 的子元素保留"""
+    removed = 0
+    while True:
+        refs = references(root)
+        changed = False
+        for defs in [e for e in root.iter() if local_name(e.tag) == "defs"]:
+            for child in list(defs):
+                child_id = child.get("id")
+                if child_id is not None and child_id not in refs and local_name(child.tag) not in KEEP_IN_DEFS:
+                    defs.remove(child)
+                    removed += 1
+                    changed = True
+        if not changed:
+            break
+    for parent in list(root.iter()):
+        for child in list(parent):
+            if local_name(child.tag) == "defs" and len(child) == 0:
+                parent.remove(child)
+    return removed
+
+
+def short_ids():
+    alphabet = string.ascii_letters
+    for length in itertools.count(1):
+        for chars in itertools.product(alphabet, repeat=length):
+            yield "".join(chars)
+
+
+def shorten_ids(root):
+    """把 <defs> 中被引用的 id 改成 a、b、c…"""
+    refs = references(root)
+    targets = [child for defs in root.iter() if local_name(defs.tag) == "defs" for child in defs
+               if child.get("id") in refs]
+    keep = {e.get("id") for e in root.iter() if e.get("id") is not None} - {t.get("id") for t in targets}
+    names = (n for n in short_ids() if n not in keep)
+    mapping = {}
+    for target in targets:
+        new = next(names)
+        mapping[target.get("id")] = new
+        target.set("id", new)
+    replace_references(root, mapping)
+
+
+def escape(text, quote=False):
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.replace('"', "&quot;") if quote else text
+
+
+def serialize(root):
+    out = []
+    uses_xlink = any(namespace(name) == XLINK_NS for e in root.iter() for name in e.attrib)
+
+    def attr_text(name):
+        ns = namespace(name)
+        if ns == XLINK_NS:
+            return "xlink:" + local_name(name)
+        if ns == XML_NS:
+            return "xml:" + local_name(name)
+        return name
+
+    def write(elem, preserve):
+        tag = local_name(elem.tag)
+        attrs = "".join(f' {attr_text(k)}="{escape(v, True)}"' for k, v in elem.attrib.items())
+        if elem is root:
+            attrs = f' xmlns="{SVG_NS}"' + (f' xmlns:xlink="{XLINK_NS}"' if uses_xlink else "") + attrs
+        keep_text = preserve or tag in TEXT_ELEMENTS
+        text = elem.text if elem.text and (keep_text or elem.text.strip()) else ""
+        if len(elem) == 0 and not text:
+            out.append(f"<{tag}{attrs}/>")
+        else:
+            out.append(f"<{tag}{attrs}>{escape(text)}")
+            for child in elem:
+                if isinstance(child.tag, str):
+                    write(child, keep_text)
+                if child.tail and (keep_text or child.tail.strip()):
+                    out.append(escape(child.tail))
+            out.append(f"</{tag}>")
+
+    write(root, False)
+    return "".join(out)
+
+
+def drop_foreign_elements(root):
+    for parent in list(root.iter()):
+        for child in list(parent):
+            ns = namespace(child.tag)
+            if not isinstance(child.tag, str) or (ns is not None and ns != SVG_NS) or local_name(child.tag) == "metadata":
+                parent.remove(child)
+
+
+def optimize_svg(svg, precision=DEFAULT_PRECISION, keep_ids=False):
+    """返回优化后的 SVG 文本（注释在解析时即被丢弃）"""
+    with stage("parse"):
+        root = ET.fromstring(svg)
+    with stage("passes"):
+        drop_foreign_elements(root)
+        inline_styles(root)
+        clean_attributes(root, precision)
+        remove_invisible(root)
+        merge_gradients(root)
+        remove_unused_defs(root)
+        if not keep_ids:
+            shorten_ids(root)
+    with stage("serialize"):
+        return serialize(root)
+
+
+def optimize_file(path, output, precision=DEFAULT_PRECISION, keep_ids=False):
+    with open(path, encoding="utf-8") as f:
+        original = f.read()
+    optimized = optimize_svg(original, precision, keep_ids)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(optimized)
+    before = len(original.encode("utf-8"))
+    after = len(optimized.encode("utf-8"))
+    return {"file": path, "output": output, "before": before, "after": after,
+            "saved": before - after, "saved_percent": round(100 * (before - after) / before, 1) if before else 0.0}
+
+
+def output_path(path, in_place, out_dir):
+    if in_place:
+        return path
+    if out_dir:
+        return os.path.join(out_dir, os.path.basename(path))
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.min{ext or '.svg'}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize SVG logos and report byte savings")
+    parser.add_argument("files", nargs="+", help="SVG files to optimize.")
+    parser.add_argument("--in-place", action="store_true", help="Overwrite the input files.")
+    parser.add_argument("--out-dir", help="Write optimized files into this directory.")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION, help="Decimal places kept for coordinates.")
+    parser.add_argument("--keep-ids", action="store_true", help="Do not shorten ids of gradients and filters.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    args = parser.parse_args()
+    if args.in_place and args.out_dir:
+        parser.error("--in-place and --out-dir are mutually exclusive")
+
+    report = []
+    for path in args.files:
+        if path.endswith(".min.svg") and not args.in_place and not args.out_dir:
+            continue
+        report.append(optimize_file(path, output_path(path, args.in_place, args.out_dir),
+                                    args.precision, args.keep_ids))
+
+    before = sum(r["before"] for r in report)
+    after = sum(r["after"] for r in report)
+    total = {"files": len(report), "before": before, "after": after, "saved": before - after,
+             "saved_percent": round(100 * (before - after) / before, 1) if before else 0.0}
+
+    if args.json:
+        print(json.dumps({"files": report, "total": total}, indent=2))
+        return
+    for r in report:
+        print(f"  {r['output']}: {r['before']} → {r['after']} bytes (-{r['saved_percent']}%)")
+    print(f"✅ {total['files']} files: {total['before']} → {total['after']} bytes "
+          f"(saved {total['saved']} bytes, -{total['saved_percent']}%)")
+
+
+if __name__ == "__main__":
+    with tracing("svg-logo-generator/svg_optimize"):
+        main()
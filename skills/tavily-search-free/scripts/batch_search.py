@@ -0,0 +1,170 @@
+"""
+Concurrent batch mode for tavily_search.py
+
+Reads one query per line (or a JSON object with "query" and optional
+"search_depth" / "max_results" overrides), runs them through a bounded
+asyncio pipeline sharing one pooled HTTP session, and streams one NDJSON
+line per query as soon as it completes.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+from rate_limit import remember_retry_after_async, summarize
+from search_cache import cache_key
+
+DEFAULT_CONCURRENCY = 8
+
+
+def read_queries(source, search_depth, max_results):
+    """Parse batch input lines into (query, search_depth, max_results) tuples"""
+    queries = []
+    for line in source:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            item = json.loads(line)
+            queries.append((item["query"],
+                            item.get("search_depth", search_depth),
+                            int(item.get("max_results", max_results))))
+        else:
+            queries.append((line, search_depth, max_results))
+    return queries
+
+
+def make_client(concurrency):
+    """One AsyncTavilyClient over one connection pool sized to the concurrency"""
+    import httpx
+    from tavily import AsyncTavilyClient
+
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        raise RuntimeError("TAVILY_API_KEY environment variable not set.")
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    session = httpx.AsyncClient(limits=limits, timeout=60,
+                                event_hooks={"response": [remember_retry_after_async]})
+    client = AsyncTavilyClient(api_key=api_key, api_base_url=os.getenv("TAVILY_API_URL"), client=session)
+    return client, session
+
+
+async def run_batch(queries, concurrency=DEFAULT_CONCURRENCY, cache=None, ordered=False, out=None,
+                    resilience=None, show_metrics=False, output=None, index=None, mode=None,
+                    local_min_results=1, index_max_age=None):
+    """Run queries concurrently and write NDJSON lines to `out`; return a summary
+
+    `output` holds postprocess.py stages applied to each response; batch
+    output is always NDJSON, so its "format" entry is ignored. `index` and
+    `mode` behave as in tavily_search.search().
+    """
+    out = out or sys.stdout
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    summary = {"queries": len(queries), "cached": 0, "local": 0, "fetched": 0, "errors": 0}
+
+    # Identical queries in one batch share a single request
+    inflight = {}
+    metrics = {}
+    stages = {k: v for k, v in (output or {}).items() if k != "format"}
+    if stages:
+        from postprocess import process
+    if mode:
+        from local_index import lookup_local
+    client = session = None
+
+    async def fetch_one(key, query, search_depth, max_results):
+        nonlocal client, session
+        if cache is not None:
+            results, _ = cache.get(query, search_depth, max_results)
+            if results is not None:
+                summary["cached"] += 1
+                return results, "cache"
+
+        if mode:
+            results = lookup_local(index, mode, query, max_results, local_min_results, index_max_age)
+            if results is not None:
+                summary["local"] += 1
+                return results, "local-index"
+
+        async with semaphore:
+            if client is None:
+                client, session = make_client(concurrency)
+
+            def call():
+                return client.search(query=query, search_depth=search_depth, max_results=max_results)
+
+            if resilience is None:
+                results = await call()
+            else:
+                metrics[key] = {}
+                results = await resilience.call_async(call, metrics[key])
+
+        summary["fetched"] += 1
+        if cache is not None:
+            cache.put(query, search_depth, max_results, results)
+        if index is not None:
+            index.add(query, results)
+        return results, "network"
+
+    async def run_one(position, query, search_depth, max_results):
+        key = cache_key(query, search_depth, max_results)
+        if key not in inflight:
+            inflight[key] = asyncio.ensure_future(fetch_one(key, query, search_depth, max_results))
+        try:
+            results, source = await asyncio.shield(inflight[key])
+            if stages:
+                results = process(results, **stages)
+            record = {"index": position, "query": query, "cached": source == "cache", "results": results}
+            if source == "local-index":
+                record["local"] = True
+        except Exception as e:
+            summary["errors"] += 1
+            record = {"index": position, "query": query, "error": str(e)}
+        if show_metrics and key in metrics:
+            record["metrics"] = metrics[key]
+        return record
+
+    def emit(record):
+        out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        out.flush()
+
+    tasks = [asyncio.ensure_future(run_one(i, *q)) for i, q in enumerate(queries)]
+    try:
+        if ordered:
+            # Still concurrent; lines are held back until earlier ones are written
+            for task in tasks:
+                emit(await task)
+        else:
+            for task in asyncio.as_completed(tasks):
+                emit(await task)
+    finally:
+        if session is not None:
+            await session.aclose()
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["queries_per_second"] = round(len(queries) / elapsed, 2) if elapsed else None
+    if metrics:
+        summary.update(summarize(list(metrics.values())))
+    return summary
+
+
+def batch(path, search_depth, max_results, concurrency=DEFAULT_CONCURRENCY, cache=None, ordered=False,
+          resilience=None, show_metrics=False, output=None, index=None, mode=None, local_min_results=1,
+          index_max_age=None):
+    if path == "-":
+        queries = read_queries(sys.stdin, search_depth, max_results)
+    else:
+        with open(path, encoding="utf-8") as f:
+            queries = read_queries(f, search_depth, max_results)
+
+    summary = asyncio.run(run_batch(queries, concurrency=concurrency, cache=cache, ordered=ordered,
+                                    resilience=resilience, show_metrics=show_metrics, output=output,
+                                    index=index, mode=mode, local_min_results=local_min_results,
+                                    index_max_age=index_max_age))
+    print(json.dumps(summary), file=sys.stderr)
+    return summary
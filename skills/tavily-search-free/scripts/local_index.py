@@ -0,0 +1,185 @@
+"""
+Local full-text index of fetched Tavily results
+
+Every result is stored once per canonical URL in SQLite, with an FTS5 table
+over title, url, content and the query that found it. Searches are ranked
+with BM25 (title and query matches weigh more than body text).
+
+FTS5's unicode61 tokenizer treats a run of CJK characters as one token, so
+CJK text is split into single characters before indexing and CJK query
+terms are matched as phrases; Latin words are indexed as usual.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+
+from postprocess import canonicalize_url
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tavily-search", "index.sqlite3")
+
+# bm25() column weights: title, url, content, query
+BM25_WEIGHTS = (10.0, 2.0, 1.0, 5.0)
+
+CJK = "㐀-䶿一-鿿豈-﫿぀-ヿ가-힯"
+_CJK_CHAR = re.compile(f"([{CJK}])")
+_QUERY_TERM = re.compile(f"[{CJK}]+|\\w+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    query TEXT NOT NULL,
+    fetched REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_fetched ON documents (fetched);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+    title, url, content, query,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def segment(text):
+    """Put spaces around CJK characters so each one is its own token"""
+    return _CJK_CHAR.sub(r" \1 ", text or "")
+
+
+def match_expression(query, operator="AND"):
+    """Build an FTS5 MATCH expression from free text, quoting every term"""
+    terms = []
+    for term in _QUERY_TERM.findall(query.lower()):
+        if _CJK_CHAR.match(term):
+            term = " ".join(term)
+        terms.append('"' + term.replace('"', '""') + '"')
+    return f" {operator} ".join(terms)
+
+
+class LocalIndex:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("TAVILY_INDEX_PATH") or DEFAULT_INDEX_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=10)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add(self, query, response):
+        """Store every result of a response; a URL seen again is replaced by the newer copy"""
+        now = time.time()
+        added = 0
+        with self.conn:
+            for result in response.get("results") or []:
+                if not result.get("url"):
+                    continue
+                url = canonicalize_url(result["url"])
+                title = result.get("title") or ""
+                content = result.get("content") or ""
+
+                row = self.conn.execute("SELECT id FROM documents WHERE url = ?", (url,)).fetchone()
+                if row is None:
+                    doc_id = self.conn.execute(
+                        "INSERT INTO documents (url, title, content, query, fetched) VALUES (?, ?, ?, ?, ?)",
+                        (url, title, content, query, now),
+                    ).lastrowid
+                else:
+                    doc_id = row[0]
+                    self.conn.execute(
+                        "UPDATE documents SET title = ?, content = ?, query = ?, fetched = ? WHERE id = ?",
+                        (title, content, query, now, doc_id),
+                    )
+                    self.conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+
+                self.conn.execute(
+                    "INSERT INTO documents_fts (rowid, title, url, content, query) VALUES (?, ?, ?, ?, ?)",
+                    (doc_id, segment(title), url, segment(content), segment(query)),
+                )
+                added += 1
+        return added
+
+    def search(self, query, limit=10, operator="AND", max_age=None):
+        """Return Tavily-shaped results ranked by BM25 (higher score is better)"""
+        expression = match_expression(query, operator)
+        if not expression:
+            return []
+
+        sql = (
+            "SELECT d.title, d.url, d.content, d.query, d.fetched, bm25(documents_fts, ?, ?, ?, ?) AS rank "
+            "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ?"
+        )
+        params = list(BM25_WEIGHTS) + [expression]
+        if max_age is not None:
+            sql += " AND d.fetched >= ?"
+            params.append(time.time() - max_age)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        return [
+            {
+                "title": title,
+                "url": url,
+                "content": content,
+                "score": round(-rank, 4),
+                "source_query": source_query,
+                "fetched": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(fetched)),
+            }
+            for title, url, content, source_query, fetched, rank in self.conn.execute(sql, params)
+        ]
+
+    def lookup(self, query, limit=10, max_age=None, fallback=True):
+        """Search with all terms required, then with any term if nothing matched"""
+        results = self.search(query, limit, "AND", max_age)
+        if not results and fallback:
+            results = self.search(query, limit, "OR", max_age)
+        return {"query": query, "source": "local-index", "results": results}
+
+    def stats(self):
+        count, oldest, newest = self.conn.execute(
+            "SELECT COUNT(*), MIN(fetched), MAX(fetched) FROM documents"
+        ).fetchone()
+        return {
+            "path": self.path,
+            "documents": count,
+            "queries": self.conn.execute("SELECT COUNT(DISTINCT query) FROM documents").fetchone()[0],
+            "size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "oldest": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(oldest)) if oldest else None,
+            "newest": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(newest)) if newest else None,
+        }
+
+
+def lookup_local(index, mode, query, max_results, min_results=1, max_age=None):
+    """Answer from the local index; None means the network should be asked instead
+
+    --offline always answers locally (any-term fallback, possibly empty);
+    --local-first answers only when enough documents match every term.
+    """
+    if mode == "offline":
+        return index.lookup(query, max_results, max_age=max_age)
+    local = index.lookup(query, max_results, max_age=max_age, fallback=False)
+    if len(local["results"]) >= min(min_results, max_results):
+        return local
+    return None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the local Tavily result index")
+    parser.add_argument("query", nargs="?", help="Full-text query.")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum results.")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics.")
+
+    args = parser.parse_args()
+    index = LocalIndex()
+    if args.stats or not args.query:
+        print(json.dumps(index.stats(), indent=2))
+    else:
+        print(json.dumps(index.lookup(args.query, args.limit), indent=2, ensure_ascii=False))
@@ -0,0 +1,145 @@
+"""
+Local stand-in for the Tavily search endpoint
+
+Answers POST /search with deterministic fake results so tavily_search.py can
+be exercised without network access or API quota:
+
+    python3 scripts/mock_tavily_server.py --port 8765 &
+    TAVILY_API_URL=http://127.0.0.1:8765 TAVILY_API_KEY=test \\
+        python3 scripts/tavily_search.py --query "hello"
+
+GET /stats returns the number of search requests served. --latency and
+--jitter simulate slow, out-of-order responses for batch throughput tests;
+--fail-rate/--fail-status/--retry-after inject 429/5xx responses.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_results(query, search_depth, max_results):
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    results = []
+    for i in range(max_results):
+        results.append({
+            "title": f"Result {i + 1} for {query}",
+            "url": f"https://example.com/{digest[:8]}/{i + 1}",
+            "content": f"Summary {i + 1} about {query}. " * 3,
+            "score": round(1.0 - i * 0.05, 2),
+            "raw_content": None,
+        })
+    return {
+        "query": query,
+        "search_depth": search_depth,
+        "max_results": max_results,
+        "results": results,
+        "response_time": 0.0,
+    }
+
+
+class MockTavilyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, jitter=0.0, fail_rate=0.0, fail_status=429,
+                 retry_after=None):
+        super().__init__(address, MockTavilyHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+
+class MockTavilyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, {"requests": self.server.requests, "failures": self.server.failures})
+        else:
+            self._send_json(404, {"detail": {"error": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"detail": {"error": "Invalid JSON"}})
+            return
+
+        if self.path != "/search":
+            self._send_json(404, {"detail": {"error": "Not found"}})
+            return
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._send_json(401, {"detail": {"error": "Unauthorized: missing or invalid API key."}})
+            return
+
+        with self.server.lock:
+            self.server.requests += 1
+            failing = random.random() < self.server.fail_rate
+            if failing:
+                self.server.failures += 1
+
+        if failing:
+            headers = {}
+            if self.server.retry_after is not None:
+                headers["Retry-After"] = str(self.server.retry_after)
+            self._send_json(self.server.fail_status, {"detail": {"error": "Injected failure"}}, headers)
+            return
+
+        delay = self.server.latency + random.uniform(0, self.server.jitter)
+        if delay:
+            time.sleep(delay)
+
+        self._send_json(200, fake_results(
+            payload.get("query", ""),
+            payload.get("search_depth", "basic"),
+            int(payload.get("max_results", 5)),
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in Tavily search endpoint")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep before each response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay of up to this many seconds, so responses complete out of order.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with --fail-status.")
+    parser.add_argument("--fail-status", type=int, default=429, help="Status code for injected failures (e.g. 429, 503).")
+    parser.add_argument("--retry-after", type=float, help="Retry-After header value sent with injected failures.")
+
+    args = parser.parse_args()
+
+    server = MockTavilyServer((args.host, args.port), latency=args.latency, jitter=args.jitter,
+                              fail_rate=args.fail_rate, fail_status=args.fail_status,
+                              retry_after=args.retry_after)
+    print(f"Mock Tavily endpoint on http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Result post-processing for tavily_search.py
+
+Shrinks a Tavily response before it reaches the agent's context:
+
+- canonicalize_url / dedup_urls: drop results pointing at the same page
+  (scheme/host case, www., default ports, fragments, tracking parameters)
+- dedup_near_duplicates: drop results whose content is nearly identical,
+  using word shingles, MinHash signatures and LSH banding
+- apply_token_budget: truncate content so all results fit a token budget
+- format_output: pretty JSON (default), minified JSON or NDJSON
+"""
+
+import json
+import re
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid", "yclid"}
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+LSH_BANDS = 16
+DEFAULT_NEAR_DUP_THRESHOLD = 0.8
+
+# Rough token estimate for mixed prose: ~4 characters per token
+CHARS_PER_TOKEN = 4
+
+_MERSENNE = (1 << 61) - 1
+# Fixed (a, b) pairs so signatures are stable across runs and processes
+_PERMUTATIONS = [((i * 0x9E3779B97F4A7C15 + 1) % _MERSENNE | 1, (i * 0xC2B2AE3D27D4EB4F + 7) % _MERSENNE)
+                 for i in range(1, NUM_PERM + 1)]
+
+
+def canonicalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    netloc = host if port is None or str(port) == DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ""))
+
+
+def _by_score(results):
+    """Indices ordered best-first, so duplicates keep the highest-scoring copy"""
+    return sorted(range(len(results)), key=lambda i: -(results[i].get("score") or 0.0))
+
+
+def dedup_urls(results):
+    seen = set()
+    keep = set()
+    for i in _by_score(results):
+        url = results[i].get("url")
+        key = canonicalize_url(url) if url else None
+        if key is None or key not in seen:
+            keep.add(i)
+            if key is not None:
+                seen.add(key)
+    return [r for i, r in enumerate(results) if i in keep]
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(shingle_set):
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingle_set]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def estimate_similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def dedup_near_duplicates(results, threshold=DEFAULT_NEAR_DUP_THRESHOLD):
+    """Drop results whose content MinHash similarity to a better result is >= threshold"""
+    rows = NUM_PERM // LSH_BANDS
+    buckets = {}
+    kept_signatures = {}
+    keep = set()
+
+    for i in _by_score(results):
+        signature = minhash(shingles((results[i].get("content") or "")))
+        if signature is None:
+            keep.add(i)
+            continue
+
+        bands = [(b, signature[b * rows:(b + 1) * rows]) for b in range(LSH_BANDS)]
+        candidates = set()
+        for band in bands:
+            candidates.update(buckets.get(band, ()))
+        if any(estimate_similarity(signature, kept_signatures[j]) >= threshold for j in candidates):
+            continue
+
+        keep.add(i)
+        kept_signatures[i] = signature
+        for band in bands:
+            buckets.setdefault(band, []).append(i)
+
+    return [r for i, r in enumerate(results) if i in keep]
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def truncate_to_tokens(text, tokens):
+    """Cut text to about `tokens` tokens, preferring a sentence or word boundary"""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    if limit <= 1:
+        return ""
+    cut = text[:limit - 1]
+    boundary = max(cut.rfind(". "), cut.rfind("。"))
+    if boundary < limit // 2:
+        boundary = cut.rfind(" ")
+    if boundary >= limit // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + "…"
+
+
+def apply_token_budget(results, budget):
+    """Share `budget` tokens between results in score order; title and url are always kept"""
+    remaining = budget
+    order = _by_score(results)
+    trimmed = [dict(r) for r in results]
+
+    for position, i in enumerate(order):
+        result = trimmed[i]
+        remaining -= estimate_tokens(result.get("title") or "") + estimate_tokens(result.get("url") or "")
+        # Even split of what is left, so one long page cannot starve the rest
+        share = max(0, remaining) // (len(order) - position)
+        content = result.get("content") or ""
+        if estimate_tokens(content) > share:
+            result["content"] = truncate_to_tokens(content, share)
+        remaining -= estimate_tokens(result.get("content") or "")
+    return trimmed
+
+
+def process(response, dedup=False, near_dup_threshold=DEFAULT_NEAR_DUP_THRESHOLD,
+            token_budget=None, drop_raw=False):
+    """Return a copy of a Tavily response with the requested stages applied"""
+    response = dict(response)
+    results = list(response.get("results") or [])
+
+    if drop_raw:
+        results = [{k: v for k, v in r.items() if k != "raw_content"} for r in results]
+    if dedup:
+        results = dedup_urls(results)
+        results = dedup_near_duplicates(results, near_dup_threshold)
+    if token_budget is not None:
+        results = apply_token_budget(results, token_budget)
+
+    response["results"] = results
+    return response
+
+
+def format_output(response, fmt="json"):
+    if fmt == "minjson":
+        return json.dumps(response, ensure_ascii=False, separators=(",", ":"))
+    if fmt == "ndjson":
+        meta = {k: v for k, v in response.items() if k != "results"}
+        lines = [json.dumps(meta, ensure_ascii=False, separators=(",", ":"))]
+        lines.extend(json.dumps(r, ensure_ascii=False, separators=(",", ":"))
+                     for r in response.get("results") or [])
+        return "\n".join(lines)
+    return json.dumps(response, indent=2)
@@ -0,0 +1,304 @@
+"""
+Client-side rate limiting, retries and circuit breaking for tavily_search.py
+
+State lives in small JSON files guarded by a lock file, so every agent
+process on the machine shares one token bucket and one circuit breaker
+instead of each retrying on its own:
+
+- RateLimiter: token bucket; callers reserve a slot and sleep until it is
+  theirs, so bursts are spread out instead of stampeding the API
+- CircuitBreaker: opens after N consecutive server errors/timeouts and
+  rejects calls until a cooldown has passed, then lets one trial call through
+- RetryPolicy: exponential backoff with full jitter, never shorter than
+  the server's Retry-After
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a per-process lock
+    fcntl = None
+
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tavily-search")
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30.0
+
+# Retry-After of the most recent response in this thread/task, filled by the
+# response hooks below because the SDK drops headers when it raises on 429
+_last_retry_after = contextvars.ContextVar("tavily_retry_after", default=None)
+_local_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_in):
+        super().__init__(f"Circuit breaker open after repeated failures, retry in {retry_in:.1f}s")
+        self.retry_in = retry_in
+
+
+def state_dir():
+    return os.getenv("TAVILY_STATE_DIR") or DEFAULT_STATE_DIR
+
+
+@contextlib.contextmanager
+def locked_state(name):
+    """Read-modify-write a JSON state file under an exclusive lock"""
+    directory = state_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name + ".json")
+
+    with _local_lock, open(os.path.join(directory, name + ".lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                state = {}
+            before = dict(state)
+            yield state
+            if state != before:
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(tmp, path)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+
+    def reserve(self):
+        """Take a token and return how long to wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        with locked_state("ratelimit") as state:
+            now = time.time()
+            tokens = state.get("tokens", float(self.burst))
+            updated = state.get("updated", now)
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            # Tokens may go negative: later callers queue behind earlier ones
+            tokens -= 1
+            state["tokens"] = tokens
+            state["updated"] = now
+        return max(0.0, -tokens / self.rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        import asyncio
+
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, cooldown=DEFAULT_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+    def check(self):
+        """Raise CircuitOpenError while open; after the cooldown one trial call passes"""
+        if self.failure_threshold <= 0:
+            return
+        with locked_state("circuit") as state:
+            opened_at = state.get("opened_at")
+            if opened_at is None:
+                return
+            now = time.time()
+            retry_in = opened_at + self.cooldown - now
+            if retry_in > 0:
+                raise CircuitOpenError(retry_in)
+            # Half-open: re-arm the cooldown so concurrent callers wait for the trial
+            state["opened_at"] = now
+
+    def record_success(self):
+        with locked_state("circuit") as state:
+            state.pop("opened_at", None)
+            state["failures"] = 0
+
+    def record_failure(self):
+        with locked_state("circuit") as state:
+            state["failures"] = state.get("failures", 0) + 1
+            if state["failures"] >= self.failure_threshold > 0:
+                state["opened_at"] = time.time()
+
+
+class RetryPolicy:
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, retry_after=None):
+        """Full-jitter backoff for the given 0-based retry attempt"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_delay))
+        return backoff
+
+
+def parse_retry_after(value):
+    """Retry-After is either seconds or an HTTP date"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    import email.utils
+
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def remember_retry_after(response, *args, **kwargs):
+    """requests response hook"""
+    _last_retry_after.set(response.headers.get("Retry-After"))
+
+
+async def remember_retry_after_async(response):
+    """httpx response hook"""
+    _last_retry_after.set(response.headers.get("Retry-After"))
+
+
+def retry_info(exc):
+    """Return (retryable, retry_after_seconds, throttled) for an exception from a search call
+
+    `throttled` marks 429-style rejections: the API is healthy but wants us
+    to slow down, so they are retried without counting towards the breaker.
+    """
+    status = getattr(exc, "code", None)
+    headers = getattr(exc, "headers", None)
+    response = getattr(exc, "response", None)
+    if response is not None:
+        status = getattr(response, "status_code", status)
+        headers = getattr(response, "headers", headers)
+
+    retry_after = None
+    if headers is not None:
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+    if retry_after is None:
+        retry_after = getattr(exc, "retry_after_seconds", None) or parse_retry_after(_last_retry_after.get())
+
+    name = type(exc).__name__
+    if isinstance(status, int):
+        return status == 429 or status >= 500, retry_after, status == 429
+    if name == "UsageLimitExceededError" or name == "TavilyKeylessLimitError":
+        return True, retry_after, True
+    # Timeouts and connection errors from urllib, requests, httpx and the SDK
+    # (urllib wraps them in URLError.reason)
+    transient = (TimeoutError, ConnectionError)
+    if isinstance(exc, transient) or isinstance(getattr(exc, "reason", None), transient) or name in (
+            "TimeoutError", "TimeoutException", "ConnectTimeout", "ReadTimeout",
+            "ConnectError", "ReadError", "RemoteProtocolError", "ConnectionError"):
+        return True, retry_after, False
+    return False, None, False
+
+
+class Resilience:
+    """Bundle of limiter, breaker and retry policy applied around each search call"""
+
+    def __init__(self, limiter=None, breaker=None, policy=None):
+        self.limiter = limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.policy = policy or RetryPolicy()
+
+    def call(self, func, metrics=None):
+        metrics = metrics if metrics is not None else {}
+        started = time.perf_counter()
+        metrics.update(attempts=0, retries=0, throttled_seconds=0.0, backoff_seconds=0.0)
+        try:
+            while True:
+                self.breaker.check()
+                metrics["throttled_seconds"] += self.limiter.acquire()
+                metrics["attempts"] += 1
+                _last_retry_after.set(None)
+                try:
+                    result = func()
+                except Exception as e:
+                    delay = self._on_failure(e, metrics)
+                    time.sleep(delay)
+                    continue
+                self.breaker.record_success()
+                return result
+        finally:
+            metrics["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def call_async(self, func, metrics=None):
+        import asyncio
+
+        metrics = metrics if metrics is not None else {}
+        started = time.perf_counter()
+        metrics.update(attempts=0, retries=0, throttled_seconds=0.0, backoff_seconds=0.0)
+        try:
+            while True:
+                self.breaker.check()
+                metrics["throttled_seconds"] += await self.limiter.acquire_async()
+                metrics["attempts"] += 1
+                _last_retry_after.set(None)
+                try:
+                    result = await func()
+                except Exception as e:
+                    delay = self._on_failure(e, metrics)
+                    await asyncio.sleep(delay)
+                    continue
+                self.breaker.record_success()
+                return result
+        finally:
+            metrics["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    def _on_failure(self, exc, metrics):
+        """Re-raise non-retryable or exhausted failures, else return the backoff delay"""
+        retryable, retry_after, throttled = retry_info(exc)
+        if not retryable:
+            raise exc
+        if not throttled:
+            self.breaker.record_failure()
+        if metrics["retries"] >= self.policy.max_retries:
+            raise exc
+        delay = self.policy.delay(metrics["retries"], retry_after)
+        metrics["retries"] += 1
+        metrics["backoff_seconds"] += delay
+        return delay
+
+
+def summarize(metrics_list):
+    """Aggregate per-query metrics into latency percentiles and retry counts"""
+    if not metrics_list:
+        return {}
+    latencies = sorted(m.get("latency_ms", 0.0) for m in metrics_list)
+    return {
+        "latency_p50_ms": latencies[len(latencies) // 2],
+        "latency_p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        "latency_max_ms": latencies[-1],
+        "attempts": sum(m.get("attempts", 0) for m in metrics_list),
+        "retries": sum(m.get("retries", 0) for m in metrics_list),
+        "throttled_seconds": round(sum(m.get("throttled_seconds", 0.0) for m in metrics_list), 3),
+        "backoff_seconds": round(sum(m.get("backoff_seconds", 0.0) for m in metrics_list), 3),
+    }
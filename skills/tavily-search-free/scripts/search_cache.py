@@ -0,0 +1,156 @@
+"""
+SQLite result cache for tavily_search.py
+
+Entries are keyed by the normalized query, search depth and max results.
+An entry is fresh for `ttl` seconds, then served as stale for another
+`stale_ttl` seconds while a background refresh runs, then treated as a miss.
+The least recently used entries are evicted once `max_entries` is exceeded.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tavily-search", "cache.sqlite3")
+DEFAULT_TTL = 3600
+DEFAULT_STALE_TTL = 86400
+DEFAULT_MAX_ENTRIES = 1000
+
+# A refresh that has not finished after this long is assumed to have died
+REFRESH_LOCK_SECONDS = 60
+
+FRESH = "fresh"
+STALE = "stale"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    search_depth TEXT NOT NULL,
+    max_results INTEGER NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    refreshing REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def normalize_query(query):
+    """Case-fold and collapse whitespace so trivially different queries share an entry"""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"\s+", " ", query).strip()
+
+
+def cache_key(query, search_depth, max_results):
+    raw = json.dumps([normalize_query(query), search_depth, int(max_results)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    def __init__(self, path=None, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or os.getenv("TAVILY_CACHE_PATH") or DEFAULT_CACHE_PATH
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Several agents may share the cache; WAL lets readers run alongside a writer
+        self.conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, query, search_depth, max_results):
+        """Return (response, FRESH | STALE), or (None, None) on a miss"""
+        key = cache_key(query, search_depth, max_results)
+        row = self.conn.execute(
+            "SELECT response, created FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        now = time.time()
+        if row is None or now - row[1] >= self.ttl + self.stale_ttl:
+            self._bump("misses")
+            return None, None
+
+        self.conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        if now - row[1] < self.ttl:
+            self._bump("hits")
+            return json.loads(row[0]), FRESH
+
+        self._bump("stale_hits")
+        return json.loads(row[0]), STALE
+
+    def put(self, query, search_depth, max_results, response):
+        key = cache_key(query, search_depth, max_results)
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(key, query, search_depth, max_results, response, created, accessed, refreshing) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+            (key, normalize_query(query), search_depth, int(max_results),
+             json.dumps(response, separators=(",", ":")), now, now),
+        )
+        self._evict()
+
+    def claim_refresh(self, query, search_depth, max_results):
+        """Mark an entry as being refreshed; False if another process already is"""
+        key = cache_key(query, search_depth, max_results)
+        now = time.time()
+        cursor = self.conn.execute(
+            "UPDATE entries SET refreshing = ? WHERE key = ? AND refreshing < ?",
+            (now, key, now - REFRESH_LOCK_SECONDS),
+        )
+        return cursor.rowcount == 1
+
+    def _evict(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)",
+                (excess,),
+            )
+            self._bump("evictions", excess)
+
+    def _bump(self, name, amount=1):
+        self.conn.execute(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def stats(self):
+        counters = dict(self.conn.execute("SELECT name, value FROM stats").fetchall())
+        hits = counters.get("hits", 0)
+        stale_hits = counters.get("stale_hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + stale_hits + misses
+        return {
+            "path": self.path,
+            "entries": self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+            "size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "hits": hits,
+            "stale_hits": stale_hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": round((hits + stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.conn.execute("DELETE FROM entries")
+        self.conn.execute("DELETE FROM stats")
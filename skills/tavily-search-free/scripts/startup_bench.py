@@ -0,0 +1,122 @@
+"""
+Startup benchmark for tavily_search.py
+
+Measures wall time of `--help` and of a cache hit against the bare
+interpreter start, and uses `python -X importtime` to list the most
+expensive imports and to check that no network-only module (Tavily SDK,
+dotenv, httpx, requests, asyncio, urllib.request) is loaded on those paths.
+
+    python3 scripts/startup_bench.py --runs 20 --target-ms 100
+
+Exits 1 if the median cache-hit overhead over the bare interpreter
+(measured in the same run) exceeds --target-ms or a network-only module
+was imported.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from search_cache import SearchCache
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tavily_search.py")
+BENCH_QUERY = "startup benchmark query"
+NETWORK_ONLY_MODULES = ["tavily", "dotenv", "httpx", "requests", "asyncio", "urllib.request"]
+
+
+def time_runs(cmd, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(samples[0], 2),
+        "max_ms": round(samples[-1], 2),
+    }
+
+
+def import_profile(cmd, env, top):
+    """Run once under -X importtime; return (imported module names, top imports by self time)"""
+    result = subprocess.run([sys.executable, "-X", "importtime"] + cmd[1:], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if not parts[0].strip().isdigit():
+            continue  # header line
+        modules[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return set(modules), [{"module": name, "self_us": self_us, "cumulative_us": cumulative_us}
+                          for name, (self_us, cumulative_us) in slowest]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark for tavily_search.py")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per scenario.")
+    parser.add_argument("--target-ms", type=float, default=100.0, help="Maximum median cache-hit overhead over the bare interpreter.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to report.")
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["TAVILY_CACHE_PATH"] = os.path.join(tmp, "cache.sqlite3")
+        # No key and no endpoint: a cache miss would fail instead of going online
+        env.pop("TAVILY_API_KEY", None)
+        env.pop("TAVILY_API_URL", None)
+
+        cache = SearchCache(path=env["TAVILY_CACHE_PATH"])
+        cache.put(BENCH_QUERY, "basic", 10, {"query": BENCH_QUERY, "results": []})
+        cache.close()
+
+        scenarios = {
+            "interpreter": [sys.executable, "-c", "pass"],
+            "help": [sys.executable, SCRIPT, "--help"],
+            "cache_hit": [sys.executable, SCRIPT, "--query", BENCH_QUERY],
+        }
+        report = {"runs": args.runs, "target_ms": args.target_ms, "scenarios": {}}
+        failures = []
+
+        for name, cmd in scenarios.items():
+            stats = time_runs(cmd, env, args.runs)
+            if name != "interpreter":
+                modules, slowest = import_profile(cmd, env, args.top)
+                loaded = [m for m in NETWORK_ONLY_MODULES if m in modules]
+                stats["network_only_imports"] = loaded
+                stats["slowest_imports"] = slowest
+                if loaded:
+                    failures.append(f"{name} imports network-only modules: {', '.join(loaded)}")
+            report["scenarios"][name] = stats
+
+    interpreter_ms = report["scenarios"]["interpreter"]["median_ms"]
+    for name in ("help", "cache_hit"):
+        scenario = report["scenarios"][name]
+        scenario["overhead_ms"] = round(scenario["median_ms"] - interpreter_ms, 2)
+
+    cache_hit = report["scenarios"]["cache_hit"]
+    report["interpreter_ms"] = interpreter_ms
+    report["cache_hit_ms"] = cache_hit["median_ms"]
+    report["cache_hit_overhead_ms"] = cache_hit["overhead_ms"]
+    if cache_hit["overhead_ms"] > args.target_ms:
+        failures.append(f"cache hit overhead {cache_hit['overhead_ms']}ms (median {cache_hit['median_ms']}ms, "
+                        f"interpreter {interpreter_ms}ms) exceeds target {args.target_ms}ms")
+
+    report["passed"] = not failures
+    report["failures"] = failures
+    print(json.dumps(report, indent=2))
+    exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,245 @@
 import os
+import sys
 import argparse
 import json
-from dotenv import load_dotenv
-from tavily import TavilyClient
+from search_cache import (SearchCache, STALE, DEFAULT_TTL, DEFAULT_STALE_TTL,
+                          DEFAULT_MAX_ENTRIES)
+from rate_limit import (Resilience, RateLimiter, RetryPolicy, remember_retry_after,
+                        DEFAULT_RATE, DEFAULT_MAX_RETRIES)
 
-def search(query, search_depth, max_results):
-    load_dotenv()
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "skill-profiler", "scripts"))
+try:
+    from skilltrace import stage, tracing
+except ImportError:
+    from contextlib import nullcontext as stage, nullcontext as tracing
+
+# The Tavily SDK, dotenv, urllib and subprocess are imported only on the paths
+# that need them, so --help and cache hits skip their import cost
+
+_env_loaded = False
+
+def load_env():
+    """Load .env once, right before the first network call"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+def post_search(api_url, api_key, query, search_depth, max_results):
+    """Call a Tavily-compatible endpoint directly, e.g. mock_tavily_server.py"""
+    import urllib.request
+
+    request = urllib.request.Request(
+        api_url.rstrip("/") + "/search",
+        data=json.dumps({
+            "query": query,
+            "search_depth": search_depth,
+            "max_results": max_results
+        }).encode("utf-8"),
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}"
+        },
+        method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())
+
+def fetch(query, search_depth, max_results, resilience=None, metrics=None):
+    load_env()
     api_key = os.getenv("TAVILY_API_KEY")
     if not api_key:
+        raise RuntimeError("TAVILY_API_KEY environment variable not set.")
+
+    api_url = os.getenv("TAVILY_API_URL")
+    if api_url:
+        def call():
+            return post_search(api_url, api_key, query, search_depth, max_results)
+    else:
+        from tavily import TavilyClient
+
+        client = TavilyClient(api_key=api_key)
+        client.session.hooks["response"].append(remember_retry_after)
+
+        def call():
+            return client.search(
+                query=query,
+                search_depth=search_depth,
+                max_results=max_results
+            )
+
+    if resilience is None:
+        return call()
+    return resilience.call(call, metrics)
+
+def render(results, output=None):
+    """Serialize a response, applying the postprocess.py stages in `output`"""
+    if not output:
+        return json.dumps(results, indent=2)
+    from postprocess import process, format_output
+
+    stages = {k: v for k, v in output.items() if k != "format"}
+    return format_output(process(results, **stages), output.get("format", "json"))
+
+def revalidate_in_background(query, search_depth, max_results, index=False):
+    """Refresh a stale cache entry in a detached process"""
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__),
+         "--query", query,
+         "--search-depth", search_depth,
+         "--max-results", str(max_results),
+         "--refresh"] + (["--index"] if index else []),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+def search(query, search_depth, max_results, cache=None, refresh=False, resilience=None, show_metrics=False,
+           output=None, index=None, mode=None, local_min_results=1, index_max_age=None):
+    if cache is not None and not refresh:
+        with stage("cache"):
+            results, state = cache.get(query, search_depth, max_results)
+        if results is not None:
+            with stage("render"):
+                print(render(results, output))
+            if state == STALE and mode != "offline" and cache.claim_refresh(query, search_depth, max_results):
+                revalidate_in_background(query, search_depth, max_results, index=index is not None)
+            return
+
+    if mode and not refresh:
+        from local_index import lookup_local
+        with stage("local-index"):
+            results = lookup_local(index, mode, query, max_results, local_min_results, index_max_age)
+        if results is not None:
+            with stage("render"):
+                print(render(results, output))
+            return
+
+    load_env()
+    if not os.getenv("TAVILY_API_KEY"):
         print(json.dumps({"error": "TAVILY_API_KEY environment variable not set."}))
         exit(1)
 
+    metrics = {}
     try:
-        client = TavilyClient(api_key=api_key)
-        results = client.search(
-            query=query,
-            search_depth=search_depth,
-            max_results=max_results
-        )
-        print(json.dumps(results, indent=2))
+        with stage("fetch"):
+            results = fetch(query, search_depth, max_results, resilience=resilience, metrics=metrics)
+        with stage("store"):
+            if cache is not None:
+                cache.put(query, search_depth, max_results, results)
+            if index is not None:
+                index.add(query, results)
+        if not refresh:
+            with stage("render"):
+                print(render(results, output))
     except Exception as e:
         print(json.dumps({"error": str(e)}))
         exit(1)
+    finally:
+        if show_metrics:
+            print(json.dumps({"query": query, **metrics}), file=sys.stderr)
 
-if __name__ == "__main__":
+def main():
     parser = argparse.ArgumentParser(description="Tavily Search Skill")
-    parser.add_argument("--query", required=True, help="The search query.")
+    parser.add_argument("--query", help="The search query.")
+    parser.add_argument("--batch", metavar="FILE", help="Run the queries in FILE (one per line, '-' for stdin) concurrently and print NDJSON.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum concurrent requests in batch mode.")
+    parser.add_argument("--ordered", action="store_true", help="In batch mode, print results in input order instead of completion order.")
     parser.add_argument("--search-depth", default="basic", choices=["basic", "advanced"], help="Search depth.")
     parser.add_argument("--max-results", type=int, default=10, help="Maximum number of results.")
-    
+    parser.add_argument("--dedup", action="store_true", help="Drop results with the same canonical URL or near-duplicate content.")
+    parser.add_argument("--near-dup-threshold", type=float, default=0.8, help="MinHash similarity at which --dedup treats content as duplicate.")
+    parser.add_argument("--token-budget", type=int, help="Truncate result content so all results fit about this many tokens.")
+    parser.add_argument("--drop-raw", action="store_true", help="Remove raw_content from results.")
+    parser.add_argument("--format", choices=["json", "minjson", "ndjson"], default="json", help="Output format: indented JSON, minified JSON, or one line per result.")
+    parser.add_argument("--compact", action="store_true", help="Shorthand for --dedup --drop-raw --format minjson.")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local result cache.")
+    parser.add_argument("--cache-ttl", type=int, default=int(os.getenv("TAVILY_CACHE_TTL", DEFAULT_TTL)), help="Seconds a cached result stays fresh.")
+    parser.add_argument("--stale-ttl", type=int, default=int(os.getenv("TAVILY_CACHE_STALE_TTL", DEFAULT_STALE_TTL)), help="Seconds a stale result is still served while it is refreshed in the background.")
+    parser.add_argument("--cache-max-entries", type=int, default=int(os.getenv("TAVILY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)), help="Maximum cached queries before LRU eviction.")
+    parser.add_argument("--cache-stats", action="store_true", help="Print cache hit/miss statistics and exit.")
+    parser.add_argument("--cache-clear", action="store_true", help="Remove all cached results and exit.")
+    parser.add_argument("--index", action="store_true", default=os.getenv("TAVILY_INDEX") == "1", help="Also store fetched results in the local full-text index.")
+    parser.add_argument("--local-first", action="store_true", help="Answer from the local index when enough documents match every term, else search online (implies --index).")
+    parser.add_argument("--offline", action="store_true", help="Answer only from the cache and the local index, ranked by BM25; never go online.")
+    parser.add_argument("--local-min-results", type=int, default=3, help="Matches --local-first needs before it skips the network.")
+    parser.add_argument("--index-max-age", type=int, default=int(os.getenv("TAVILY_INDEX_MAX_AGE", 0)) or None, help="Ignore indexed documents older than this many seconds.")
+    parser.add_argument("--index-stats", action="store_true", help="Print local index statistics and exit.")
+    parser.add_argument("--rate-limit", type=float, default=float(os.getenv("TAVILY_RATE_LIMIT", DEFAULT_RATE)), help="Requests per second shared by all processes on this machine (0 disables).")
+    parser.add_argument("--max-retries", type=int, default=int(os.getenv("TAVILY_MAX_RETRIES", DEFAULT_MAX_RETRIES)), help="Retries for 429/5xx/timeouts with jittered exponential backoff.")
+    parser.add_argument("--metrics", action="store_true", help="Print per-query latency/retry metrics to stderr.")
+    parser.add_argument("--refresh", action="store_true", help=argparse.SUPPRESS)
+
     args = parser.parse_args()
-    
-    search(args.query, args.search_depth, args.max_results)
+
+    cache = None
+    if not args.no_cache:
+        cache = SearchCache(ttl=args.cache_ttl, stale_ttl=args.stale_ttl, max_entries=args.cache_max_entries)
+
+    if args.cache_stats or args.cache_clear:
+        if cache is None:
+            parser.error("--cache-stats/--cache-clear cannot be combined with --no-cache")
+        if args.cache_clear:
+            cache.clear()
+        print(json.dumps(cache.stats(), indent=2))
+        exit(0)
+
+    if args.offline and args.local_first:
+        parser.error("--offline and --local-first are mutually exclusive")
+    mode = "offline" if args.offline else "local-first" if args.local_first else None
+
+    index = None
+    if args.index or mode or args.index_stats:
+        from local_index import LocalIndex
+        index = LocalIndex()
+    if args.index_stats:
+        print(json.dumps(index.stats(), indent=2))
+        exit(0)
+
+    if args.compact:
+        args.dedup = args.drop_raw = True
+        if args.format == "json":
+            args.format = "minjson"
+
+    output = None
+    if args.dedup or args.drop_raw or args.token_budget is not None or args.format != "json":
+        output = {
+            "dedup": args.dedup,
+            "near_dup_threshold": args.near_dup_threshold,
+            "token_budget": args.token_budget,
+            "drop_raw": args.drop_raw,
+            "format": args.format
+        }
+
+    resilience = Resilience(
+        limiter=RateLimiter(rate=args.rate_limit),
+        policy=RetryPolicy(max_retries=args.max_retries)
+    )
+
+    if args.batch:
+        if args.query:
+            parser.error("--query and --batch are mutually exclusive")
+        from batch_search import batch
+        load_env()
+        with stage("batch"):
+            summary = batch(args.batch, args.search_depth, args.max_results,
+                            concurrency=args.concurrency, cache=cache, ordered=args.ordered,
+                            resilience=resilience, show_metrics=args.metrics, output=output,
+                            index=index, mode=mode, local_min_results=args.local_min_results,
+                            index_max_age=args.index_max_age)
+        exit(1 if summary["errors"] else 0)
+
+    if not args.query:
+        parser.error("the following arguments are required: --query")
+
+    search(args.query, args.search_depth, args.max_results, cache=cache, refresh=args.refresh,
+           resilience=resilience, show_metrics=args.metrics, output=output,
+           index=index, mode=mode, local_min_results=args.local_min_results, index_max_age=args.index_max_age)
+
+if __name__ == "__main__":
+    with tracing("tavily-search-free/tavily_search"):
+        main()